@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for per-call input marshalling in process_target / process_target_raw.
+
+Compares the legacy `(ctypes.c_uint8 * n)(*data)` splat against the zero-copy
+`as_uint8_pointer` path for a range of input sizes. No target library is
+needed: only the cost of turning a serialized context into a pointer is timed.
+
+Usage:
+    python scripts/bench_input_marshalling.py [--iterations N]
+"""
+
+import argparse
+import ctypes
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from test_suite.multiprocessing_utils import as_uint8_pointer
+
+SIZES = [1 << 10, 64 << 10, 1 << 20, 8 << 20]
+
+
+def legacy_marshal(data):
+    return (ctypes.c_uint8 * len(data))(*data)
+
+
+def zero_copy_marshal(data):
+    return as_uint8_pointer(data)
+
+
+def _fmt_size(size: int) -> str:
+    if size >= 1 << 20:
+        return f"{size >> 20} MiB"
+    return f"{size >> 10} KiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--iterations",
+        "-n",
+        type=int,
+        default=1000,
+        help="Zero-copy calls per measurement",
+    )
+    args = parser.parse_args()
+
+    print(f"{'size':>8}  {'type':<10} {'legacy':>12} {'zero-copy':>12} {'speedup':>10}")
+    print("-" * 58)
+    for size in SIZES:
+        payload = os.urandom(size)
+        for label, data in (("bytes", payload), ("bytearray", bytearray(payload))):
+            legacy = min(
+                timeit.repeat(lambda: legacy_marshal(data), number=1, repeat=3)
+            )
+            zero_copy = (
+                min(
+                    timeit.repeat(
+                        lambda: zero_copy_marshal(data),
+                        number=args.iterations,
+                        repeat=3,
+                    )
+                )
+                / args.iterations
+            )
+            print(
+                f"{_fmt_size(size):>8}  {label:<10} {legacy * 1e6:>10.1f}us "
+                f"{zero_copy * 1e6:>10.2f}us {legacy / zero_copy:>9.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
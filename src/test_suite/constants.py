@@ -1,9 +1,23 @@
 # Number of dashes in between lines for log file output separation
 LOG_FILE_SEPARATOR_LENGTH = 20
 
-# Output buffer size
+# Test case status for a fixture whose worker process died (segfault, abort,
+# ASAN) while executing it; 1 = passed, -1 = failed, 0 = skipped
+TEST_CASE_CRASHED = -2
+
+# Output buffer size (upper bound, used by harnesses with large effects)
 OUTPUT_BUFFER_SIZE = 100 * 1024 * 1024
 
+# Default output buffer size for harnesses with small effects
+SMALL_OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Size of the seeded random block tiled across randomized output buffers
+OUTPUT_BUFFER_FILL_PATTERN_SIZE = 1024 * 1024
+
+# Test files at least this large are mapped instead of read when executing
+# them (smaller files are cheaper to read than to map)
+MMAP_MIN_FILE_SIZE = 64 * 1024
+
 # Native program mappings
 NATIVE_PROGRAM_MAPPING = {
     "11111111111111111111111111111111": "system",
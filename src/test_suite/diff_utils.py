@@ -0,0 +1,203 @@
+"""
+Structured diff of effects messages.
+
+EffectsDiff compares two messages of the same type field by field, in
+place, and reports the paths of the first mismatching fields (e.g.
+"modified_accounts[2].lamports"). Diff modes declare which fields they
+ignore instead of copying both messages and clearing those fields before
+comparing them:
+
+    >>> consensus_diff = EffectsDiff(ignore=("result", "custom_err", "cu_avail"))
+    >>> consensus_diff(a, b)
+    False
+    >>> consensus_diff.mismatches(a, b)
+    ['modified_accounts[0].data']
+
+Subtrees without ignored fields are first compared with the native message
+equality, so equal effects cost one comparison and only the subtrees that
+differ are walked field by field. Fields unknown to the schema (e.g. effects
+of a target built against newer protos) are compared too, and reported as
+"<unknown fields>" under the message that holds them.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from google.protobuf.message import Message
+from google.protobuf.unknown_fields import UnknownFieldSet
+
+# Number of mismatching field paths reported for a failing test
+MAX_REPORTED_MISMATCHES = 8
+
+# Path component of the fields of a message that are not in its schema
+UNKNOWN_FIELDS = "<unknown fields>"
+
+
+def _ignore_tree(paths: Iterable[str]) -> dict:
+    """Nested dict of dotted field paths; None marks an ignored field."""
+    tree = {}
+    for path in paths:
+        *parents, leaf = path.split(".")
+        node = tree
+        for name in parents:
+            if name in node and node[name] is None:
+                # A parent is ignored as a whole
+                node = None
+                break
+            node = node.setdefault(name, {})
+        if node is not None:
+            node[leaf] = None
+    return tree
+
+
+def _is_empty(message: Message, name: str) -> bool:
+    field_desc = message.DESCRIPTOR.fields_by_name[name]
+    if field_desc.is_repeated:
+        return len(getattr(message, name)) == 0
+    if field_desc.has_presence:
+        return not message.HasField(name)
+    return getattr(message, name) == field_desc.default_value
+
+
+def _unknown_fields(fields: UnknownFieldSet) -> list[tuple]:
+    # Groups hold a nested set, which only compares by identity
+    return [
+        (
+            field.field_number,
+            field.wire_type,
+            (
+                _unknown_fields(field.data)
+                if isinstance(field.data, UnknownFieldSet)
+                else field.data
+            ),
+        )
+        for field in fields
+    ]
+
+
+def _diff(
+    a: Message,
+    b: Message,
+    ignore: dict,
+    path: str,
+    mismatches: list[str],
+    limit: int,
+):
+    if not ignore and a == b:
+        return
+    for field_desc in a.DESCRIPTOR.fields:
+        if len(mismatches) >= limit:
+            return
+        name = field_desc.name
+        field_ignore = ignore.get(name, {})
+        if field_ignore is None:
+            continue
+        field_path = f"{path}.{name}" if path else name
+
+        if field_desc.message_type is None:
+            if field_desc.has_presence and a.HasField(name) != b.HasField(name):
+                mismatches.append(field_path)
+            elif getattr(a, name) != getattr(b, name):
+                mismatches.append(field_path)
+            continue
+
+        a_value = getattr(a, name)
+        b_value = getattr(b, name)
+        if field_desc.message_type.GetOptions().map_entry:
+            if dict(a_value) != dict(b_value):
+                mismatches.append(field_path)
+        elif field_desc.is_repeated:
+            if len(a_value) != len(b_value):
+                # Elements cannot be paired up, report the field as a whole
+                mismatches.append(field_path)
+                continue
+            if field_ignore:
+                differing = range(len(a_value))
+            else:
+                # One native comparison per element, only differing elements
+                # are walked (e.g. a few changed accounts out of thousands)
+                differing = (
+                    i
+                    for i, (a_item, b_item) in enumerate(zip(a_value, b_value))
+                    if a_item != b_item
+                )
+            for i in differing:
+                _diff(
+                    a_value[i],
+                    b_value[i],
+                    field_ignore,
+                    f"{field_path}[{i}]",
+                    mismatches,
+                    limit,
+                )
+                if len(mismatches) >= limit:
+                    return
+        elif a.HasField(name) != b.HasField(name):
+            mismatches.append(field_path)
+        else:
+            _diff(a_value, b_value, field_ignore, field_path, mismatches, limit)
+
+    if len(mismatches) < limit and _unknown_fields(
+        UnknownFieldSet(a)
+    ) != _unknown_fields(UnknownFieldSet(b)):
+        mismatches.append(f"{path}.{UNKNOWN_FIELDS}" if path else UNKNOWN_FIELDS)
+
+
+@dataclass(frozen=True)
+class EffectsDiff:
+    """
+    Declarative diff of two effects messages of the same type.
+
+    Instances are HarnessCtx diff functions: calling one with two messages
+    returns True if they are equal outside the ignored fields.
+
+    Attributes:
+        ignore: Dotted paths of fields that are never compared. Paths under
+            repeated fields apply to every element.
+        ignore_fn: Extra paths to ignore for a given pair of messages
+        cleared_fn: Top-level fields to treat as empty in a given message
+            (e.g. the accounts of a failed instruction). If only one of the
+            messages has such a field cleared, the field must be empty in
+            the other one.
+    """
+
+    ignore: tuple[str, ...] = ()
+    ignore_fn: Callable[[Message, Message], Iterable[str]] | None = None
+    cleared_fn: Callable[[Message], Iterable[str]] | None = None
+    _tree: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_tree", _ignore_tree(self.ignore))
+
+    def __call__(self, a: Message, b: Message) -> bool:
+        return not self.mismatches(a, b, limit=1)
+
+    def mismatches(
+        self, a: Message, b: Message, limit: int = MAX_REPORTED_MISMATCHES
+    ) -> list[str]:
+        """
+        Paths of the first mismatching fields of two messages.
+
+        Args:
+            a: Reference effects
+            b: Effects to compare with the reference
+            limit: Maximum number of paths to return
+
+        Returns:
+            Field paths, empty if the messages are equal
+        """
+        mismatches = []
+        tree = self._tree
+        extra = set(self.ignore_fn(a, b)) if self.ignore_fn else set()
+        if self.cleared_fn:
+            a_cleared = set(self.cleared_fn(a))
+            b_cleared = set(self.cleared_fn(b))
+            for name in sorted(a_cleared ^ b_cleared):
+                if not _is_empty(b if name in a_cleared else a, name):
+                    mismatches.append(name)
+            extra |= a_cleared | b_cleared
+        if extra:
+            tree = _ignore_tree((*self.ignore, *sorted(extra)))
+        if len(mismatches) < limit:
+            _diff(a, b, tree, "", mismatches, limit)
+        return mismatches[:limit]
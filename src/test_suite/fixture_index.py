@@ -0,0 +1,397 @@
+"""
+Persistent index of a fixture/context corpus.
+
+Discovering inputs and re-deriving their metadata is a noticeable part of
+start-up on large corpora (hundreds of thousands of files, often on NFS).
+The index records, per file, its format, entrypoint, harness, feature set
+and content hash in a SQLite database keyed by path, size and mtime, so a
+subsequent run only needs to stat each file and only re-reads the files that
+changed.
+
+Example:
+    >>> with FixtureIndex(default_index_path(corpus_dir)) as index:
+    ...     entries = index.update(corpus_dir)
+"""
+
+import array
+import hashlib
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from test_suite.fixture_pack import is_pack, pack_member_paths
+from test_suite.flatbuffers_utils import (
+    FixtureLoader,
+    extract_fb_elf_entrypoint,
+    extract_fb_elf_features,
+)
+from test_suite.fuzz_context import (
+    FIXTURE_EXTENSION,
+    HARNESS_MAP,
+    get_all_supported_extensions,
+    get_harness_for_entrypoint,
+)
+from test_suite.multiprocessing_utils import read_context, read_test_file
+import test_suite.pb_utils as pb_utils
+import test_suite.protos.context_pb2 as context_pb
+from test_suite.util import process_items
+
+# Bump when the schema or the meaning of a column changes
+INDEX_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    format TEXT NOT NULL,
+    fn_entrypoint TEXT,
+    harness TEXT,
+    features BLOB NOT NULL,
+    content_hash TEXT NOT NULL,
+    error TEXT
+);
+"""
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """
+    Indexed metadata of a single test file.
+
+    Attributes:
+        path: Path to the test file
+        size: File size in bytes, at indexing time
+        mtime_ns: Modification time in nanoseconds, at indexing time
+        format: 'protobuf', 'flatbuffers' or 'unknown'
+        fn_entrypoint: Entrypoint from the fixture metadata (or the harness
+            entrypoint for context files), or None if unreadable
+        harness: Name of the harness in HARNESS_MAP, or None if unknown
+        features: Feature set of the input context
+        content_hash: SHA-256 of the file contents (hex)
+        error: Why the file could not be parsed, or None if it could
+    """
+
+    path: Path
+    size: int
+    mtime_ns: int
+    format: str
+    fn_entrypoint: str | None
+    harness: str | None
+    features: tuple[int, ...]
+    content_hash: str
+    error: str | None = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+
+def default_index_path(corpus_dir: Path) -> Path:
+    """
+    Location of the index for a corpus directory.
+
+    Indexes live in the user cache directory rather than next to the corpus,
+    which is often a read-only or shared checkout.
+    """
+    cache_dir = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+    corpus_key = hashlib.sha256(str(corpus_dir.resolve()).encode()).hexdigest()[:16]
+    return cache_dir / "solana-conformance" / f"index-{corpus_key}.sqlite"
+
+
+def scan_test_files(directory: Path, recursive: bool = True) -> list[os.DirEntry]:
+    """
+    Find all files with a supported extension in a single directory walk.
+
+    Args:
+        directory: Directory to search
+        recursive: Also search subdirectories
+
+    Returns:
+        Directory entries of the matching files (their stat is cached)
+    """
+    extensions = tuple(get_all_supported_extensions())
+    found = []
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.name.endswith(extensions) and entry.is_file():
+                    found.append(entry)
+    return found
+
+
+def _harness_name(harness) -> str | None:
+    for name, candidate in HARNESS_MAP.items():
+        if candidate is harness:
+            return name
+    return None
+
+
+def _harness_for_extension(suffix: str):
+    for harness in HARNESS_MAP.values():
+        if harness.context_extension == suffix:
+            return harness
+    return None
+
+
+def _harness_for_entrypoint(fn_entrypoint: str):
+    try:
+        return get_harness_for_entrypoint(fn_entrypoint)
+    except KeyError:
+        # Loadable, but not runnable by this version of the harness map
+        return None
+
+
+def _context_features(harness, context) -> tuple[int, ...]:
+    if harness.context_type is None or context is None:
+        return ()
+    for features_path in pb_utils.find_field_with_type(
+        harness.context_type.DESCRIPTOR, context_pb.FeatureSet.DESCRIPTOR
+    ):
+        features = pb_utils.access_nested_field_safe(context, features_path)
+        if features is not None:
+            return tuple(features.features)
+    return ()
+
+
+def describe_test_file(item: tuple[str, int, int]) -> IndexEntry:
+    """
+    Read and parse a test file to produce its index entry.
+
+    Args:
+        item: Tuple of (path, size, mtime_ns) from the directory scan
+
+    Returns:
+        IndexEntry for the file
+    """
+    path, size, mtime_ns = item
+    path = Path(path)
+    raw_data = read_test_file(path)
+    if raw_data is None:
+        return IndexEntry(
+            path, size, mtime_ns, "unknown", None, None, (), "", "Failed to read file"
+        )
+
+    fmt = "unknown"
+    fn_entrypoint = None
+    harness = None
+    features = ()
+    error = None
+    try:
+        if path.suffix == FIXTURE_EXTENSION:
+            loader = FixtureLoader(path, raw_data=raw_data)
+            fmt = loader.format_type
+            error = loader.error_message
+            if fmt == "flatbuffers" and loader.is_valid:
+                fn_entrypoint = extract_fb_elf_entrypoint(loader.fb_fixture)
+                features = tuple(extract_fb_elf_features(loader.fb_fixture))
+                harness = _harness_for_entrypoint(fn_entrypoint)
+            elif loader.is_valid:
+                fn_entrypoint = loader.fn_entrypoint
+                harness = _harness_for_entrypoint(fn_entrypoint)
+                if harness is not None:
+                    features = _context_features(harness, loader.input)
+        else:
+            harness = _harness_for_extension(path.suffix)
+            fn_entrypoint = harness.fuzz_fn_name
+            context = read_context(harness, path, raw_data)
+            if context is not None:
+                fmt = "protobuf"
+                features = _context_features(harness, context)
+            elif harness.context_type is not None:
+                error = f"Unable to parse context: {path}"
+    except Exception as e:
+        error = str(e)
+
+    return IndexEntry(
+        path=path,
+        size=size,
+        mtime_ns=mtime_ns,
+        format=fmt,
+        fn_entrypoint=fn_entrypoint,
+        harness=_harness_name(harness) if harness is not None else None,
+        features=features,
+        content_hash=hashlib.sha256(raw_data).hexdigest(),
+        error=error,
+    )
+
+
+class FixtureIndex:
+    """
+    SQLite-backed index of test files, updated incrementally.
+
+    Only files whose size or mtime changed since they were last indexed are
+    re-read; files that disappeared are dropped from the index.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = index_path
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(index_path)
+        self.conn.executescript(_SCHEMA)
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or int(row[0]) != INDEX_VERSION:
+            # Stale layout: start over
+            with self.conn:
+                self.conn.execute("DELETE FROM files")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (str(INDEX_VERSION),),
+                )
+
+    def _insert(self, key: str, entry: IndexEntry):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                entry.size,
+                entry.mtime_ns,
+                entry.format,
+                entry.fn_entrypoint,
+                entry.harness,
+                array.array("Q", entry.features).tobytes(),
+                entry.content_hash,
+                entry.error,
+            ),
+        )
+
+    @staticmethod
+    def _entry(directory: Path, row) -> IndexEntry:
+        key, size, mtime_ns, fmt, fn_entrypoint, harness, features, *rest = row
+        return IndexEntry(
+            directory / key,
+            size,
+            mtime_ns,
+            fmt,
+            fn_entrypoint,
+            harness,
+            tuple(array.array("Q", features)),
+            *rest,
+        )
+
+    def update(
+        self, directory: Path, recursive: bool = True, num_processes: int = 4
+    ) -> list[IndexEntry]:
+        """
+        Bring the index up to date with a directory and return its entries.
+
+        Rows are keyed by the path relative to directory, so the index stays
+        valid when the corpus is reached through a different path.
+
+        Args:
+            directory: Corpus directory
+            recursive: Also index subdirectories
+            num_processes: Number of processes used to parse changed files
+
+        Returns:
+            Entries of all test files in the directory, grouped by harness
+        """
+        known = {row[0]: row for row in self.conn.execute("SELECT * FROM files")}
+
+        # scandir paths are directory joined with the relative path
+        prefix_len = len(os.path.join(str(directory), ""))
+        entries = []
+        changed = []
+        for dir_entry in scan_test_files(directory, recursive):
+            key = dir_entry.path[prefix_len:]
+            stat = dir_entry.stat()
+            row = known.pop(key, None)
+            if row is not None and (row[1], row[2]) == (stat.st_size, stat.st_mtime_ns):
+                entries.append(self._entry(directory, row))
+            else:
+                changed.append((dir_entry.path, stat.st_size, stat.st_mtime_ns))
+
+        if not recursive:
+            # Subdirectories were not scanned, keep their rows
+            known = {key: row for key, row in known.items() if os.sep not in key}
+
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM files WHERE path = ?", ((key,) for key in known)
+            )
+
+            def add(entry: IndexEntry):
+                self._insert(str(entry.path)[prefix_len:], entry)
+                entries.append(entry)
+
+            if changed:
+                process_items(
+                    changed,
+                    describe_test_file,
+                    num_processes=num_processes,
+                    desc="Indexing",
+                    use_processes=True,
+                    unit="file",
+                    result_callback=add,
+                )
+
+        entries.sort(key=lambda entry: (entry.harness or "", str(entry.path)))
+        return entries
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def find_indexed_test_files(
+    input: Path, use_index: bool = False, num_processes: int = 4
+) -> tuple[list[Path], list[IndexEntry]]:
+    """
+    Collect the test files to run, along with their index entries.
+
+    Args:
+        input: Test file, fixture pack, or directory searched recursively
+        use_index: Use (and update) the persistent corpus index, which also
+            groups the files by harness
+        num_processes: Number of processes used to index changed files
+
+    Returns:
+        (list of test file paths (<pack>/<entry name> for files in a pack),
+        index entries of the files, empty unless the index was used)
+    """
+    if is_pack(input):
+        extensions = tuple(get_all_supported_extensions())
+        return [
+            path for path in pack_member_paths(input) if path.name.endswith(extensions)
+        ], []
+    if input.is_file():
+        return [input], []
+    if use_index:
+        with FixtureIndex(default_index_path(input)) as index:
+            entries = index.update(input, num_processes=num_processes)
+        return [entry.path for entry in entries], entries
+    return [Path(entry.path) for entry in scan_test_files(input)], []
+
+
+def find_test_files(
+    input: Path, use_index: bool = False, num_processes: int = 4
+) -> list[Path]:
+    """
+    Collect the test files to run from a file or directory.
+
+    Args:
+        input: Test file, fixture pack, or directory searched recursively
+        use_index: Use (and update) the persistent corpus index, which also
+            groups the files by harness
+        num_processes: Number of processes used to index changed files
+
+    Returns:
+        List of test file paths (<pack>/<entry name> for files in a pack)
+    """
+    return find_indexed_test_files(input, use_index, num_processes)[0]
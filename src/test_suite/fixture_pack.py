@@ -0,0 +1,371 @@
+"""
+Packed fixture archives.
+
+A pack holds many small test files in a single file, so that large corpora
+do not cost a directory walk, an inode and an open() per fixture. Entries
+are read through a shared mmap without copying.
+
+Layout (all integers little-endian):
+    header:  magic "SCFXPACK", u32 version, u32 reserved
+    data:    entry contents, each aligned to ENTRY_ALIGNMENT bytes
+    index:   per entry: u64 offset, u64 size, 32-byte SHA-256,
+             u16 name length, u16 entrypoint length, name, entrypoint
+    footer:  u64 index offset, u64 entry count, magic "SCFXPEND"
+
+Packs are written to a temporary file next to them, which then atomically
+replaces the pack, so an interrupted write leaves the previous pack intact.
+Appending copies the pack, writes the new entries over the copy's index and
+then writes a new index and footer. A later entry with the same name
+replaces an earlier one.
+
+A file inside a pack is addressed as <pack path>/<entry name>, e.g.
+corpus.fixpack/instr/abc.fix, which keeps Path.stem and Path.suffix
+meaningful for the rest of the test suite.
+"""
+
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+PACK_EXTENSION = ".fixpack"
+PACK_VERSION = 1
+ENTRY_ALIGNMENT = 8
+
+_HEADER = struct.Struct("<8sII")
+_HEADER_MAGIC = b"SCFXPACK"
+_INDEX_ENTRY = struct.Struct("<QQ32sHH")
+_FOOTER = struct.Struct("<QQ8s")
+_FOOTER_MAGIC = b"SCFXPEND"
+
+# Packs opened by this process, for reading pack members by path
+_open_packs: dict = {}
+
+
+class PackFormatError(ValueError):
+    """Raised when a file is not a valid fixture pack."""
+
+
+@dataclass(frozen=True)
+class PackEntry:
+    """
+    A single file stored in a pack.
+
+    Attributes:
+        name: Path of the file relative to the packed directory (POSIX style)
+        offset: Offset of the contents in the pack
+        size: Size of the contents
+        sha256: SHA-256 of the contents
+        fn_entrypoint: Harness entrypoint of the file, or empty if unknown
+    """
+
+    name: str
+    offset: int
+    size: int
+    sha256: bytes
+    fn_entrypoint: str
+
+
+def _read_index(buf, index_offset: int, count: int) -> list[PackEntry]:
+    entries = []
+    pos = index_offset
+    for _ in range(count):
+        offset, size, sha256, name_len, entrypoint_len = _INDEX_ENTRY.unpack_from(
+            buf, pos
+        )
+        pos += _INDEX_ENTRY.size
+        name = bytes(buf[pos : pos + name_len]).decode()
+        pos += name_len
+        fn_entrypoint = bytes(buf[pos : pos + entrypoint_len]).decode()
+        pos += entrypoint_len
+        entries.append(PackEntry(name, offset, size, sha256, fn_entrypoint))
+    return entries
+
+
+def _read_layout(buf) -> tuple[int, list[PackEntry]]:
+    """Validate the header/footer and return (index offset, entries)."""
+    if len(buf) < _HEADER.size + _FOOTER.size:
+        raise PackFormatError("File too small to be a fixture pack")
+    magic, version, _ = _HEADER.unpack_from(buf, 0)
+    if magic != _HEADER_MAGIC:
+        raise PackFormatError("Not a fixture pack (bad header magic)")
+    if version != PACK_VERSION:
+        raise PackFormatError(f"Unsupported fixture pack version {version}")
+    index_offset, count, end_magic = _FOOTER.unpack_from(buf, len(buf) - _FOOTER.size)
+    if end_magic != _FOOTER_MAGIC:
+        raise PackFormatError("Truncated fixture pack (bad footer magic)")
+    return index_offset, _read_index(buf, index_offset, count)
+
+
+class FixturePack:
+    """
+    Read-only view of a fixture pack.
+
+    Example:
+        >>> with FixturePack(Path("corpus.fixpack")) as pack:
+        ...     for entry in pack.entries:
+        ...         data = pack.read(entry)  # memoryview into the mmap
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _, entries = _read_layout(self._mmap)
+        except (PackFormatError, struct.error):
+            self._mmap.close()
+            raise
+        # Later entries replace earlier ones with the same name
+        self._by_name = {entry.name: entry for entry in entries}
+        self.entries = list(self._by_name.values())
+
+    def read(self, entry: PackEntry | str) -> memoryview:
+        """
+        Contents of an entry, without copying.
+
+        The view is valid for as long as the pack stays open.
+        """
+        if isinstance(entry, str):
+            entry = self._by_name[entry]
+        return memoryview(self._mmap)[entry.offset : entry.offset + entry.size]
+
+    def get(self, name: str) -> PackEntry | None:
+        """Entry with the given name, or None if the pack has none."""
+        return self._by_name.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def close(self):
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views of entries are still alive; the mapping goes with them
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def is_pack(path: Path) -> bool:
+    """Whether path is a fixture pack file."""
+    return path.suffix == PACK_EXTENSION and path.is_file()
+
+
+def split_pack_member(path: Path) -> tuple[Path, str] | None:
+    """
+    Split a <pack>/<entry name> path into the pack path and entry name.
+
+    Returns:
+        (pack path, entry name), or None if path does not point into a pack
+    """
+    for parent in path.parents:
+        if parent.suffix == PACK_EXTENSION:
+            if parent in _open_packs or parent.is_file():
+                return parent, path.relative_to(parent).as_posix()
+            return None
+    return None
+
+
+def open_pack(pack_path: Path) -> FixturePack:
+    """Open a pack once per process and keep it open for member reads."""
+    pack = _open_packs.get(pack_path)
+    if pack is None:
+        pack = _open_packs[pack_path] = FixturePack(pack_path)
+    return pack
+
+
+def pack_member_entry(path: Path) -> PackEntry | None:
+    """
+    Pack entry (size, entrypoint, ...) of a file inside a pack, addressed as
+    <pack>/<entry name>, without reading its contents.
+
+    Returns:
+        The entry, or None if path is not a pack member
+    """
+    member = split_pack_member(path)
+    if member is None:
+        return None
+    pack_path, name = member
+    return open_pack(pack_path).get(name)
+
+
+def read_pack_member(path: Path) -> memoryview | None:
+    """
+    Contents of a file inside a pack, addressed as <pack>/<entry name>.
+
+    Returns:
+        View of the entry's contents, or None if path is not a pack member
+    """
+    member = split_pack_member(path)
+    if member is None:
+        return None
+    pack_path, name = member
+    pack = open_pack(pack_path)
+    entry = pack.get(name)
+    if entry is None:
+        return None
+    return pack.read(entry)
+
+
+def pack_member_paths(pack_path: Path) -> list[Path]:
+    """Paths (<pack>/<entry name>) of all files in a pack."""
+    return [pack_path / entry.name for entry in open_pack(pack_path).entries]
+
+
+def write_pack(
+    pack_path: Path,
+    items: Iterable[tuple[str, bytes, str]],
+    append: bool = False,
+) -> int:
+    """
+    Write (or append to) a pack.
+
+    Args:
+        pack_path: Pack file to write
+        items: (entry name, contents, entrypoint) of each file to store
+        append: Keep the existing entries of pack_path
+
+    Returns:
+        Number of entries written
+    """
+    # Drop this process's mapping of the old contents before rewriting them
+    stale = _open_packs.pop(pack_path, None)
+    if stale is not None:
+        stale.close()
+
+    tmp_path = pack_path.with_name(f".{pack_path.name}.{os.getpid()}.tmp")
+    try:
+        num_written = _write_pack_file(pack_path, tmp_path, items, append)
+        os.replace(tmp_path, pack_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return num_written
+
+
+def _write_pack_file(
+    pack_path: Path,
+    tmp_path: Path,
+    items: Iterable[tuple[str, bytes, str]],
+    append: bool,
+) -> int:
+    entries = []
+    if append and pack_path.exists():
+        with (
+            open(pack_path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as existing,
+        ):
+            data_end, entries = _read_layout(existing)
+        shutil.copyfile(pack_path, tmp_path)
+        f = open(tmp_path, "r+b")
+        f.seek(data_end)
+    else:
+        f = open(tmp_path, "wb")
+        f.write(_HEADER.pack(_HEADER_MAGIC, PACK_VERSION, 0))
+
+    num_written = 0
+    with f:
+        for name, data, fn_entrypoint in items:
+            offset = f.tell()
+            padding = -offset % ENTRY_ALIGNMENT
+            if padding:
+                f.write(b"\0" * padding)
+                offset += padding
+            f.write(data)
+            entries.append(
+                PackEntry(
+                    name,
+                    offset,
+                    len(data),
+                    hashlib.sha256(data).digest(),
+                    fn_entrypoint or "",
+                )
+            )
+            num_written += 1
+
+        index_offset = f.tell()
+        for entry in entries:
+            name = entry.name.encode()
+            fn_entrypoint = entry.fn_entrypoint.encode()
+            f.write(
+                _INDEX_ENTRY.pack(
+                    entry.offset,
+                    entry.size,
+                    entry.sha256,
+                    len(name),
+                    len(fn_entrypoint),
+                )
+            )
+            f.write(name)
+            f.write(fn_entrypoint)
+        f.write(_FOOTER.pack(index_offset, len(entries), _FOOTER_MAGIC))
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+
+    return num_written
+
+
+def pack_directory(
+    input_dir: Path, pack_path: Path, append: bool = False, num_processes: int = 4
+) -> int:
+    """
+    Pack all test files under a directory.
+
+    Entrypoints are taken from the corpus index, which is brought up to date
+    first.
+
+    Args:
+        input_dir: Directory of test files
+        pack_path: Pack file to write
+        append: Add to an existing pack instead of replacing it
+        num_processes: Number of processes used to index changed files
+
+    Returns:
+        Number of files packed
+    """
+    from test_suite.fixture_index import FixtureIndex, default_index_path
+
+    with FixtureIndex(default_index_path(input_dir)) as index:
+        entries = index.update(input_dir, num_processes=num_processes)
+
+    def items():
+        for entry in entries:
+            yield (
+                entry.path.relative_to(input_dir).as_posix(),
+                entry.path.read_bytes(),
+                entry.fn_entrypoint,
+            )
+
+    return write_pack(pack_path, items(), append=append)
+
+
+def unpack(pack_path: Path, output_dir: Path) -> int:
+    """
+    Extract all files of a pack into a directory.
+
+    Returns:
+        Number of files extracted
+    """
+    output_dir = output_dir.resolve()
+    with FixturePack(pack_path) as pack:
+        for entry in pack.entries:
+            output_path = (output_dir / entry.name).resolve()
+            if not output_path.is_relative_to(output_dir):
+                raise PackFormatError(
+                    f"Entry escapes the output directory: {entry.name}"
+                )
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_bytes(pack.read(entry))
+        return len(pack)
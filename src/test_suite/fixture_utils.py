@@ -14,6 +14,7 @@ from test_suite.multiprocessing_utils import (
     extract_metadata,
     read_context,
     read_fixture,
+    read_test_file,
     process_single_test_case,
     process_target_raw,
 )
@@ -33,6 +34,7 @@ from test_suite.flatbuffers_utils import (
     extract_fb_elf_ctx_fields,
     extract_fb_elf_entrypoint,
     build_fb_elf_ctx,
+    embedded_fb_elf_ctx,
     build_fb_elf_fixture,
     parse_fb_elf_effects,
 )
@@ -54,16 +56,15 @@ def create_fixture(test_file: Path) -> int:
 
     if test_file.suffix == FIXTURE_EXTENSION:
         # Detect the source format for .fix files
+        raw_data = read_test_file(test_file)
         try:
-            with open(test_file, "rb") as f:
-                raw_data = f.read()
             source_format = detect_format(raw_data)
             if source_format == "unknown":
                 source_format = "protobuf"  # Default fallback
         except Exception:
             source_format = "protobuf"
 
-        fixture = read_fixture(test_file)
+        fixture = read_fixture(test_file, raw_data)
         harness_ctx = get_harness_for_entrypoint(fixture.metadata.fn_entrypoint)
         fixture = create_fixture_from_context(harness_ctx, fixture.input)
     else:
@@ -98,6 +99,17 @@ def create_fixture_from_context(
 
     pruned_results = harness_ctx.prune_effects_fn(context, results)
 
+    if pruned_results is None:
+        return None
+
+    effects = pruned_results[globals.reference_shared_library]
+
+    if effects is None:
+        return None
+
+    # Taken before build_test_results(), which may human-encode the effects
+    effects_serialized = effects.serialized
+
     # This is only relevant when you gather results for multiple targets
     if globals.only_keep_passing:
         status, _ = build_test_results(
@@ -106,23 +118,12 @@ def create_fixture_from_context(
         if status != 1:
             return None
 
-    if pruned_results is None:
-        return None
-
-    effects_serialized = pruned_results[globals.reference_shared_library]
-
-    if effects_serialized is None:
-        return None
-
     # Create instruction fixture
-    effects = harness_ctx.effects_type()
-    effects.ParseFromString(effects_serialized)
-
     metadata = metadata_pb.FixtureMetadata()
     metadata.fn_entrypoint = harness_ctx.fuzz_fn_name
     fixture = harness_ctx.fixture_type()
     fixture.input.MergeFrom(context)
-    fixture.output.MergeFrom(effects)
+    fixture.output.MergeFromString(effects_serialized)
     fixture.metadata.MergeFrom(metadata)
 
     return fixture
@@ -197,11 +198,11 @@ def extract_context_from_fixture(fixture_file: Path):
         - int: 1 on success, 0 on failure
     """
     try:
-        fn_entrypoint = extract_metadata(fixture_file).fn_entrypoint
+        raw_data = read_test_file(fixture_file)
+        fn_entrypoint = extract_metadata(fixture_file, raw_data).fn_entrypoint
         harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
         fixture = harness_ctx.fixture_type()
-        with open(fixture_file, "rb") as f:
-            fixture.ParseFromString(f.read())
+        fixture.ParseFromString(raw_data)
 
         with open(globals.output_dir / (fixture_file.stem + ".bin"), "wb") as f:
             f.write(fixture.input.SerializeToString(deterministic=True))
@@ -294,9 +295,15 @@ def _regenerate_fb_fixture(test_file: Path, raw_data: bytes) -> int:
         print(f"Regenerating {test_file}")
 
     v2_entrypoint = entrypoint_to_v2(entrypoint)
-    ctx_bytes = build_fb_elf_ctx(
-        ctx_fields["elf_data"], new_features, ctx_fields["deploy_checks"]
-    )
+    if new_features == original_features:
+        # Unchanged context: pass the embedded table on without rebuilding it
+        ctx_bytes = embedded_fb_elf_ctx(raw_data, fb_fixture)
+    else:
+        ctx_bytes = None
+    if ctx_bytes is None:
+        ctx_bytes = build_fb_elf_ctx(
+            ctx_fields["elf_data"], new_features, ctx_fields["deploy_checks"]
+        )
 
     reference_lib = globals.target_libraries.get(globals.reference_shared_library)
     if reference_lib is None:
@@ -353,8 +360,9 @@ def regenerate_fixture(test_file: Path) -> int:
     if test_file.is_dir():
         return 0
 
-    with open(test_file, "rb") as f:
-        raw_data = f.read()
+    raw_data = read_test_file(test_file)
+    if raw_data is None:
+        return 0
     source_format = detect_format(raw_data)
     if source_format == "unknown":
         source_format = "protobuf"
@@ -363,7 +371,7 @@ def regenerate_fixture(test_file: Path) -> int:
     if source_format == "flatbuffers" and FLATBUFFERS_AVAILABLE:
         return _regenerate_fb_fixture(test_file, raw_data)
 
-    fixture = read_fixture(test_file)
+    fixture = read_fixture(test_file, raw_data)
     harness_ctx = get_harness_for_entrypoint(fixture.metadata.fn_entrypoint)
 
     if harness_ctx.context_type is None:
@@ -7,6 +7,7 @@ This module provides:
 3. Unified fixture loading (FixtureLoader)
 """
 
+import struct
 import sys
 from pathlib import Path
 from typing import Optional, Tuple, Any, Union
@@ -131,6 +132,7 @@ if str(_FB_PATH) not in sys.path:
 
 # Import Protobuf types
 import test_suite.protos.metadata_pb2 as metadata_pb
+from test_suite.util import SharedCounters
 from google.protobuf import descriptor_pool, descriptor_pb2, message_factory
 
 
@@ -211,6 +213,109 @@ if _FB_PKG_OK:
 # Format Detection
 # ============================================================================
 
+# file_identifier recognized at bytes 4-8 of ELFLoaderFixture buffers. Only
+# read for now: build_fb_elf_fixture() does not write it until the schema
+# (ELFLoaderFixture in protosol) declares it.
+FB_ELF_FIXTURE_IDENTIFIER = b"ELFX"
+
+# Every binary Protobuf fixture starts with its metadata (field 1), whose
+# first field is the fn_entrypoint string (field 1), e.g. "sol_compat_..."
+_PB_FIXTURE_TAG = 0x0A
+_PB_ENTRYPOINT_PREFIX = b"sol_compat_"
+
+# How detect_format() decided, summed over all worker processes:
+# - flatbuffers_identifier / protobuf_magic: definitive magic check
+# - heuristic: legacy file without magic, classified by the slow heuristics
+format_detection_counts = SharedCounters(
+    ("flatbuffers_identifier", "protobuf_magic", "heuristic")
+)
+
+
+def _read_short_varint(data, pos: int) -> Tuple[Optional[int], int]:
+    """Decode a varint of at most 5 bytes; returns (value or None, end pos)."""
+    value = 0
+    for shift in range(0, 35, 7):
+        if pos >= len(data):
+            return None, pos
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+    return None, pos
+
+
+def has_flatbuffers_identifier(data: bytes) -> bool:
+    """Whether data is an ELFLoaderFixture buffer with its file_identifier."""
+    if len(data) < 12 or data[4:8] != FB_ELF_FIXTURE_IDENTIFIER:
+        return False
+    root_offset = int.from_bytes(data[0:4], "little")
+    return 8 <= root_offset <= len(data) - 4
+
+
+def has_protobuf_fixture_magic(data: bytes) -> bool:
+    """
+    Whether data starts like a binary Protobuf fixture.
+
+    Checks the metadata tag, the fn_entrypoint tag and the entrypoint prefix
+    at the start of the message, which reads a bounded number of bytes.
+    """
+    if len(data) < 2 or data[0] != _PB_FIXTURE_TAG:
+        return False
+    metadata_len, pos = _read_short_varint(data, 1)
+    if metadata_len is None or pos >= len(data) or data[pos] != _PB_FIXTURE_TAG:
+        return False
+    entrypoint_len, pos = _read_short_varint(data, pos + 1)
+    if entrypoint_len is None or entrypoint_len < len(_PB_ENTRYPOINT_PREFIX):
+        return False
+    return data[pos : pos + len(_PB_ENTRYPOINT_PREFIX)] == _PB_ENTRYPOINT_PREFIX
+
+
+def peek_protobuf_entrypoint(data: bytes) -> Optional[str]:
+    """
+    fn_entrypoint of a binary Protobuf fixture, read from the first bytes of
+    the file without parsing it.
+
+    Args:
+        data: Start of the fixture (a few hundred bytes are enough)
+
+    Returns:
+        The entrypoint, or None if data does not start like a Protobuf fixture
+        or is too short to hold the whole entrypoint
+    """
+    if not has_protobuf_fixture_magic(data):
+        return None
+    _, pos = _read_short_varint(data, 1)
+    entrypoint_len, pos = _read_short_varint(data, pos + 1)
+    if pos + entrypoint_len > len(data):
+        return None
+    try:
+        return bytes(data[pos : pos + entrypoint_len]).decode()
+    except UnicodeDecodeError:
+        return None
+
+
+def detect_format_magic(data: bytes) -> Optional[str]:
+    """
+    Constant-time format detection from the file magic.
+
+    Returns:
+        'flatbuffers' or 'protobuf', or None if data carries no magic (legacy
+        FlatBuffers files without a file_identifier, text or corrupt files)
+    """
+    if has_flatbuffers_identifier(data):
+        return "flatbuffers"
+    if has_protobuf_fixture_magic(data):
+        return "protobuf"
+    return None
+
+
+def report_legacy_format_detections():
+    """Print how often detect_format() had to fall back to the heuristics."""
+    count = format_detection_counts.snapshot()["heuristic"]
+    if count:
+        print(f"Format detections without a file magic (legacy heuristics): {count}")
+
 
 def is_flatbuffers_format(data: bytes) -> bool:
     """
@@ -342,12 +447,17 @@ def detect_format(data: bytes, validate: bool = False) -> str:
     """
     Detect the format of binary data.
 
+    Files with a definitive magic (see detect_format_magic) are classified
+    by that alone. Legacy files fall back to the heuristics below; how often
+    that happens is tracked in format_detection_counts.
+
     Detection order matters - FlatBuffers has more specific patterns,
     so it's checked first to avoid false positives from Protobuf detection.
 
     Args:
         data: Raw bytes to check
         validate: If True, try to actually parse the data to confirm format
+            (only for files without a magic)
 
     Returns:
         'flatbuffers', 'protobuf', or 'unknown'
@@ -355,6 +465,15 @@ def detect_format(data: bytes, validate: bool = False) -> str:
     if len(data) < 4:
         return "unknown"
 
+    fmt = detect_format_magic(data)
+    if fmt == "flatbuffers":
+        format_detection_counts.add("flatbuffers_identifier")
+        return fmt
+    if fmt == "protobuf":
+        format_detection_counts.add("protobuf_magic")
+        return fmt
+    format_detection_counts.add("heuristic")
+
     # Check FlatBuffers first - it has more specific structural requirements
     if is_flatbuffers_format(data):
         if validate:
@@ -736,6 +855,89 @@ def build_fb_elf_ctx(elf_data: bytes, features: list, deploy_checks: bool) -> by
     return bytes(builder.Output())
 
 
+# Alignment of every scalar in the ELF loader schema (features are uint64)
+_FB_MAX_ALIGNMENT = 8
+
+
+def _fb_table_extent(tab) -> Tuple[int, int]:
+    """Byte range [start, end) of a table's inline fields and its vtable."""
+    from flatbuffers import encode
+    from flatbuffers.number_types import SOffsetTFlags, VOffsetTFlags
+
+    buf, pos = tab.Bytes, tab.Pos
+    vtable = pos - encode.Get(SOffsetTFlags.packer_type, buf, pos)
+    vtable_size = encode.Get(VOffsetTFlags.packer_type, buf, vtable)
+    table_size = encode.Get(VOffsetTFlags.packer_type, buf, vtable + 2)
+    return min(pos, vtable), max(pos + table_size, vtable + vtable_size)
+
+
+def _fb_vector_extent(tab, slot: int, elem_size: int) -> Optional[Tuple[int, int]]:
+    """Byte range [start, end) of a vector field, including its length prefix."""
+    o = tab.Offset(slot)
+    if o == 0:
+        return None
+    start = tab.Vector(o)
+    return start - 4, start + tab.VectorLen(o) * elem_size
+
+
+def embedded_fb_elf_ctx(
+    data, fb_fixture, in_place: bool = False
+) -> Optional[Union[bytearray, memoryview]]:
+    """
+    Standalone ELFLoaderCtx buffer that reuses the context embedded in a fixture.
+
+    FlatBuffers offsets are relative, so the bytes of the fixture's input
+    table (with its vtable, ELF data and feature set) form a valid context
+    as soon as a root offset pointing at the table is put in front of them.
+    This skips extract_fb_elf_ctx_fields() + build_fb_elf_ctx() and is only
+    valid when the context is passed on unchanged.
+
+    With in_place=True and a writable buffer (e.g. a copy-on-write mmap from
+    read_test_file(use_mmap=True)), the root offset is written over the 8
+    bytes preceding the context and a view into data is returned, so the ELF
+    is never copied. Those bytes belong to other parts of the fixture, which
+    must not be read through fb_fixture afterwards. Otherwise the context is
+    copied once into a new buffer.
+
+    Args:
+        data: Buffer fb_fixture was parsed from
+        fb_fixture: Parsed FlatBuffers ELFLoaderFixture object
+        in_place: Allow writing the root offset into data
+
+    Returns:
+        Serialized ELFLoaderCtx, or None if the fixture has no input
+    """
+    fb_input = fb_fixture.Input()
+    if fb_input is None:
+        return None
+
+    tab = fb_input._tab
+    extents = [_fb_table_extent(tab), _fb_vector_extent(tab, 4, 1)]
+    fb_features = fb_input.Features()
+    if fb_features is not None:
+        extents.append(_fb_table_extent(fb_features._tab))
+        extents.append(_fb_vector_extent(fb_features._tab, 4, 8))
+    extents = [extent for extent in extents if extent is not None]
+
+    # Keep the original alignment: start on an aligned offset and put the
+    # root offset (padded to the same alignment) in front
+    start = min(s for s, _ in extents)
+    start -= start % _FB_MAX_ALIGNMENT
+    end = max(e for _, e in extents)
+    root_offset = struct.pack("<I", _FB_MAX_ALIGNMENT + tab.Pos - start)
+
+    view = memoryview(data)
+    if in_place and not view.readonly and start >= _FB_MAX_ALIGNMENT:
+        header_start = start - _FB_MAX_ALIGNMENT
+        view[header_start : header_start + len(root_offset)] = root_offset
+        return view[header_start:end]
+
+    ctx = bytearray(_FB_MAX_ALIGNMENT + end - start)
+    ctx[: len(root_offset)] = root_offset
+    ctx[_FB_MAX_ALIGNMENT:] = view[start:end]
+    return ctx
+
+
 def parse_fb_elf_effects(data: bytes) -> Optional[dict]:
     """
     Parse raw bytes as FlatBuffers ELFLoaderEffects (e.g. from shared library output).
@@ -782,6 +984,7 @@ def build_fb_elf_fixture(
     features: list,
     deploy_checks: bool,
     effects: Optional[dict] = None,
+    file_identifier: Optional[bytes] = None,
 ) -> bytes:
     """
     Build a complete FlatBuffers ELFLoaderFixture from individual field values.
@@ -794,6 +997,8 @@ def build_fb_elf_fixture(
         deploy_checks: Whether deploy checks are enabled
         effects: Dict with keys: err_code, rodata_hash, text_cnt, text_off,
                  entry_pc, calldests_hash. None for no output.
+        file_identifier: file_identifier to write, None for none (the
+                         schema does not declare one yet)
 
     Returns:
         Serialized FlatBuffers bytes for the complete ELFLoaderFixture
@@ -873,7 +1078,7 @@ def build_fb_elf_fixture(
     FB_ELFLoaderFixture_mod.AddOutput(builder, output_offset)
     fixture_offset = FB_ELFLoaderFixture_mod.End(builder)
 
-    builder.Finish(fixture_offset)
+    builder.Finish(fixture_offset, file_identifier=file_identifier)
     return bytes(builder.Output())
 
 
@@ -926,12 +1131,14 @@ class FixtureLoader:
         ...     print(f"Failed: {loader.error_message}")
     """
 
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, raw_data: Optional[bytes] = None):
         """
         Load a fixture file, automatically detecting format.
 
         Args:
             filepath: Path to the fixture file
+            raw_data: Contents of the fixture file, if already read (the
+                file is then not touched again)
         """
         self.filepath = filepath
         self.format_type = "unknown"
@@ -939,17 +1146,21 @@ class FixtureLoader:
         self.raw_data: bytes = b""
         self.error_message: Optional[str] = None
 
-        self._load()
+        self._load(raw_data)
 
-    def _load(self):
+    def _load(self, raw_data: Optional[bytes] = None):
         """Load and parse the fixture file."""
-        # Check file exists
-        if not self.filepath.exists():
-            self.error_message = f"File not found: {self.filepath}"
-            return
+        if raw_data is None:
+            # Check file exists
+            if not self.filepath.exists():
+                self.error_message = f"File not found: {self.filepath}"
+                return
+
+            # Check file size
+            file_size = self.filepath.stat().st_size
+        else:
+            file_size = len(raw_data)
 
-        # Check file size
-        file_size = self.filepath.stat().st_size
         if file_size == 0:
             self.error_message = f"File is empty: {self.filepath}"
             return
@@ -958,12 +1169,15 @@ class FixtureLoader:
             self.error_message = f"File too small ({file_size} bytes): {self.filepath}"
             return
 
-        try:
-            with open(self.filepath, "rb") as f:
-                self.raw_data = f.read()
-        except IOError as e:
-            self.error_message = f"Failed to read file: {e}"
-            return
+        if raw_data is not None:
+            self.raw_data = raw_data
+        else:
+            try:
+                with open(self.filepath, "rb") as f:
+                    self.raw_data = f.read()
+            except IOError as e:
+                self.error_message = f"Failed to read file: {e}"
+                return
 
         self.format_type = detect_format(self.raw_data)
 
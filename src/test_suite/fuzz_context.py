@@ -1,3 +1,4 @@
+from test_suite.constants import OUTPUT_BUFFER_SIZE
 from test_suite.fuzz_interface import HarnessCtx
 
 import test_suite.protos.txn_pb2 as txn_pb
@@ -27,7 +28,7 @@ InstrHarness = HarnessCtx(
     fuzz_fn_name="sol_compat_instr_execute_v1",
     fixture_desc=invoke_pb.InstrFixture.DESCRIPTOR,
     context_extension=".instrctx",
-    # prune_effects_fn=instr_prune.prune_execution_result,
+    prune_effects_fn=instr_prune.prune_execution_result,
     context_human_encode_fn=instr_codec.encode_input,
     context_human_decode_fn=instr_codec.decode_input,
     effects_human_encode_fn=instr_codec.encode_output,
@@ -35,6 +36,7 @@ InstrHarness = HarnessCtx(
     core_bpf_diff_effect_fn=instr_diff.core_bpf_instr_diff_effects,
     ignore_compute_units_diff_effect_fn=instr_diff.ignore_compute_units_instr_diff_effects,
     regenerate_transformation_fn=instr_transform.transform_fixture,
+    output_buffer_size=OUTPUT_BUFFER_SIZE,
 )
 
 SyscallHarness = HarnessCtx(
@@ -45,6 +47,7 @@ SyscallHarness = HarnessCtx(
     effects_human_encode_fn=syscall_codec.encode_output,
     context_human_decode_fn=syscall_codec.decode_input,
     regenerate_transformation_fn=syscall_transform.transform_fixture,
+    output_buffer_size=OUTPUT_BUFFER_SIZE,
 )
 
 VmInterpHarness = HarnessCtx(
@@ -55,6 +58,7 @@ VmInterpHarness = HarnessCtx(
     effects_human_encode_fn=syscall_codec.encode_output,
     context_human_decode_fn=syscall_codec.decode_input,
     regenerate_transformation_fn=syscall_transform.transform_fixture,
+    output_buffer_size=OUTPUT_BUFFER_SIZE,
 )
 
 VmValidateHarness = HarnessCtx(
@@ -67,12 +71,13 @@ TxnHarness = HarnessCtx(
     fuzz_fn_name="sol_compat_txn_execute_v1",
     fixture_desc=txn_pb.TxnFixture.DESCRIPTOR,
     context_extension=".txnctx",
-    # prune_effects_fn=txn_prune.prune_execution_result,
+    prune_effects_fn=txn_prune.prune_execution_result,
     context_human_encode_fn=txn_codec.encode_input,
     context_human_decode_fn=txn_codec.decode_input,
     effects_human_encode_fn=txn_codec.encode_output,
     regenerate_transformation_fn=txn_transform.transform_fixture,
     consensus_diff_effect_fn=txn_diff.consensus_txn_diff_effects,
+    output_buffer_size=OUTPUT_BUFFER_SIZE,
 )
 
 BlockHarness = HarnessCtx(
@@ -82,6 +87,7 @@ BlockHarness = HarnessCtx(
     context_human_encode_fn=block_codec.encode_input,
     context_human_decode_fn=block_codec.decode_input,
     effects_human_encode_fn=block_codec.encode_output,
+    output_buffer_size=OUTPUT_BUFFER_SIZE,
     # TODO: Fill in other fields...
 )
 
@@ -121,6 +127,10 @@ DEFAULT_OUTPUT_FORMAT = "auto"
 # FlatBuffers Support
 # ============================================================================
 
+# v2 entrypoints that are called natively on FlatBuffers fixtures and have no
+# v1 harness in ENTRYPOINT_HARNESS_MAP
+FLATBUFFERS_ONLY_ENTRYPOINTS = ("sol_compat_elf_loader_v2",)
+
 
 def entrypoint_to_v2(entrypoint: str) -> str:
     """Convert a v1 entrypoint to v2 (for FlatBuffers output).
@@ -1,6 +1,8 @@
 from typing import Callable, Type, TypeVar
-from google.protobuf import message, descriptor, message_factory
+from google.protobuf import message, descriptor, message_factory, text_format
 from dataclasses import dataclass, InitVar, field
+from test_suite.constants import SMALL_OUTPUT_BUFFER_SIZE
+from test_suite.diff_utils import EffectsDiff
 
 msg_factory = message_factory.MessageFactory()
 
@@ -17,25 +19,85 @@ The following defines the interface:
     - A fixture message is a message that contains an input and output message.
     - input: The fuzz target Context
     - output: The fuzz target Effects
-- diff_effect_fn: A function that compares two effects messages for equality
+- diff_effect_fn: A function that compares two effects messages for equality.
+    An EffectsDiff (see diff_utils) also reports the mismatching fields of failing tests.
 - consensus_diff_effect_fn: Similar to above, but defines a diff function for consensus mode
-- prune_effects_fn: A function that prunes effects to remove extra fields (e.g. remove accounts that weren't actually modified)
+- prune_effects_fn: A function that prunes effects to remove extra fields (e.g. remove accounts that weren't actually modified).
+    It receives and returns the TargetEffects of each target.
+- output_buffer_size: Initial size of the output buffer handed to the harness function.
+    The buffer grows on demand, so this only needs to cover typical effects.
 - human encode/decode functions for the context and effects messages to
   convert the messages to/from human-readable format (in-place).
   Both context and effects messages can have their own encode/decode functions.
 """
 
 
+class TargetEffects:
+    """
+    Effects of one target for one test, shared by the prune, diff and render
+    stages of a test run so that they are parsed and serialized at most once.
+
+    Holds the parsed message, its deterministic serialization, or both; the
+    missing form is produced on first use and kept. Code that changes the
+    message in place must call modified() afterwards.
+    """
+
+    __slots__ = ("effects_type", "_message", "_serialized")
+
+    def __init__(
+        self,
+        effects_type: Type[EffectsType],
+        message: EffectsType | None = None,
+        serialized: bytes | None = None,
+    ):
+        if message is None and serialized is None:
+            raise ValueError("TargetEffects needs a message or its serialization")
+        self.effects_type = effects_type
+        self._message = message
+        self._serialized = serialized
+
+    @classmethod
+    def of(cls, effects: EffectsType) -> "TargetEffects":
+        """Wrap a parsed effects message."""
+        return cls(type(effects), message=effects)
+
+    @property
+    def message(self) -> EffectsType:
+        if self._message is None:
+            self._message = self.effects_type()
+            self._message.ParseFromString(self._serialized)
+        return self._message
+
+    @property
+    def serialized(self) -> bytes:
+        if self._serialized is None:
+            self._serialized = self._message.SerializeToString(deterministic=True)
+        return self._serialized
+
+    def modified(self):
+        """Drop the serialization after the message was changed in place."""
+        self.message
+        self._serialized = None
+
+    def render(self, human_encode_fn: Callable[[EffectsType], None]) -> str:
+        """
+        Render the effects as human-readable text. The message is
+        human-encoded in place, so rendering is the last stage.
+        """
+        human_encode_fn(self.message)
+        self.modified()
+        return text_format.MessageToString(self._message)
+
+
 def generic_effects_prune(
-    ctx: ContextType | None, effects: dict[str, str | None]
-) -> dict[str, str | None] | None:
+    ctx: ContextType | None, effects: dict[str, TargetEffects | None]
+) -> dict[str, TargetEffects | None] | None:
     if ctx is None:
         return None
     return effects
 
 
-def generic_effects_diff(a: EffectsType, b: EffectsType) -> bool:
-    return a == b
+generic_effects_diff = EffectsDiff()
 
 
 def generic_human_encode(obj: message.Message) -> None:
@@ -76,7 +138,8 @@ class HarnessCtx:
         generic_effects_diff
     )
     prune_effects_fn: Callable[
-        [ContextType | None, dict[str, str | None]], dict[str, str | None] | None
+        [ContextType | None, dict[str, TargetEffects | None]],
+        dict[str, TargetEffects | None] | None,
     ] = generic_effects_prune
     context_human_encode_fn: Callable[[ContextType], None] = generic_human_encode
     context_human_decode_fn: Callable[[ContextType], None] = generic_human_decode
@@ -84,6 +147,7 @@ class HarnessCtx:
     effects_human_decode_fn: Callable[[EffectsType], None] = generic_human_decode
     regenerate_transformation_fn: Callable[[FixtureType], None] = generic_transform
     supports_flatbuffers: bool = False
+    output_buffer_size: int = SMALL_OUTPUT_BUFFER_SIZE
     fixture_type: Type[FixtureType] = field(init=False)
     context_type: Type[ContextType] = field(init=False)
     effects_type: Type[EffectsType] = field(init=False)
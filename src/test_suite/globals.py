@@ -6,6 +6,16 @@ from test_suite.fuzz_interface import HarnessCtx
 # Target libraries (for run-tests)
 target_libraries = {}
 
+# Pre-typed sol_compat_* functions, keyed by (target path, entrypoint name)
+sol_compat_fns = {}
+
+# Long-lived WorkerPool shared by the phases of a composite command
+# (parent process only; None outside of multiprocessing_utils.worker_session)
+worker_pool = None
+
+# Target libraries loaded and initialized by the active worker session
+session_libraries: set = set()
+
 # Ground truth library (for run-tests)
 reference_shared_library = None
 
@@ -15,9 +25,27 @@ n_iterations = 0
 # Output directory
 output_dir = None
 
-# Fill output buffer with random bytes
+# Output buffer for the current process (allocated lazily, grows on demand)
 output_buffer_pointer = None
 
+# Fill output buffer with random bytes
+randomize_output_buffer: bool = False
+
+# Seed for the random output buffer contents (None = pick one per process)
+output_buffer_seed: int | None = None
+
+# Whether each test calls its target libraries concurrently from threads
+# (for run-tests), instead of one after another
+parallel_targets: bool = False
+
+# Whether a test file that cannot be decoded aborts the run (FixtureParseError)
+# instead of being skipped, with no fallback to a second parse path
+strict_parsing: bool = False
+
+# Whether to render the effects of passing tests in human-readable format
+# (otherwise only failing tests are rendered and passing tests get a digest)
+render_passing_effects: bool = True
+
 # A FeaturePool object describing the hardcoded and supported features
 # of the target
 feature_pool = None
@@ -1,60 +1,18 @@
 import test_suite.protos.invoke_pb2 as invoke_pb
+from test_suite.diff_utils import EffectsDiff
 
 
-def consensus_instr_diff_effects(a: invoke_pb.InstrEffects, b: invoke_pb.InstrEffects):
-    a_san = invoke_pb.InstrEffects()
-    a_san.CopyFrom(a)
-    b_san = invoke_pb.InstrEffects()
-    b_san.CopyFrom(b)
+def _failed_instr_accounts(effects: invoke_pb.InstrEffects):
+    # If the result is an error (not 0), don't compare modified accounts
+    return ("modified_accounts",) if effects.result != 0 else ()
 
-    # Normalize error codes and cus
-    a_san.result = 0
-    a_san.custom_err = 0
-    a_san.cu_avail = 0
 
-    b_san.result = 0
-    b_san.custom_err = 0
-    b_san.cu_avail = 0
+# Normalize error codes and cus
+consensus_instr_diff_effects = EffectsDiff(ignore=("result", "custom_err", "cu_avail"))
 
-    return a_san == b_san
+core_bpf_instr_diff_effects = EffectsDiff(
+    ignore=("result", "custom_err", "cu_avail"),
+    cleared_fn=_failed_instr_accounts,
+)
 
-
-def core_bpf_instr_diff_effects(a: invoke_pb.InstrEffects, b: invoke_pb.InstrEffects):
-    a_san = invoke_pb.InstrEffects()
-    a_san.CopyFrom(a)
-    b_san = invoke_pb.InstrEffects()
-    b_san.CopyFrom(b)
-
-    # If the result is an error (not 0), don't return modified accounts.
-    if a_san.result != 0:
-        while len(a_san.modified_accounts) > 0:
-            a_san.modified_accounts.pop()
-    if b_san.result != 0:
-        while len(b_san.modified_accounts) > 0:
-            b_san.modified_accounts.pop()
-
-    # Normalize error codes and cus
-    a_san.result = 0
-    a_san.custom_err = 0
-    a_san.cu_avail = 0
-
-    b_san.result = 0
-    b_san.custom_err = 0
-    b_san.cu_avail = 0
-
-    return a_san == b_san
-
-
-def ignore_compute_units_instr_diff_effects(
-    a: invoke_pb.InstrEffects, b: invoke_pb.InstrEffects
-):
-    a_san = invoke_pb.InstrEffects()
-    a_san.CopyFrom(a)
-    b_san = invoke_pb.InstrEffects()
-    b_san.CopyFrom(b)
-
-    a_san.cu_avail = 0
-
-    b_san.cu_avail = 0
-
-    return a_san == b_san
+ignore_compute_units_instr_diff_effects = EffectsDiff(ignore=("cu_avail",))
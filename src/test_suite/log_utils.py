@@ -1,50 +1,93 @@
 from pathlib import Path
 import shutil
 from typing import List
-from test_suite.constants import LOG_FILE_SEPARATOR_LENGTH
+from test_suite.constants import LOG_FILE_SEPARATOR_LENGTH, TEST_CASE_CRASHED
+from test_suite.fixture_pack import read_pack_member
 import test_suite.globals as globals
 
 
-def log_results(
-    test_cases: list[Path],
-    test_case_results,
-    shared_libraries,
-    log_chunk_size: int,
-    failures_only: bool,
-    save_failures: bool,
-    save_successes: bool,
-):
-    # Make failed protobuf directory
-    if save_failures:
-        failed_protobufs_dir = globals.output_dir / "failed_protobufs"
-        failed_protobufs_dir.mkdir(parents=True, exist_ok=True)
-    if save_successes:
-        successful_protobufs_dir = globals.output_dir / "successful_protobufs"
-        successful_protobufs_dir.mkdir(parents=True, exist_ok=True)
-
-    passed = 0
-    failed = 0
-    skipped = 0
-    successful_tests = set()
-    failed_tests = set()
-    skipped_tests = []
-    target_log_files = {target: None for target in shared_libraries}
-    for file_stem, status, stringified_results in test_case_results:
+class ResultLogger:
+    """
+    Streams test case results to per-target log chunks as they arrive.
+
+    Counters are kept incrementally and failing/passing inputs are copied as
+    each result lands, so memory use does not grow with the rendered effects
+    of the whole corpus. Feed results with add() (e.g. as the result_callback
+    of util.process_items) and call close() once all results are in.
+    """
+
+    def __init__(
+        self,
+        test_cases: list[Path],
+        shared_libraries,
+        log_chunk_size: int,
+        failures_only: bool,
+        save_failures: bool,
+        save_successes: bool,
+    ):
+        self.shared_libraries = shared_libraries
+        self.log_chunk_size = log_chunk_size
+        self.failures_only = failures_only
+        self.save_failures = save_failures
+        self.save_successes = save_successes
+
+        # Make failed protobuf directory
+        self.failed_protobufs_dir = globals.output_dir / "failed_protobufs"
+        self.successful_protobufs_dir = globals.output_dir / "successful_protobufs"
+        self.crashed_protobufs_dir = globals.output_dir / "crashed_protobufs"
+        if save_failures:
+            self.failed_protobufs_dir.mkdir(parents=True, exist_ok=True)
+        if save_successes:
+            self.successful_protobufs_dir.mkdir(parents=True, exist_ok=True)
+
+        # Input files by stem, for copying failures/successes as they land
+        self.input_files = {}
+        if save_failures or save_successes:
+            for input_file in test_cases:
+                self.input_files.setdefault(input_file.stem, []).append(input_file)
+
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.failed_tests = set()
+        self.skipped_tests = []
+        self.crashed_tests = []
+        self.target_log_files = {target: None for target in shared_libraries}
+
+    def _copy_input(self, file_stem: str, directory: Path):
+        for input_file in self.input_files.get(file_stem, []):
+            packed_data = read_pack_member(input_file)
+            if packed_data is not None:
+                directory.mkdir(parents=True, exist_ok=True)
+                (directory / input_file.name).write_bytes(packed_data)
+            elif input_file.is_file():
+                directory.mkdir(parents=True, exist_ok=True)
+                shutil.copy(input_file, directory)
+
+    def add(self, result):
+        """Log a single (file_stem, status, stringified_results) result."""
+        file_stem, status, stringified_results = result
+        if status == TEST_CASE_CRASHED:
+            self.crashed_tests.append(file_stem)
+            if self.save_failures:
+                self._copy_input(file_stem, self.crashed_protobufs_dir)
+            return
+
         if stringified_results is None:
-            skipped += 1
-            skipped_tests.append(file_stem)
-            continue
+            self.skipped += 1
+            self.skipped_tests.append(file_stem)
+            return
 
         for target, string_result in stringified_results.items():
-            if (passed + failed) % log_chunk_size == 0:
-                if target_log_files[target]:
-                    target_log_files[target].close()
-                target_log_files[target] = open(
+            if (self.passed + self.failed) % self.log_chunk_size == 0:
+                if self.target_log_files[target]:
+                    self.target_log_files[target].close()
+                self.target_log_files[target] = open(
                     globals.output_dir / target.stem / (file_stem + ".txt"), "w"
                 )
 
-            if not failures_only or status == -1:
-                target_log_files[target].write(
+            if not self.failures_only or status == -1:
+                self.target_log_files[target].write(
                     file_stem
                     + ":\n"
                     + string_result
@@ -54,24 +97,34 @@ def log_results(
                 )
 
         if status == 1:
-            passed += 1
-            successful_tests.add(file_stem)
+            self.passed += 1
+            if self.save_successes:
+                self._copy_input(file_stem, self.successful_protobufs_dir)
         elif status == -1:
-            failed += 1
-            failed_tests.add(file_stem)
-
-    for target in shared_libraries:
-        if target_log_files[target]:
-            target_log_files[target].close()
+            self.failed += 1
+            if self.save_failures and file_stem not in self.failed_tests:
+                self._copy_input(file_stem, self.failed_protobufs_dir)
+            self.failed_tests.add(file_stem)
 
-    # Save successes and/or failures
-    for input_file in test_cases:
-        if not input_file.is_file():
-            continue
+    def close(self):
+        """
+        Close the last log chunk of each target, so that its buffered output
+        is written out, and return the totals.
 
-        if save_failures and input_file.stem in failed_tests:
-            shutil.copy(input_file, failed_protobufs_dir)
-        if save_successes and input_file.stem in successful_tests:
-            shutil.copy(input_file, successful_protobufs_dir)
+        Returns:
+            (passed, failed, skipped, log files by target, failed test stems,
+            skipped test stems, crashed test stems)
+        """
+        for target in self.shared_libraries:
+            if self.target_log_files[target]:
+                self.target_log_files[target].close()
 
-    return passed, failed, skipped, target_log_files, list(failed_tests), skipped_tests
+        return (
+            self.passed,
+            self.failed,
+            self.skipped,
+            self.target_log_files,
+            list(self.failed_tests),
+            self.skipped_tests,
+            self.crashed_tests,
+        )
@@ -1,24 +1,34 @@
 from dataclasses import dataclass, field
-from test_suite.constants import OUTPUT_BUFFER_SIZE
+from test_suite.constants import (
+    MMAP_MIN_FILE_SIZE,
+    OUTPUT_BUFFER_FILL_PATTERN_SIZE,
+    OUTPUT_BUFFER_SIZE,
+    SMALL_OUTPUT_BUFFER_SIZE,
+    TEST_CASE_CRASHED,
+)
 from test_suite.fuzz_context import (
     CRASH_EXTENSION,
     ENTRYPOINT_HARNESS_MAP,
     FIXTURE_EXTENSION,
+    FLATBUFFERS_ONLY_ENTRYPOINTS,
     HarnessCtx,
     get_harness_for_entrypoint,
     entrypoint_to_v2,
 )
 from test_suite.flatbuffers_utils import (
     detect_format,
+    FixtureLoader,
     FLATBUFFERS_AVAILABLE,
     parse_fb_elf_fixture,
     extract_fb_elf_ctx_fields,
     extract_fb_elf_effects_fields,
     extract_fb_elf_entrypoint,
     build_fb_elf_ctx,
+    embedded_fb_elf_ctx,
     parse_fb_elf_effects,
 )
-from test_suite.fuzz_interface import ContextType, EffectsType
+from test_suite.diff_utils import EffectsDiff
+from test_suite.fuzz_interface import ContextType, EffectsType, TargetEffects
 import test_suite.protos.invoke_pb2 as invoke_pb
 import test_suite.protos.metadata_pb2 as metadata_pb2
 import ctypes
@@ -34,20 +44,48 @@ from google.protobuf import (
     message_factory,
     descriptor_pb2,
 )
+import hashlib
+import mmap
 import os
+import random
 import sys
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from test_suite.octane_api_client import OctaneAPIClient
 from test_suite.octane_utils import get_octane_api_origin
-from test_suite.sanitizer_utils import load_shared_library_safe
+from test_suite.sanitizer_utils import (
+    load_shared_library_safe,
+    setup_sanitizer_environment,
+)
+from test_suite.fixture_pack import read_pack_member
+from test_suite.util import SharedCounters, WorkerPool
+
+# How the current process output buffer was filled (randomize, seed)
+_allocated_fill_settings = None
+
+# State of the threads that call targets in parallel (see call_targets());
+# each of them has its own output buffer
+_target_thread = threading.local()
+
+# Thread pool for parallel target calls and the process that created it
+_target_executor = None
+_target_executor_pid = None
 
 # Thread-safe deduplication variables
 _download_cache_lock = threading.Lock()
 _extracted_fixtures = set()
 _downloaded_artifact_hashes = set()
 
+# Wall time of each target's harness calls for the current test, by target
+_harness_call_seconds = {}
+
+# Wall time of each pipeline stage (execute, prune, diff, render) for the
+# current test, by stage
+_stage_seconds = {}
+
 
 # Create a minimal protobuf message that only extracts field 1 (metadata)
 def _create_metadata_only_fixture():
@@ -162,61 +200,342 @@ def _download_with_timing(download_func, log_prefix: str):
     return data
 
 
+def as_uint8_pointer(data):
+    """
+    Borrow a uint8 pointer into a serialized input buffer without copying it.
+
+    `bytes` are passed through their internal buffer and writable buffers
+    (bytearray, writable memoryview, mmap) are wrapped in place. Read-only
+    views over other objects fall back to a single memcpy. The caller must
+    keep `data` alive for as long as the pointer is in use.
+
+    Args:
+        - data: bytes, bytearray, memoryview or any other buffer-protocol object.
+
+    Returns:
+        - ctypes.POINTER(ctypes.c_uint8): Pointer to the first byte of the input.
+    """
+    if isinstance(data, bytes):
+        return ctypes.cast(data, POINTER(ctypes.c_uint8))
+
+    view = memoryview(data).cast("B")
+    if view.readonly:
+        in_buf = (ctypes.c_uint8 * len(view)).from_buffer_copy(view)
+    else:
+        in_buf = (ctypes.c_uint8 * len(view)).from_buffer(view)
+    return ctypes.cast(in_buf, POINTER(ctypes.c_uint8))
+
+
+# Argument types shared by every sol_compat_* entrypoint (v1 and v2 ABIs)
+SOL_COMPAT_ARGTYPES = [
+    POINTER(ctypes.c_uint8),  # out_ptr
+    POINTER(c_uint64),  # out_psz
+    POINTER(ctypes.c_uint8),  # in_ptr
+    c_uint64,  # in_sz
+]
+
+
+def _bind_sol_compat_fn(library: ctypes.CDLL, fn_name: str):
+    """
+    Look up a sol_compat_* function, set its prototype and cache it in the
+    per-process registry.
+
+    Raises AttributeError if the library does not export fn_name.
+    """
+    sol_compat_fn = getattr(library, fn_name)
+    sol_compat_fn.argtypes = SOL_COMPAT_ARGTYPES
+    sol_compat_fn.restype = c_int
+    globals.sol_compat_fns[(library._name, fn_name)] = sol_compat_fn
+    return sol_compat_fn
+
+
+def bind_sol_compat_fns(libraries=None):
+    """
+    Populate the per-process registry of pre-typed sol_compat_* functions.
+
+    Binds the v1 (Protobuf) and v2 (FlatBuffers) variant of every known
+    entrypoint that each library exports, so per-test calls skip the symbol
+    lookup and prototype setup. Entrypoints a library does not export are
+    skipped.
+
+    Args:
+        - libraries (Iterable[ctypes.CDLL] | None): Libraries to bind. Defaults
+          to the loaded target libraries.
+    """
+    if libraries is None:
+        libraries = globals.target_libraries.values()
+
+    fn_names = set(FLATBUFFERS_ONLY_ENTRYPOINTS)
+    for entrypoint in ENTRYPOINT_HARNESS_MAP:
+        fn_names.add(entrypoint)
+        fn_names.add(entrypoint_to_v2(entrypoint))
+
+    for library in libraries:
+        for fn_name in sorted(fn_names):
+            if (library._name, fn_name) in globals.sol_compat_fns:
+                continue
+            try:
+                _bind_sol_compat_fn(library, fn_name)
+            except AttributeError:
+                continue
+
+
+def get_sol_compat_fn(library: ctypes.CDLL, fn_name: str):
+    """
+    Return the pre-typed sol_compat_* function for (library, fn_name).
+
+    Falls back to binding it on first use when the registry was built before
+    the library was loaded.
+
+    Args:
+        - library (ctypes.CDLL): Shared library handle.
+        - fn_name (str): Name of the entrypoint.
+
+    Returns:
+        - ctypes function pointer with argtypes/restype set.
+    """
+    sol_compat_fn = globals.sol_compat_fns.get((library._name, fn_name))
+    if sol_compat_fn is None:
+        sol_compat_fn = _bind_sol_compat_fn(library, fn_name)
+    return sol_compat_fn
+
+
+def fill_output_buffer_random(buffer, seed: int):
+    """
+    Fill an output buffer with reproducible pseudo-random bytes.
+
+    A seeded block of OUTPUT_BUFFER_FILL_PATTERN_SIZE bytes is generated once
+    and tiled across the buffer with memmove, so the cost is a handful of
+    memcpys rather than a per-byte Python loop.
+
+    Args:
+        - buffer (ctypes.Array): Output buffer to fill.
+        - seed (int): Seed for the random block.
+    """
+    size = len(buffer)
+    if size == 0:
+        return
+
+    pattern = random.Random(seed).randbytes(min(size, OUTPUT_BUFFER_FILL_PATTERN_SIZE))
+    ctypes.memmove(buffer, pattern, len(pattern))
+
+    # Double the filled prefix until the buffer is full
+    base = ctypes.addressof(buffer)
+    filled = len(pattern)
+    while filled < size:
+        chunk = min(filled, size - filled)
+        ctypes.memmove(base + filled, base, chunk)
+        filled += chunk
+
+
+def _output_buffer_fill_settings() -> tuple[bool, int | None]:
+    if not globals.randomize_output_buffer:
+        return False, None
+    return True, globals.output_buffer_seed
+
+
+def _allocate_output_buffer(size: int):
+    global _allocated_fill_settings
+    buffer = (ctypes.c_uint8 * size)()
+    if globals.randomize_output_buffer:
+        fill_output_buffer_random(buffer, globals.output_buffer_seed)
+    _allocated_fill_settings = _output_buffer_fill_settings()
+    return buffer
+
+
+def _get_output_buffer():
+    if not getattr(_target_thread, "own_buffer", False):
+        return globals.output_buffer_pointer
+    if getattr(_target_thread, "fill_settings", None) != _output_buffer_fill_settings():
+        return None
+    return getattr(_target_thread, "output_buffer", None)
+
+
+def _set_output_buffer(buffer):
+    if not getattr(_target_thread, "own_buffer", False):
+        globals.output_buffer_pointer = buffer
+        return
+    _target_thread.output_buffer = buffer
+    _target_thread.fill_settings = _output_buffer_fill_settings()
+
+
+def ensure_output_buffer(size: int):
+    """
+    Return the process output buffer, (re)allocating it if it holds fewer
+    than `size` bytes. The buffer never shrinks.
+
+    Threads that call targets in parallel (see call_targets()) get their own
+    buffer instead of the process one.
+
+    Args:
+        - size (int): Minimum required capacity in bytes.
+
+    Returns:
+        - ctypes.Array: The process output buffer.
+    """
+    buffer = _get_output_buffer()
+    if buffer is None or len(buffer) < size:
+        buffer = _allocate_output_buffer(size)
+        _set_output_buffer(buffer)
+    return buffer
+
+
+def call_sol_compat_fn(
+    sol_compat_fn, in_ptr, in_sz: int, output_buffer_size: int, succeeded
+) -> int | None:
+    """
+    Call a sol_compat_* function with the process output buffer.
+
+    A failed call made with less than OUTPUT_BUFFER_SIZE bytes of output
+    space is retried once with a larger buffer: the size the target reported
+    through out_psz, if it wrote a larger one (up to OUTPUT_BUFFER_SIZE), or
+    OUTPUT_BUFFER_SIZE if it left out_psz unchanged, since targets do not
+    report overflow otherwise. Failures that set out_psz to a smaller value
+    (e.g. 0 for a rejected input) are not retried. The grown buffer is kept
+    as the output buffer of the process (or thread), so each process retries
+    with OUTPUT_BUFFER_SIZE at most once.
+
+    Args:
+        - sol_compat_fn: Pre-typed sol_compat_* function.
+        - in_ptr: Pointer to the serialized input.
+        - in_sz (int): Input size in bytes.
+        - output_buffer_size (int): Initial output buffer size for the harness.
+        - succeeded (Callable[[int], bool]): Maps the return code to success.
+
+    Returns:
+        - int | None: Number of output bytes written, or None on failure.
+    """
+    buffer = ensure_output_buffer(output_buffer_size)
+    out_sz = ctypes.c_uint64(len(buffer))
+    if succeeded(sol_compat_fn(buffer, ctypes.byref(out_sz), in_ptr, in_sz)):
+        return out_sz.value
+
+    retry_size = out_sz.value
+    if retry_size == len(buffer):
+        # out_psz unchanged: the output may not have fit
+        retry_size = OUTPUT_BUFFER_SIZE
+    if not len(buffer) < retry_size <= OUTPUT_BUFFER_SIZE:
+        return None
+
+    buffer = ensure_output_buffer(retry_size)
+    out_sz = ctypes.c_uint64(len(buffer))
+    if not succeeded(sol_compat_fn(buffer, ctypes.byref(out_sz), in_ptr, in_sz)):
+        return None
+    return out_sz.value
+
+
+def output_buffer_view(size: int) -> memoryview:
+    """
+    Return a byte view over the first `size` bytes of the process output buffer.
+
+    No data is copied; the view is overwritten by the next harness call, so
+    callers that need the bytes afterwards must copy them (e.g. bytes(view)).
+
+    Args:
+        - size (int): Number of output bytes written by the target.
+
+    Returns:
+        - memoryview: Read-write view of format "B" into the output buffer.
+    """
+    return memoryview(_get_output_buffer()).cast("B")[:size]
+
+
+@contextmanager
+def timed_harness_call(target: Path):
+    """
+    Add the wall time of the enclosed harness call(s) to the time of target
+    for the current test (see run_timed()).
+
+    Args:
+        - target (Path): Target library (or result key) the call is made for.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _harness_call_seconds[target] = (
+            _harness_call_seconds.get(target, 0.0) + time.perf_counter() - start
+        )
+
+
+@contextmanager
+def timed_stage(stage: str):
+    """
+    Add the wall time of the enclosed code to the time of a pipeline stage
+    for the current test (see run_timed()).
+
+    Args:
+        - stage (str): Stage name, e.g. "prune", "diff" or "render".
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage_seconds[stage] = (
+            _stage_seconds.get(stage, 0.0) + time.perf_counter() - start
+        )
+
+
 def process_target(
-    harness_ctx: HarnessCtx, library: ctypes.CDLL, context: ContextType
+    harness_ctx: HarnessCtx,
+    library: ctypes.CDLL,
+    context: ContextType,
+    serialized_context: bytes | None = None,
 ) -> invoke_pb.InstrEffects | None:
     """
     Process an instruction through a provided shared library and return the result.
 
     Args:
+        - harness_ctx (HarnessCtx): Harness of the context.
         - library (ctypes.CDLL): Shared library to process instructions.
-        - serialized_instruction_context (str): Serialized instruction context message.
+        - context (ContextType): Context message.
+        - serialized_context (bytes | None): Deterministic serialization of
+          context, if the caller already has it (e.g. to share it between
+          targets).
 
     Returns:
         - invoke_pb.InstrEffects | None: Result of instruction execution.
     """
 
-    serialized_instruction_context = context.SerializeToString(deterministic=True)
+    serialized_instruction_context = serialized_context
+    if serialized_instruction_context is None:
+        serialized_instruction_context = context.SerializeToString(deterministic=True)
     if serialized_instruction_context is None:
         return None
 
-    # Prepare input data and output buffers
+    # Prepare input data
     in_data = serialized_instruction_context
-    in_ptr = (ctypes.c_uint8 * len(in_data))(*in_data)
+    in_ptr = as_uint8_pointer(in_data)
     in_sz = len(in_data)
-    out_sz = ctypes.c_uint64(OUTPUT_BUFFER_SIZE)
-
-    # Get the function to call
-    sol_compat_fn = getattr(library, harness_ctx.fuzz_fn_name)
 
-    # Define argument and return types
-    sol_compat_fn.argtypes = [
-        POINTER(ctypes.c_uint8),  # out_ptr
-        POINTER(c_uint64),  # out_psz
-        POINTER(ctypes.c_uint8),  # in_ptr
-        c_uint64,  # in_sz
-    ]
-    sol_compat_fn.restype = c_int
+    # Get the pre-typed function to call
+    sol_compat_fn = get_sol_compat_fn(library, harness_ctx.fuzz_fn_name)
 
-    # Call the function
-    result = sol_compat_fn(
-        globals.output_buffer_pointer, ctypes.byref(out_sz), in_ptr, in_sz
+    # Call the function (result == 0 means execution failed)
+    out_sz = call_sol_compat_fn(
+        sol_compat_fn,
+        in_ptr,
+        in_sz,
+        harness_ctx.output_buffer_size,
+        succeeded=lambda result: result != 0,
     )
-    # Result == 0 means execution failed
-    if result == 0:
+    if out_sz is None:
         return None
 
-    # Process the output
-    output_data = bytearray(globals.output_buffer_pointer[: out_sz.value])
+    # Parse the effects straight out of the output buffer
     output_object = harness_ctx.effects_type()
-    output_object.ParseFromString(output_data)
+    output_object.ParseFromString(output_buffer_view(out_sz))
 
     return output_object
 
 
 def process_target_raw(
-    fn_name: str, library: ctypes.CDLL, ctx_bytes: bytes
-) -> bytes | None:
+    fn_name: str,
+    library: ctypes.CDLL,
+    ctx_bytes: bytes,
+    copy: bool = True,
+    output_buffer_size: int = SMALL_OUTPUT_BUFFER_SIZE,
+) -> bytes | memoryview | None:
     """
     Process raw bytes through a shared library function and return raw output bytes.
 
@@ -226,194 +545,430 @@ def process_target_raw(
     Args:
         - fn_name: Name of the shared library function to call
         - library: Shared library handle
-        - ctx_bytes: Raw input bytes (e.g. FlatBuffers-encoded context)
+        - ctx_bytes: Raw input buffer (e.g. FlatBuffers-encoded context). Any
+          bytes-like object is accepted and handed to the target without a copy.
+        - copy: If False, return a view into the process output buffer instead
+          of a copy. The view is only valid until the next harness call.
+        - output_buffer_size: Initial output buffer size for this entrypoint.
 
     Returns:
-        - bytes | None: Raw output bytes from the shared library, or None on failure
+        - bytes | memoryview | None: Raw output from the shared library, or None
+          on failure
     """
-    in_ptr = (ctypes.c_uint8 * len(ctx_bytes))(*ctx_bytes)
+    in_ptr = as_uint8_pointer(ctx_bytes)
     in_sz = len(ctx_bytes)
-    out_sz = ctypes.c_uint64(OUTPUT_BUFFER_SIZE)
 
-    sol_compat_fn = getattr(library, fn_name)
+    sol_compat_fn = get_sol_compat_fn(library, fn_name)
 
-    sol_compat_fn.argtypes = [
-        POINTER(ctypes.c_uint8),  # out_ptr
-        POINTER(c_uint64),  # out_psz
-        POINTER(ctypes.c_uint8),  # in_ptr
-        c_uint64,  # in_sz
-    ]
-    sol_compat_fn.restype = c_int
-
-    result = sol_compat_fn(
-        globals.output_buffer_pointer, ctypes.byref(out_sz), in_ptr, in_sz
-    )
     # v2 (FlatBuffers) convention: 0 = success, non-zero = failure
-    if result != 0:
+    out_sz = call_sol_compat_fn(
+        sol_compat_fn,
+        in_ptr,
+        in_sz,
+        output_buffer_size,
+        succeeded=lambda result: result == 0,
+    )
+    if out_sz is None:
         return None
 
-    return bytes(globals.output_buffer_pointer[: out_sz.value])
+    output_view = output_buffer_view(out_sz)
+    return bytes(output_view) if copy else output_view
 
 
-def extract_metadata(fixture_file: Path) -> str | None:
+def read_test_file(
+    test_file: Path, use_mmap: bool = False
+) -> bytes | memoryview | None:
     """
-    Extracts metadata from a fixture file.
+    Reads a test file in a single read.
 
-    Supports both Protobuf and FlatBuffers formats.
+    The returned bytes can be handed to extract_metadata(), read_context()
+    and read_fixture() so that sniffing the format, decoding metadata and
+    parsing the message do not each go back to the filesystem.
 
     Args:
-        - fixture_file (Path): Path to the fixture message.
+        - test_file (Path): Path to the test file.
+        - use_mmap (bool): Map files of at least MMAP_MIN_FILE_SIZE bytes
+          copy-on-write instead of reading them. The file must not be
+          truncated or rewritten while the returned view is in use.
+
+    Files inside a fixture pack (<pack>/<entry name>) are returned as a view
+    into the pack's mmap rather than copied.
 
     Returns:
-        - str | None: Metadata from the fixture file.
+        - bytes | memoryview | None: File contents, or None if the file could
+          not be read.
     """
-    # First, try FlatBuffers format detection
+    packed_data = read_pack_member(test_file)
+    if packed_data is not None:
+        return packed_data
     try:
-        from test_suite.flatbuffers_utils import (
-            detect_format,
-            FixtureLoader,
-            FLATBUFFERS_AVAILABLE,
-        )
+        with open(test_file, "rb") as f:
+            if use_mmap and os.fstat(f.fileno()).st_size >= MMAP_MIN_FILE_SIZE:
+                # Writable private mapping: lets embedded_fb_elf_ctx() patch
+                # in a root offset without copying or touching the file
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+            return f.read()
+    except OSError as e:
+        print(f"Failed to read {test_file}: {e}")
+        return None
 
-        with open(fixture_file, "rb") as f:
-            data = f.read()
 
-        fmt = detect_format(data)
+# Parse paths, in the order parse_fixture() may try them
+PARSE_PATHS = ("flatbuffers", "binary", "text")
 
-        if fmt == "flatbuffers" and FLATBUFFERS_AVAILABLE:
-            loader = FixtureLoader(fixture_file)
-            if loader.is_valid and loader.metadata:
-                return loader.metadata
-    except ImportError:
-        pass  # FlatBuffers support not available
-    except Exception:
-        pass  # Fall through to Protobuf parsing
+# Attempts, failed attempts and time spent (ns) per parse path, plus the
+# number of files that needed a second path, summed over worker processes
+parse_path_counts = SharedCounters(
+    [f"{path}{suffix}" for path in PARSE_PATHS for suffix in ("", "_failed", "_ns")]
+    + ["fallback"]
+)
 
-    # Try Protobuf format
-    try:
-        # Use minimal fixture that only parses field 1 (metadata)
-        # Works for all fixture types since they all have metadata as field 1
-        fixture = _MetadataOnlyFixture()
+# Errors that mean "these bytes are not this kind of message"
+_PARSE_ERRORS = (message.DecodeError, text_format.ParseError, ValueError, KeyError)
 
-        if fixture_file.suffix == ".txt":
-            with open(fixture_file, "r") as f:
-                text_format.Parse(f.read(), fixture)
-        else:
-            with open(fixture_file, "rb") as f:
-                fixture.ParseFromString(f.read())
 
+class FixtureParseError(ValueError):
+    """Raised in strict parsing mode when a test file cannot be decoded."""
+
+
+@dataclass
+class ParseResult:
+    """
+    Outcome of decoding a test file.
+
+    Attributes:
+        - parsed: Decoded message, or None if every parse path failed.
+        - path: Parse path that produced it (the last one tried on failure).
+        - errors: One error per failed parse path, in the order they were tried.
+    """
+
+    parsed: message.Message | None = None
+    path: str | None = None
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.parsed is not None
+
+    @property
+    def error(self) -> str | None:
+        return "; ".join(self.errors) if self.errors else None
+
+
+def _looks_like_text_format(test_file: Path, raw_data) -> bool:
+    """
+    Whether a test file holds a text-format message.
+
+    .txt files always do. Otherwise binary messages start with a field tag,
+    while text-format ones start with a field name or comment and stay
+    printable throughout their first bytes.
+    """
+    if test_file.suffix == ".txt":
+        return True
+    head = bytes(raw_data[:256])
+    stripped = head.lstrip()
+    if not stripped or not (stripped[:1].isalpha() or stripped[:1] == b"#"):
+        return False
+    return all(32 <= byte < 127 or byte in b"\t\n\r" for byte in head)
+
+
+def _parse_paths(test_file: Path, raw_data) -> list[str]:
+    """Protobuf parse paths for a file, most likely first."""
+    paths = ["binary", "text"]
+    if _looks_like_text_format(test_file, raw_data):
+        paths.reverse()
+    # Strict mode: no guessing, only the path the file selects
+    return paths[:1] if globals.strict_parsing else paths
+
+
+def _try_parse_paths(paths: list[str], parse_fn) -> ParseResult:
+    """
+    Run parse_fn(path) for each path until one succeeds, counting attempts,
+    failures and time per path in parse_path_counts.
+    """
+    result = ParseResult()
+    for attempt, path in enumerate(paths):
+        if attempt == 1:
+            parse_path_counts.add("fallback")
+        start = time.perf_counter_ns()
+        try:
+            result.parsed = parse_fn(path)
+        except _PARSE_ERRORS as e:
+            result.errors.append(f"{path}: {e or type(e).__name__}")
+        parse_path_counts.add(path)
+        parse_path_counts.add(f"{path}_ns", time.perf_counter_ns() - start)
+        result.path = path
+        if result.parsed is not None:
+            return result
+        parse_path_counts.add(f"{path}_failed")
+    return result
+
+
+def _checked(test_file: Path, result: ParseResult) -> message.Message | None:
+    """Message of a parse result; raises FixtureParseError in strict mode."""
+    if not result.ok and globals.strict_parsing:
+        raise FixtureParseError(f"Failed to parse {test_file}: {result.error}")
+    return result.parsed
+
+
+def _parse_text(message_type, raw_data, allow_unknown_field: bool = False):
+    return text_format.Parse(
+        bytes(raw_data).decode(),
+        message_type(),
+        allow_unknown_field=allow_unknown_field,
+    )
+
+
+def _parse_binary(message_type, raw_data):
+    msg = message_type()
+    msg.ParseFromString(raw_data)
+    return msg
+
+
+def report_parse_stats(verbose: bool = False):
+    """
+    Print attempts, failures and time per parse path.
+
+    Only printed when some attempt failed, unless verbose is set.
+    """
+    counts = parse_path_counts.snapshot()
+    if not verbose and not any(counts[f"{path}_failed"] for path in PARSE_PATHS):
+        return
+    paths = [
+        f"{path} {counts[path]} ({counts[f'{path}_failed']} failed, "
+        f"{counts[f'{path}_ns'] / 1e9:.2f} s)"
+        for path in PARSE_PATHS
+        if counts[path]
+    ]
+    print(f"Parse paths: {', '.join(paths)}; fallbacks: {counts['fallback']}")
+
+
+def parse_metadata(fixture_file: Path, raw_data: bytes | None = None) -> ParseResult:
+    """
+    Decodes the metadata of a fixture file.
+
+    Args:
+        - fixture_file (Path): Path to the fixture message.
+        - raw_data (bytes | None): Contents of fixture_file, if already read.
+
+    Returns:
+        - ParseResult: Metadata message, or the errors of each parse path tried.
+    """
+    if raw_data is None:
+        raw_data = read_test_file(fixture_file)
+        if raw_data is None:
+            return ParseResult(errors=["Failed to read file"])
+
+    if detect_format(raw_data) == "flatbuffers" and FLATBUFFERS_AVAILABLE:
+
+        def parse_flatbuffers(_):
+            loader = FixtureLoader(fixture_file, raw_data=raw_data)
+            if not loader.is_valid or not loader.metadata:
+                raise ValueError(loader.error_message or "No metadata")
+            return loader.metadata
+
+        return _try_parse_paths(["flatbuffers"], parse_flatbuffers)
+
+    def parse(path):
+        # Minimal fixture that only parses field 1 (metadata), which every
+        # fixture type shares
+        if path == "text":
+            fixture = _parse_text(_MetadataOnlyFixture, raw_data, True)
+        else:
+            fixture = _parse_binary(_MetadataOnlyFixture, raw_data)
+        if not fixture.HasField("metadata"):
+            raise ValueError("No metadata")
         return fixture.metadata
-    except Exception as e:
-        print(f"Failed to parse fixture metadata: {e}")
-        return None
+
+    return _try_parse_paths(_parse_paths(fixture_file, raw_data), parse)
 
 
-def read_context(harness_ctx: HarnessCtx, test_file: Path) -> message.Message | None:
+def extract_metadata(fixture_file: Path, raw_data: bytes | None = None) -> str | None:
+    """
+    Extracts metadata from a fixture file.
+
+    Supports both Protobuf and FlatBuffers formats.
+
+    Args:
+        - fixture_file (Path): Path to the fixture message.
+        - raw_data (bytes | None): Contents of fixture_file, if already read.
+
+    Returns:
+        - str | None: Metadata from the fixture file.
+    """
+    result = parse_metadata(fixture_file, raw_data)
+    if not result.ok and not globals.strict_parsing:
+        print(f"Failed to parse fixture metadata: {result.error}")
+    return _checked(fixture_file, result)
+
+
+def parse_context(
+    harness_ctx: HarnessCtx, test_file: Path, raw_data: bytes | None = None
+) -> ParseResult:
+    """
+    Decodes the context message of a test file.
+
+    Binary and text-format messages are told apart up front (see
+    _looks_like_text_format); the other encoding is only tried as a fallback,
+    and never in strict parsing mode.
+
+    Args:
+        - harness_ctx (HarnessCtx): Harness whose context type to decode.
+        - test_file (Path): Path to the context message.
+        - raw_data (bytes | None): Contents of test_file, if already read.
+
+    Returns:
+        - ParseResult: Context message, or the errors of each parse path tried.
+    """
+    if harness_ctx.context_type is None:
+        return ParseResult(errors=[f"{harness_ctx.fuzz_fn_name} has no context"])
+
+    if raw_data is None:
+        raw_data = read_test_file(test_file)
+        if raw_data is None:
+            return ParseResult(errors=["Failed to read file"])
+
+    def parse(path):
+        if path == "binary":
+            return _parse_binary(harness_ctx.context_type, raw_data)
+        context = _parse_text(harness_ctx.context_type, raw_data)
+        # Decode into digestable fields
+        harness_ctx.context_human_decode_fn(context)
+        return context
+
+    result = _try_parse_paths(_parse_paths(test_file, raw_data), parse)
+    if result.ok:
+        # Discard unknown fields
+        result.parsed.DiscardUnknownFields()
+    return result
+
+
+def read_context(
+    harness_ctx: HarnessCtx, test_file: Path, raw_data: bytes | None = None
+) -> message.Message | None:
     """
     Reads in test files and generates an Context Protobuf object for a test case.
 
     Args:
         - test_file (Path): Path to the context message.
+        - raw_data (bytes | None): Contents of test_file, if already read.
 
     Returns:
         - message.Message | None: Instruction context, or None if reading failed.
     """
     if harness_ctx.context_type is None:
         return None
+    return _checked(test_file, parse_context(harness_ctx, test_file, raw_data))
 
-    # Try to read in first as binary-encoded Protobuf messages
-    try:
-        # Read in binary Protobuf messages
-        with open(test_file, "rb") as f:
-            context = harness_ctx.context_type()
-            context.ParseFromString(f.read())
-    except:
-        try:
-            # Maybe it's in human-readable Protobuf format?
-            with open(test_file) as f:
-                context = text_format.Parse(f.read(), harness_ctx.context_type())
 
-            # Decode into digestable fields
-            # decode_input(instruction_context)
-            harness_ctx.context_human_decode_fn(context)
-        except:
-            # Unable to read message, skip and continue
-            context = None
+def parse_fixture(fixture_file: Path, raw_data: bytes | None = None) -> ParseResult:
+    """
+    Decodes a fixture file.
 
-    if context is None:
-        # Unreadable file, skip it
-        return None
+    The parse path is picked from the format magic and the extension:
+    FlatBuffers fixtures are converted, Protobuf ones are decoded as binary or
+    text format (with the other encoding as a fallback outside strict mode).
 
-    # Discard unknown fields
-    context.DiscardUnknownFields()
-    return context
+    Args:
+        - fixture_file (Path): Path to the fixture message.
+        - raw_data (bytes | None): Contents of fixture_file, if already read.
 
+    Returns:
+        - ParseResult: Fixture message, or the errors of each parse path tried.
+    """
+    if raw_data is None:
+        raw_data = read_test_file(fixture_file)
+        if raw_data is None:
+            return ParseResult(errors=["Failed to read file"])
+
+    if detect_format(raw_data) == "flatbuffers" and FLATBUFFERS_AVAILABLE:
+
+        def parse_flatbuffers(_):
+            loader = FixtureLoader(fixture_file, raw_data=raw_data)
+            if not loader.is_valid:
+                raise ValueError(loader.error_message)
+            # The converted protobuf fixture
+            return loader.pb_fixture
+
+        result = _try_parse_paths(["flatbuffers"], parse_flatbuffers)
+        if result.ok or globals.strict_parsing:
+            return result
+        # Misdetected legacy file: fall through to Protobuf parsing
+        parse_path_counts.add("fallback")
+        errors = result.errors
+    else:
+        errors = []
 
-def read_fixture(fixture_file: Path) -> message.Message | None:
+    def parse(path):
+        if path == "text":
+            metadata = _parse_text(_MetadataOnlyFixture, raw_data, True).metadata
+            harness_ctx = get_harness_for_entrypoint(metadata.fn_entrypoint)
+            fixture = _parse_text(harness_ctx.fixture_type, raw_data)
+            harness_ctx.context_human_decode_fn(fixture.input)
+        else:
+            metadata = _parse_binary(_MetadataOnlyFixture, raw_data).metadata
+            harness_ctx = get_harness_for_entrypoint(metadata.fn_entrypoint)
+            fixture = _parse_binary(harness_ctx.fixture_type, raw_data)
+        return fixture
+
+    result = _try_parse_paths(_parse_paths(fixture_file, raw_data), parse)
+    result.errors[:0] = errors
+    if result.ok:
+        # Discard unknown fields
+        result.parsed.DiscardUnknownFields()
+    return result
+
+
+def read_fixture(
+    fixture_file: Path, raw_data: bytes | None = None
+) -> message.Message | None:
     """
     Reads in test files and generates an Fixture Protobuf object for a test case.
 
-    Supports both Protobuf and FlatBuffers formats.
+    Supports both Protobuf and FlatBuffers formats. The file is read once;
+    format detection, metadata and the full message are all decoded from
+    the same bytes.
 
     Args:
         - fixture_file (Path): Path to the fixture message.
+        - raw_data (bytes | None): Contents of fixture_file, if already read.
 
     Returns:
-        - message.Message | None: Fixture, or None if reading failed.
+        - message.Message | None: Fixture, or None if reading failed (raises
+          FixtureParseError instead with --strict-parsing).
 
     """
-    fixture = None
-
-    # First, try FlatBuffers format
-    try:
-        from test_suite.flatbuffers_utils import (
-            detect_format,
-            FixtureLoader,
-            FLATBUFFERS_AVAILABLE,
-        )
+    return _checked(fixture_file, parse_fixture(fixture_file, raw_data))
 
-        with open(fixture_file, "rb") as f:
-            data = f.read()
 
-        fmt = detect_format(data)
+def load_test_case(
+    test_file: Path, raw_data: bytes | None = None
+) -> tuple[HarnessCtx | None, message.Message | None]:
+    """
+    Decodes the harness and input context of a test file: a fixture, or a
+    context for the default harness (falling back to a fixture).
 
-        if fmt == "flatbuffers" and FLATBUFFERS_AVAILABLE:
-            loader = FixtureLoader(fixture_file)
-            if loader.is_valid:
-                # Return the converted protobuf fixture
-                return loader.pb_fixture
-    except ImportError:
-        pass  # FlatBuffers support not available
-    except Exception:
-        pass  # Fall through to Protobuf parsing
+    Args:
+        - test_file (Path): Path to the test file.
+        - raw_data (bytes | None): Contents of test_file, if already read.
 
-    # Try to read in first as binary-encoded Protobuf messages
-    try:
-        # Read in binary Protobuf messages
-        fn_entrypoint = extract_metadata(fixture_file).fn_entrypoint
-        harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
-        with open(fixture_file, "rb") as f:
-            fixture = harness_ctx.fixture_type()
-            fixture.ParseFromString(f.read())
-    except:
-        try:
-            # Maybe it's in human-readable Protobuf format?
-            fn_entrypoint = extract_metadata(fixture_file).fn_entrypoint
-            harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
-            with open(fixture_file) as f:
-                fixture = text_format.Parse(f.read(), harness_ctx.fixture_type())
-            harness_ctx.context_human_decode_fn(fixture.input)
-        except:
-            # Unable to read message, skip and continue
-            fixture = None
+    Returns:
+        - tuple[HarnessCtx | None, message.Message | None]: Harness and
+          context, or (None, None) if the file could not be decoded (raises
+          FixtureParseError instead with --strict-parsing).
+    """
+    if test_file.suffix != FIXTURE_EXTENSION:
+        harness_ctx = globals.default_harness_ctx
+        context = read_context(harness_ctx, test_file, raw_data)
+        if context is not None:
+            return harness_ctx, context
 
+    result = parse_fixture(test_file, raw_data)
+    fixture = _checked(test_file, result)
     if fixture is None:
-        # Unreadable file, skip it
-        return None
-
-    # Discard unknown fields
-    fixture.DiscardUnknownFields()
-    return fixture
+        print(f"Skipping {test_file}: {result.error}")
+        return None, None
+    return get_harness_for_entrypoint(fixture.metadata.fn_entrypoint), fixture.input
 
 
 def decode_single_test_case(test_file: Path) -> int:
@@ -427,9 +982,8 @@ def decode_single_test_case(test_file: Path) -> int:
         - int: 1 if successfully decoded and written, 0 if skipped.
     """
     if test_file.suffix == FIXTURE_EXTENSION:
-        fn_entrypoint = extract_metadata(test_file).fn_entrypoint
-        harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
         fixture = read_fixture(test_file)
+        harness_ctx = get_harness_for_entrypoint(fixture.metadata.fn_entrypoint)
         serialized_protobuf = fixture.SerializeToString(deterministic=True)
     else:
         harness_ctx = globals.default_harness_ctx
@@ -464,34 +1018,96 @@ def decode_single_test_case(test_file: Path) -> int:
 def process_single_test_case(
     harness_ctx: HarnessCtx,
     context: ContextType | None,
-) -> dict[str, str | None] | None:
+) -> dict[str, TargetEffects | None] | None:
     """
     Process a single execution context (file, serialized instruction context) through
-    all target libraries and returns serialized instruction effects.
+    all target libraries and returns instruction effects.
 
     Args:
         - serialized_instruction_context (str | None): Serialized instruction context.
 
     Returns:
-        - dict[str, str | None] | None: Dictionary of target library names and instruction effects.
+        - dict[str, TargetEffects | None] | None: Dictionary of target library names and instruction effects.
     """
     # Mark as skipped if instruction context doesn't exist
 
+    # Serialize the context once and pass the same bytes to every target
+    serialized_context = context.SerializeToString(deterministic=True)
+
+    def call_target(target: Path) -> TargetEffects | None:
+        with timed_harness_call(target):
+            instruction_effects = process_target(
+                harness_ctx,
+                globals.target_libraries[target],
+                context,
+                serialized_context,
+            )
+        return TargetEffects.of(instruction_effects) if instruction_effects else None
+
     # Execute test case on each target library
-    results = {}
-    for target in globals.target_libraries:
-        instruction_effects = process_target(
-            harness_ctx,
-            globals.target_libraries[target],
-            context,
+    return call_targets(call_target)
+
+
+def _init_target_thread():
+    _target_thread.own_buffer = True
+
+
+def _get_target_executor() -> ThreadPoolExecutor:
+    global _target_executor, _target_executor_pid
+    num_targets = len(globals.target_libraries)
+    # A pool inherited through fork has no threads in this process
+    if (
+        _target_executor is None
+        or _target_executor_pid != os.getpid()
+        or _target_executor._max_workers < num_targets
+    ):
+        if _target_executor is not None and _target_executor_pid == os.getpid():
+            _target_executor.shutdown(wait=False)
+        _target_executor = ThreadPoolExecutor(
+            max_workers=num_targets,
+            thread_name_prefix="target",
+            initializer=_init_target_thread,
         )
-        result = (
-            instruction_effects.SerializeToString(deterministic=True)
-            if instruction_effects
-            else None
-        )
-        results[target] = result
-    return results
+        _target_executor_pid = os.getpid()
+    return _target_executor
+
+
+def shutdown_target_executor():
+    """
+    Stop the threads that call targets in parallel (see call_targets()), if
+    this process started any. Must run before the target libraries are
+    finalized; the next parallel call starts new threads.
+    """
+    global _target_executor, _target_executor_pid
+    if _target_executor is not None and _target_executor_pid == os.getpid():
+        _target_executor.shutdown(wait=True)
+    _target_executor = None
+    _target_executor_pid = None
+
+
+def call_targets(call_target) -> dict:
+    """
+    Call every target library for the current test, in target order.
+
+    With globals.parallel_targets, targets are called from a thread pool
+    (ctypes releases the GIL during the call, so targets run concurrently)
+    and each thread uses its own output buffer. Targets are called serially
+    if any two of them share a library handle, since a library is not
+    assumed to be reentrant.
+
+    Args:
+        - call_target (Callable[[Path], Any]): Calls one target library.
+
+    Returns:
+        - dict: Result of call_target for each target library.
+    """
+    targets = list(globals.target_libraries)
+    if not globals.parallel_targets or len(targets) < 2:
+        return {target: call_target(target) for target in targets}
+    handles = {globals.target_libraries[target]._handle for target in targets}
+    if len(handles) < len(targets):
+        return {target: call_target(target) for target in targets}
+    return dict(zip(targets, _get_target_executor().map(call_target, targets)))
 
 
 def merge_results_over_iterations(results: tuple) -> tuple[str, dict]:
@@ -522,15 +1138,45 @@ def merge_results_over_iterations(results: tuple) -> tuple[str, dict]:
     return file, merged_results
 
 
+def effects_digest(serialized_effects: bytes) -> str:
+    """
+    Short, stable digest of serialized effects, logged in place of the
+    human-readable rendering for passing tests.
+
+    Args:
+        - serialized_effects (bytes): Serialized effects.
+
+    Returns:
+        - str: Hex digest line.
+    """
+    return (
+        f"digest: {hashlib.blake2b(serialized_effects, digest_size=16).hexdigest()}\n"
+    )
+
+
 def build_test_results(
-    harness_ctx: HarnessCtx, results: dict[str, str | None], reference_target: Path
+    harness_ctx: HarnessCtx,
+    results: dict[str, TargetEffects | bytes | None],
+    reference_target: Path,
 ) -> tuple[int, dict | None]:
     """
     Build a single result of single test execution and returns whether the test passed or failed.
 
+    Byte-identical results pass without being parsed or diffed; the
+    structured diff only runs on a byte mismatch. Effects are only rendered
+    with text_format for failing tests, or for all tests if
+    globals.render_passing_effects is set. Otherwise, passing tests get a
+    digest of each target's effects instead.
+
+    Effects given as TargetEffects are diffed and rendered from the messages
+    they already hold (rendering human-encodes them in place). The time spent
+    diffing and rendering is added to the "diff" and "render" stages. With an
+    EffectsDiff as diff function, the rendering of each mismatching target
+    starts with a comment listing the first mismatching fields.
+
     Args:
         - harness_ctx (HarnessCtx): Harness context.
-        - results (dict[str, str | None]): Dictionary of target library names and serialized instruction effects.
+        - results (dict[str, TargetEffects | bytes | None]): Dictionary of target library names and instruction effects, or their serializations.
         - reference_target (Path): Path to the reference target.
 
     Returns:
@@ -543,6 +1189,14 @@ def build_test_results(
         # Mark as skipped (0)
         return 0, None
 
+    results = {
+        target: (
+            TargetEffects(harness_ctx.effects_type, serialized=result)
+            if isinstance(result, bytes)
+            else result
+        )
+        for target, result in results.items()
+    }
     outputs = {target: "None\n" for target in results}
 
     ref_result = results[reference_target]
@@ -551,40 +1205,71 @@ def build_test_results(
         print("Skipping test case due to Agave rejection")
         return 0, None
 
-    ref_effects = harness_ctx.effects_type()
-    ref_effects.ParseFromString(ref_result)
+    # Fast path: results are deterministic serializations, and identical
+    # effects compare equal under every diff mode, so byte-identical results
+    # pass without parsing or diffing
+    with timed_stage("diff"):
+        ref_serialized = ref_result.serialized
+        identical = all(
+            result is not None and result.serialized == ref_serialized
+            for result in results.values()
+        )
+    if identical:
+        with timed_stage("render"):
+            if not globals.render_passing_effects:
+                digest = effects_digest(ref_serialized)
+                return 1, {target: digest for target in results}
+            rendered = ref_result.render(harness_ctx.effects_human_encode_fn)
+            return 1, {target: rendered for target in results}
+
+    diff_effect_fn = harness_ctx.diff_effect_fn
+    if globals.consensus_mode:
+        diff_effect_fn = harness_ctx.consensus_diff_effect_fn
+    if globals.core_bpf_mode:
+        diff_effect_fn = harness_ctx.core_bpf_diff_effect_fn
+    if globals.ignore_compute_units_mode:
+        diff_effect_fn = harness_ctx.ignore_compute_units_diff_effect_fn
 
     # Log execution results
     all_passed = True
-    for target, result in results.items():
-        if target == reference_target:
-            continue
-        # Create a Protobuf struct to compare and output, if applicable
-        effects = None
-        if result is not None:
-            # Turn bytes into human readable fields
-            effects = harness_ctx.effects_type()
-            effects.ParseFromString(result)
-
-            if globals.consensus_mode:
-                harness_ctx.diff_effect_fn = harness_ctx.consensus_diff_effect_fn
-            if globals.core_bpf_mode:
-                harness_ctx.diff_effect_fn = harness_ctx.core_bpf_diff_effect_fn
-            if globals.ignore_compute_units_mode:
-                harness_ctx.diff_effect_fn = (
-                    harness_ctx.ignore_compute_units_diff_effect_fn
+    target_effects = {}
+    mismatches = {}
+    with timed_stage("diff"):
+        ref_effects = ref_result.message
+        for target, result in results.items():
+            if target == reference_target:
+                continue
+            # Compare the Protobuf structs, if applicable
+            if result is not None:
+                if isinstance(diff_effect_fn, EffectsDiff):
+                    mismatches[target] = diff_effect_fn.mismatches(
+                        ref_effects, result.message
+                    )
+                    all_passed &= not mismatches[target]
+                else:
+                    all_passed &= diff_effect_fn(ref_effects, result.message)
+                target_effects[target] = result
+            else:
+                all_passed = False
+
+    with timed_stage("render"):
+        if all_passed and not globals.render_passing_effects:
+            # Nobody reads the rendered effects of a passing test
+            for target, result in results.items():
+                outputs[target] = effects_digest(result.serialized)
+            return 1, outputs
+
+        for target, effects in target_effects.items():
+            outputs[target] = effects.render(harness_ctx.effects_human_encode_fn)
+            if mismatches.get(target):
+                outputs[target] = (
+                    f"# Mismatched fields: {', '.join(mismatches[target])}\n"
+                    + outputs[target]
                 )
 
-            # Note: diff_effect_fn may modify effects in-place
-            all_passed &= harness_ctx.diff_effect_fn(ref_effects, effects)
-
-            harness_ctx.effects_human_encode_fn(effects)
-            outputs[target] = text_format.MessageToString(effects)
-        else:
-            all_passed = False
-
-    harness_ctx.effects_human_encode_fn(ref_effects)
-    outputs[reference_target] = text_format.MessageToString(ref_effects)
+        outputs[reference_target] = ref_result.render(
+            harness_ctx.effects_human_encode_fn
+        )
 
     # 1 = passed, -1 = failed
     return 1 if all_passed else -1, outputs
@@ -662,12 +1347,37 @@ def build_test_results_fb(
     return 1 if all_passed else -1, outputs
 
 
+def fb_elf_ctx_bytes(raw_data, fb_fixture):
+    """
+    Input context of a FlatBuffers ELF fixture, ready for the v2 entrypoint.
+
+    The context table embedded in the fixture is passed on as is (see
+    embedded_fb_elf_ctx()); it is only re-encoded if the fixture has no input.
+    Everything else needed from fb_fixture must be read before calling this,
+    since the bytes in front of the context may be overwritten.
+
+    Args:
+        - raw_data: Buffer the fixture was parsed from.
+        - fb_fixture: Parsed FlatBuffers ELFLoaderFixture object.
+
+    Returns:
+        - bytes | bytearray | memoryview: Serialized ELFLoaderCtx.
+    """
+    ctx_bytes = embedded_fb_elf_ctx(raw_data, fb_fixture, in_place=True)
+    if ctx_bytes is not None:
+        return ctx_bytes
+    ctx_fields = extract_fb_elf_ctx_fields(fb_fixture)
+    return build_fb_elf_ctx(
+        ctx_fields["elf_data"], ctx_fields["features"], ctx_fields["deploy_checks"]
+    )
+
+
 def run_test_fb(test_file: Path, raw_data: bytes) -> tuple[str, int, dict | None]:
     """
     Run a single FlatBuffers ELF fixture natively (no Protobuf conversion).
 
-    Extracts the FB context, calls the v2 entrypoint on each target library
-    via process_target_raw(), parses FB effects, and compares them.
+    Passes the embedded FB context to the v2 entrypoint of each target
+    library via process_target_raw(), parses FB effects, and compares them.
 
     Args:
         - test_file: Path to the .fix fixture file.
@@ -683,15 +1393,15 @@ def run_test_fb(test_file: Path, raw_data: bytes) -> tuple[str, int, dict | None
     entrypoint = extract_fb_elf_entrypoint(fb_fixture)
     v2_entrypoint = entrypoint_to_v2(entrypoint)
 
-    ctx_fields = extract_fb_elf_ctx_fields(fb_fixture)
-    ctx_bytes = build_fb_elf_ctx(
-        ctx_fields["elf_data"], ctx_fields["features"], ctx_fields["deploy_checks"]
-    )
+    ctx_bytes = fb_elf_ctx_bytes(raw_data, fb_fixture)
 
     results = {}
     for target_name, target_lib in globals.target_libraries.items():
         try:
-            effects_bytes = process_target_raw(v2_entrypoint, target_lib, ctx_bytes)
+            with timed_harness_call(target_name):
+                effects_bytes = process_target_raw(
+                    v2_entrypoint, target_lib, ctx_bytes, copy=False
+                )
         except Exception as e:
             print(f"Error calling {v2_entrypoint} on {target_name}: {e}")
             effects_bytes = None
@@ -732,14 +1442,14 @@ def execute_fixture_fb(
 
     expected_effects = extract_fb_elf_effects_fields(fb_fixture)
 
-    ctx_fields = extract_fb_elf_ctx_fields(fb_fixture)
-    ctx_bytes = build_fb_elf_ctx(
-        ctx_fields["elf_data"], ctx_fields["features"], ctx_fields["deploy_checks"]
-    )
+    ctx_bytes = fb_elf_ctx_bytes(raw_data, fb_fixture)
 
     ref_lib = globals.target_libraries[globals.reference_shared_library]
     try:
-        effects_bytes = process_target_raw(v2_entrypoint, ref_lib, ctx_bytes)
+        with timed_harness_call(globals.reference_shared_library):
+            effects_bytes = process_target_raw(
+                v2_entrypoint, ref_lib, ctx_bytes, copy=False
+            )
     except Exception as e:
         print(f"Error calling {v2_entrypoint}: {e}")
         effects_bytes = None
@@ -754,20 +1464,127 @@ def execute_fixture_fb(
     return test_file.stem, *build_test_results_fb(results, Path("expected"))
 
 
-def initialize_process_output_buffers(randomize_output_buffer=False):
+def initialize_process_output_buffers(
+    randomize_output_buffer=False, output_buffer_seed=None
+):
     """
-    Initialize shared memory and pointers for output buffers for each process.
+    Configure the output buffer for each process.
+
+    The buffer itself is allocated lazily on the first harness call, sized
+    for that harness (see HarnessCtx.output_buffer_size), and grows on demand.
+    A buffer that is already allocated (e.g. in a long-lived WorkerPool
+    worker) is kept if it was filled with the same settings.
 
     Args:
         - randomize_output_buffer (bool): Whether to randomize output buffer.
+        - output_buffer_seed (int | None): Seed for the random contents.
+          Defaults to globals.output_buffer_seed, or a random seed if unset.
+    """
+    globals.randomize_output_buffer = randomize_output_buffer
+    if output_buffer_seed is not None:
+        globals.output_buffer_seed = output_buffer_seed
+    if randomize_output_buffer and globals.output_buffer_seed is None:
+        globals.output_buffer_seed = int.from_bytes(os.urandom(8), "little")
+
+    if _allocated_fill_settings != _output_buffer_fill_settings():
+        globals.output_buffer_pointer = None
+
+    # Bind entrypoints of any libraries already loaded in this process
+    bind_sol_compat_fns()
+
+
+# Globals that hold per-process state and are never shipped to pool workers
+_PROCESS_LOCAL_GLOBALS = {
+    "target_libraries",
+    "sol_compat_fns",
+    "output_buffer_pointer",
+    "worker_pool",
+    "session_libraries",
+    "feature_pool",
+    "target_features",
+    "download_progress_bar",
+    "repro_metadata_cache",
+}
+
+
+def snapshot_process_globals() -> dict:
     """
-    globals.output_buffer_pointer = (ctypes.c_uint8 * OUTPUT_BUFFER_SIZE)()
+    Capture the parent's test_suite.globals settings so a phase running on a
+    long-lived WorkerPool sees the same configuration a freshly forked worker
+    would. Harness contexts are sent by entrypoint name since they cannot be
+    pickled.
 
-    if randomize_output_buffer:
-        output_buffer_random_bytes = os.urandom(OUTPUT_BUFFER_SIZE)
-        globals.output_buffer_pointer = (ctypes.c_uint8 * OUTPUT_BUFFER_SIZE)(
-            *output_buffer_random_bytes
-        )
+    Returns:
+        - dict: Mapping of global name to picklable value.
+    """
+    snapshot = {}
+    for name, value in vars(globals).items():
+        if name.startswith("_") or name in _PROCESS_LOCAL_GLOBALS:
+            continue
+        if isinstance(value, (type, type(os))) or callable(value):
+            continue
+        if isinstance(value, HarnessCtx):
+            value = ("harness", value.fuzz_fn_name)
+        snapshot[name] = value
+    return snapshot
+
+
+def restore_process_globals(snapshot: dict):
+    """
+    Apply a snapshot taken by snapshot_process_globals() in a worker.
+
+    Target call threads of the worker's previous phase are stopped first.
+
+    Args:
+        - snapshot (dict): Mapping of global name to value.
+    """
+    shutdown_target_executor()
+    for name, value in snapshot.items():
+        if isinstance(value, tuple) and value[:1] == ("harness",):
+            value = ENTRYPOINT_HARNESS_MAP[value[1]]
+        setattr(globals, name, value)
+
+
+@contextmanager
+def worker_session(shared_libraries, log_level: int, num_processes: int):
+    """
+    Load target libraries once and share a long-lived WorkerPool across the
+    phases of a composite command (e.g. create-fixtures then run-tests).
+
+    While the session is active, commands skip loading, initializing and
+    finalizing the session's libraries and submit their work to
+    globals.worker_pool. Libraries are finalized when the session ends.
+
+    Args:
+        - shared_libraries (list[Path]): Target libraries to load.
+        - log_level (int): FD logging level passed to sol_compat_init.
+        - num_processes (int): Number of pool workers.
+    """
+    library_paths = [str(t) for t in shared_libraries]
+    setup_sanitizer_environment(target_libraries=library_paths)
+    for target in shared_libraries:
+        if target in globals.target_libraries:
+            continue
+        lib = load_shared_library_safe(str(target), target_libraries=library_paths)
+        lib.sol_compat_init(log_level)
+        globals.target_libraries[target] = lib
+        globals.session_libraries.add(target)
+    bind_sol_compat_fns()
+
+    globals.worker_pool = WorkerPool(
+        num_processes,
+        snapshot_fn=snapshot_process_globals,
+        restore_fn=restore_process_globals,
+    )
+    try:
+        yield globals.worker_pool
+    finally:
+        globals.worker_pool.shutdown()
+        globals.worker_pool = None
+        shutdown_target_executor()
+        for target in globals.session_libraries:
+            globals.target_libraries[target].sol_compat_fini()
+        globals.session_libraries.clear()
 
 
 def initialize_process_globals_for_extraction(output_dir):
@@ -857,6 +1674,48 @@ def initialize_process_globals_for_regeneration(
     initialize_process_output_buffers()
 
 
+def crashed_test_result(test_file: Path) -> tuple[str, int, None]:
+    """
+    Result recorded for a test case whose worker process died while running it.
+
+    Args:
+        - test_file (Path): Path to the file containing the test case.
+
+    Returns:
+        - tuple[str, int, None]: Tuple of file stem, TEST_CASE_CRASHED and no outputs.
+    """
+    return test_file.stem, TEST_CASE_CRASHED, None
+
+
+def run_timed(
+    test_fn, test_file: Path
+) -> tuple[Path, tuple, dict[Path, float], dict[str, float]]:
+    """
+    Run test_fn (e.g. run_test or execute_fixture) on a test file and collect
+    the wall time of its harness calls and pipeline stages.
+
+    Args:
+        - test_fn (Callable): Test function returning a result tuple.
+        - test_file (Path): Test file to run.
+
+    Returns:
+        - tuple[Path, tuple, dict[Path, float], dict[str, float]]: Tuple of:
+            - The test file
+            - The result of test_fn
+            - Seconds spent in harness calls, by target library
+            - Seconds spent in each pipeline stage (see timed_stage())
+    """
+    _harness_call_seconds.clear()
+    _stage_seconds.clear()
+    result = test_fn(test_file)
+    return test_file, result, dict(_harness_call_seconds), dict(_stage_seconds)
+
+
+def crashed_timed_result(test_file: Path) -> tuple[Path, tuple, dict, dict]:
+    """crashed_test_result() in the shape returned by run_timed()."""
+    return test_file, crashed_test_result(test_file), {}, {}
+
+
 def run_test(test_file: Path) -> tuple[str, int, dict | None]:
     """
     Runs a single test from start to finish.
@@ -870,27 +1729,24 @@ def run_test(test_file: Path) -> tuple[str, int, dict | None]:
             - 1 if passed, -1 if failed, 0 if skipped
             - Dictionary of target library names and file-dumpable serialized instruction effects
     """
+    # Read the file once; everything below decodes from these bytes
+    raw_data = read_test_file(test_file, use_mmap=True)
+    if raw_data is None:
+        return test_file.stem, 0, None
+
     # FlatBuffers-native path: skip Protobuf conversion entirely
     if test_file.suffix == FIXTURE_EXTENSION and FLATBUFFERS_AVAILABLE:
-        with open(test_file, "rb") as f:
-            raw_data = f.read()
         if detect_format(raw_data) == "flatbuffers":
             return run_test_fb(test_file, raw_data)
 
-    if test_file.suffix == FIXTURE_EXTENSION:
-        fn_entrypoint = extract_metadata(test_file).fn_entrypoint
-        harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
-        context = read_fixture(test_file).input
-    else:
-        harness_ctx = globals.default_harness_ctx
-        context = read_context(harness_ctx, test_file)
-        if context is None:
-            fn_entrypoint = extract_metadata(test_file).fn_entrypoint
-            harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
-            context = read_fixture(test_file).input
+    harness_ctx, context = load_test_case(test_file, raw_data)
+    if context is None:
+        return test_file.stem, 0, None
 
-    results = process_single_test_case(harness_ctx, context)
-    pruned_results = harness_ctx.prune_effects_fn(context, results)
+    with timed_stage("execute"):
+        results = process_single_test_case(harness_ctx, context)
+    with timed_stage("prune"):
+        pruned_results = harness_ctx.prune_effects_fn(context, results)
     return test_file.stem, *build_test_results(
         harness_ctx, pruned_results, globals.reference_shared_library
     )
@@ -901,30 +1757,37 @@ def execute_fixture(test_file: Path) -> tuple[str, int, dict | None]:
         print(f"File {test_file} is not a fixture")
         return test_file.stem, None
 
+    # Read the file once; everything below decodes from these bytes
+    raw_data = read_test_file(test_file, use_mmap=True)
+    if raw_data is None:
+        return test_file.stem, 0, None
+
     # FlatBuffers-native path
     if FLATBUFFERS_AVAILABLE:
-        with open(test_file, "rb") as f:
-            raw_data = f.read()
         if detect_format(raw_data) == "flatbuffers":
             return execute_fixture_fb(test_file, raw_data)
 
-    fn_entrypoint = extract_metadata(test_file).fn_entrypoint
-    harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
-    fixture = read_fixture(test_file)
+    fixture = read_fixture(test_file, raw_data)
+    if fixture is None:
+        print(f"Skipping {test_file}: unable to parse fixture")
+        return test_file.stem, 0, None
+    harness_ctx = get_harness_for_entrypoint(fixture.metadata.fn_entrypoint)
     context = fixture.input
     output = fixture.output
 
-    effects = process_target(
-        harness_ctx, globals.target_libraries[globals.reference_shared_library], context
-    )
+    with timed_stage("execute"), timed_harness_call(globals.reference_shared_library):
+        effects = process_target(
+            harness_ctx,
+            globals.target_libraries[globals.reference_shared_library],
+            context,
+        )
 
     results = {
-        Path("expected"): output.SerializeToString(deterministic=True),
-        Path("actual"): (
-            effects.SerializeToString(deterministic=True) if effects else None
-        ),
+        Path("expected"): TargetEffects.of(output),
+        Path("actual"): TargetEffects.of(effects) if effects else None,
     }
-    prune_results = harness_ctx.prune_effects_fn(context, results)
+    with timed_stage("prune"):
+        prune_results = harness_ctx.prune_effects_fn(context, results)
 
     return test_file.stem, *build_test_results(
         harness_ctx, prune_results, Path("expected")
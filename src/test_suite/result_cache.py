@@ -0,0 +1,350 @@
+"""
+Result cache for incremental run-tests.
+
+Re-running a whole corpus against every target build wastes hours when only
+a few fixtures or one target changed. With --incremental, run-tests looks up
+each test file in a SQLite cache keyed by:
+- the SHA-256 of the file contents,
+- the harness of the file,
+- the run configuration: the build of every target (see util.target_build_id)
+  in order, the diff mode, whether passing effects are rendered, and the
+  version of this package.
+
+Only cache misses are executed; their results are added to the cache.
+Crashes are never cached, so they are retried on the next run. The cache is
+capped in size and evicts the least recently used results first.
+
+Example:
+    >>> with ResultCache(default_result_cache_path()) as cache:
+    ...     run = IncrementalRun(cache, config, schedule, targets, callback)
+    ...     to_run = run.partition(test_cases, result_logger.add)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Iterable
+
+from test_suite.constants import TEST_CASE_CRASHED
+from test_suite.multiprocessing_utils import read_test_file
+from test_suite.scheduling import HarnessSchedule
+from test_suite.timing_db import TargetBuild
+from test_suite.util import process_items
+import test_suite.globals as globals
+
+# Bump when the schema or the meaning of a column changes
+RESULT_CACHE_VERSION = 2
+
+DEFAULT_RESULT_CACHE_MAX_MB = 1024
+
+# Approximate size of a result row besides its outputs (keys and columns),
+# counted against the size cap
+_ROW_OVERHEAD = 192
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    content_hash TEXT NOT NULL,
+    harness TEXT NOT NULL,
+    config TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    outputs BLOB,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (content_hash, harness, config)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def default_result_cache_path() -> Path:
+    """Location of the result cache, in the user cache directory."""
+    cache_dir = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_dir / "solana-conformance" / "results.sqlite"
+
+
+def _package_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("solana-conformance")
+    except Exception:
+        return "0.0.0-dev"
+
+
+def diff_mode() -> str:
+    """Name of the diff mode set in test_suite.globals."""
+    if globals.consensus_mode:
+        return "consensus"
+    if globals.core_bpf_mode:
+        return "core_bpf"
+    if globals.ignore_compute_units_mode:
+        return "ignore_compute_units"
+    return "default"
+
+
+def run_config_key(builds: Iterable[TargetBuild]) -> str:
+    """
+    Cache key of everything besides the test file that decides its result.
+
+    Args:
+        builds: Target builds, reference target first
+
+    Returns:
+        Hex digest identifying the configuration
+    """
+    config = {
+        "version": _package_version(),
+        "targets": [[build.target, build.build] for build in builds],
+        "diff_mode": diff_mode(),
+        "render_passing_effects": globals.render_passing_effects,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of test results, with LRU eviction.
+
+    Stores and hits are buffered and written by flush(), which also evicts
+    the least recently used results until the cache fits in max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path,
+        max_bytes: int = DEFAULT_RESULT_CACHE_MAX_MB * 1024 * 1024,
+    ):
+        self.cache_path = cache_path
+        self.max_bytes = max_bytes
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(cache_path)
+        self.conn.executescript(_SCHEMA)
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or int(row[0]) != RESULT_CACHE_VERSION:
+            # Stale layout: start over
+            with self.conn:
+                self.conn.execute("DELETE FROM results")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (str(RESULT_CACHE_VERSION),),
+                )
+        self._stores = []
+        self._hits = []
+
+    def clear(self):
+        """Drop all cached results."""
+        with self.conn:
+            self.conn.execute("DELETE FROM results")
+        self.conn.execute("VACUUM")
+
+    def get(
+        self, content_hash: str, harness: str, config: str
+    ) -> tuple[int, dict[str, str] | None] | None:
+        """
+        Cached result of a test file.
+
+        Returns:
+            (status, outputs by target name), or None on a cache miss
+        """
+        row = self.conn.execute(
+            "SELECT status, outputs FROM results "
+            "WHERE content_hash = ? AND harness = ? AND config = ?",
+            (content_hash, harness, config),
+        ).fetchone()
+        if row is None:
+            return None
+        self._hits.append((content_hash, harness, config))
+        status, outputs = row
+        return status, json.loads(zlib.decompress(outputs)) if outputs else None
+
+    def put(
+        self,
+        content_hash: str,
+        harness: str,
+        config: str,
+        status: int,
+        outputs: dict[str, str] | None,
+    ):
+        """Add the result of a test file."""
+        blob = zlib.compress(json.dumps(outputs).encode()) if outputs else None
+        self._stores.append((content_hash, harness, config, status, blob))
+
+    def flush(self):
+        """Write buffered results and hits, then evict down to max_bytes."""
+        now = time.time_ns()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (*key, status, blob, _ROW_OVERHEAD + len(blob or b""), now)
+                    for *key, status, blob in self._stores
+                ),
+            )
+            self.conn.executemany(
+                "UPDATE results SET last_used = ? "
+                "WHERE content_hash = ? AND harness = ? AND config = ?",
+                ((now, *key) for key in self._hits),
+            )
+            self._evict()
+        self._stores.clear()
+        self._hits.clear()
+
+    def _evict(self):
+        (total,) = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        rows = self.conn.execute(
+            "SELECT content_hash, harness, config, size FROM results "
+            "ORDER BY last_used"
+        )
+        for content_hash, harness, config, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((content_hash, harness, config))
+            total -= size
+        self.conn.executemany(
+            "DELETE FROM results "
+            "WHERE content_hash = ? AND harness = ? AND config = ?",
+            evicted,
+        )
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _hash_test_file(test_file: Path) -> tuple[Path, str | None]:
+    raw_data = read_test_file(test_file)
+    if raw_data is None:
+        return test_file, None
+    return test_file, hashlib.sha256(raw_data).hexdigest()
+
+
+class IncrementalRun:
+    """
+    Answers test files from a ResultCache and caches the results of the
+    files that had to run.
+
+    Args:
+        cache: Result cache
+        config: Run configuration key (see run_config_key())
+        schedule: Harness schedule of the test files
+        targets: Keys of the per-target outputs in test results, in the
+            order of the run configuration; outputs are cached by position,
+            since builds of a target in different directories share a name
+        timed_result_callback: Called with each run_timed() result after it
+            is cached (e.g. TimingRecorder.add)
+        num_processes: Number of threads used to hash test files
+    """
+
+    def __init__(
+        self,
+        cache: ResultCache,
+        config: str,
+        schedule: HarnessSchedule,
+        targets: list[Path],
+        timed_result_callback: Callable[[tuple], None],
+        num_processes: int = 4,
+    ):
+        self.cache = cache
+        self.config = config
+        self.schedule = schedule
+        self.targets = list(targets)
+        self._positions = {target: i for i, target in enumerate(self.targets)}
+        self.timed_result_callback = timed_result_callback
+        self.num_processes = num_processes
+        self.num_cached = 0
+        self._hashes = {}
+
+    def partition(
+        self, test_cases: list[Path], result_callback: Callable[[tuple], None]
+    ) -> list[Path]:
+        """
+        Hand the cached result of each test file to result_callback.
+
+        Returns:
+            The test files that have no cached result and need to run
+        """
+        self._hashes = dict(
+            process_items(
+                test_cases,
+                _hash_test_file,
+                num_processes=self.num_processes,
+                desc="Hashing test files",
+                unit="file",
+            )
+        )
+        to_run = []
+        for test_file in test_cases:
+            content_hash = self._hashes.get(test_file)
+            cached = None
+            if content_hash is not None:
+                cached = self.cache.get(
+                    content_hash, self.schedule.harness_of(test_file), self.config
+                )
+            if cached is None:
+                to_run.append(test_file)
+                continue
+            status, outputs = cached
+            if outputs is not None:
+                outputs = {
+                    self.targets[int(position)]: output
+                    for position, output in outputs.items()
+                }
+            result_callback((test_file.stem, status, outputs))
+            self.num_cached += 1
+        return to_run
+
+    def add(self, timed_result: tuple[Path, tuple, dict, dict]):
+        """
+        Cache a run_timed() result and pass it on.
+
+        Returns:
+            What timed_result_callback returned
+        """
+        test_file, (_, status, outputs), *_ = timed_result
+        content_hash = self._hashes.get(test_file)
+        if content_hash is not None and status != TEST_CASE_CRASHED:
+            self.cache.put(
+                content_hash,
+                self.schedule.harness_of(test_file),
+                self.config,
+                status,
+                (
+                    {
+                        str(self._positions[target]): output
+                        for target, output in outputs.items()
+                    }
+                    if outputs is not None
+                    else None
+                ),
+            )
+        return self.timed_result_callback(timed_result)
+
+    def report(self, num_test_cases: int):
+        """Print how many results came from the cache."""
+        print(
+            f"Cached results: {self.num_cached} of {num_test_cases} test cases "
+            f"(--clear-result-cache to re-run them)"
+        )
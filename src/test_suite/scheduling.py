@@ -0,0 +1,302 @@
+"""
+Ordering of test files for run-tests and exec-fixtures.
+
+A mixed corpus found by a directory walk interleaves instr, txn, syscall,
+block and ELF loader fixtures, so every worker keeps switching harnesses,
+entrypoints and effects types. The schedule groups test files by harness,
+so that process_items can hand each worker homogeneous batches, and
+estimates the cost of each test so that process_items can start with the
+longest ones, which would otherwise end up as stragglers at the end of the
+run. Harnesses and sizes come from the corpus index, the pack metadata or
+the context file extension and a stat. Plain fixture files without an index
+entry have the first PEEK_SIZE bytes read to find their entrypoint; with
+--index no test file is opened before the run starts.
+
+Costs are estimated from the file size until a test has run once; from then
+on its measured run time is used. Sizes are converted to seconds with the
+time per byte observed for the same harness, so measured and estimated
+costs can be compared.
+
+Example:
+    >>> test_cases, index_entries = find_indexed_test_files(corpus_dir, True)
+    >>> schedule = HarnessSchedule(test_cases, index_entries=index_entries)
+    >>> process_items(
+    ...     test_cases,
+    ...     run_test,
+    ...     use_processes=True,
+    ...     batch_key=schedule.harness_of,
+    ...     cost_fn=schedule.cost_of,
+    ...     timing_callback=schedule.record,
+    ... )
+    >>> schedule.report()
+"""
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+from test_suite.fixture_index import IndexEntry
+from test_suite.fixture_pack import pack_member_entry
+from test_suite.flatbuffers_utils import (
+    has_flatbuffers_identifier,
+    peek_protobuf_entrypoint,
+)
+from test_suite.fuzz_context import (
+    FIXTURE_EXTENSION,
+    FLATBUFFERS_ONLY_ENTRYPOINTS,
+    HARNESS_MAP,
+    get_harness_for_entrypoint,
+)
+from test_suite.util import order_by_cost
+
+# Bytes read from the start of a plain fixture file to find its entrypoint;
+# fixture metadata comes first, so this covers any real entrypoint name
+PEEK_SIZE = 256
+
+# Group of test files whose harness cannot be told from their first bytes
+UNKNOWN_HARNESS = "unknown"
+
+_HARNESS_BY_EXTENSION = {
+    harness.context_extension: name for name, harness in HARNESS_MAP.items()
+}
+_HARNESS_BY_ENTRYPOINT = {
+    harness.fuzz_fn_name: name for name, harness in HARNESS_MAP.items()
+}
+
+
+def _harness_for_entrypoint(fn_entrypoint: str | None) -> str:
+    if not fn_entrypoint:
+        return UNKNOWN_HARNESS
+    try:
+        harness = get_harness_for_entrypoint(fn_entrypoint)
+    except KeyError:
+        # e.g. FlatBuffers-only entrypoints; still worth a group of their own
+        return fn_entrypoint
+    return _HARNESS_BY_ENTRYPOINT[harness.fuzz_fn_name]
+
+
+def _peek_fixture_entrypoint(path: Path) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            head = f.read(PEEK_SIZE)
+    except OSError:
+        return None
+    if has_flatbuffers_identifier(head):
+        return FLATBUFFERS_ONLY_ENTRYPOINTS[0]
+    return peek_protobuf_entrypoint(head)
+
+
+def classify_test_file(path: Path) -> tuple[str, int]:
+    """
+    Harness and size of a test file.
+
+    Context files are grouped by extension and fixtures in a pack by the
+    entrypoint recorded in the pack, without opening them. Other fixtures
+    are grouped by the entrypoint in their metadata, read from their first
+    PEEK_SIZE bytes (the corpus index, which HarnessSchedule takes them from
+    when available, avoids the read). FlatBuffers fixtures without the file
+    identifier go to the UNKNOWN_HARNESS group.
+
+    Args:
+        path: Test file, or <pack>/<entry name> for a file in a pack
+
+    Returns:
+        (harness name, or the entrypoint / UNKNOWN_HARNESS if no harness
+        matches, size in bytes)
+    """
+    pack_entry = pack_member_entry(path)
+    if pack_entry is not None:
+        size = pack_entry.size
+        fn_entrypoint = pack_entry.fn_entrypoint
+    else:
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            return UNKNOWN_HARNESS, 0
+        fn_entrypoint = None
+
+    if path.suffix != FIXTURE_EXTENSION:
+        return _HARNESS_BY_EXTENSION.get(path.suffix, UNKNOWN_HARNESS), size
+    if pack_entry is None:
+        fn_entrypoint = _peek_fixture_entrypoint(path)
+    return _harness_for_entrypoint(fn_entrypoint), size
+
+
+class RuntimeHistory:
+    """
+    Measured run times of test files, by name (file stem, like the result
+    logs).
+
+    Also keeps the seconds per input byte of each harness, to estimate the
+    cost of tests that have not run yet.
+    """
+
+    def __init__(self):
+        self._runs = {}
+        self._totals = {}
+
+    def add(self, name: str, harness: str, size: int, seconds: float):
+        previous = self._runs.get(name)
+        if previous is not None:
+            self._add_total(previous[0], -previous[1], -previous[2])
+        self._runs[name] = (harness, size, seconds)
+        self._add_total(harness, size, seconds)
+
+    def _add_total(self, harness: str, size: int, seconds: float):
+        total_size, total_seconds = self._totals.get(harness, (0, 0.0))
+        self._totals[harness] = (total_size + size, total_seconds + seconds)
+
+    def seconds(self, name: str) -> float | None:
+        """Last measured run time of a test file, or None if it never ran."""
+        run = self._runs.get(name)
+        return run[2] if run is not None else None
+
+    def seconds_per_byte(self, harness: str) -> float | None:
+        """
+        Observed run time per input byte of a harness, falling back to all
+        harnesses, or None if nothing ran yet.
+        """
+        total_size, total_seconds = self._totals.get(harness, (0, 0.0))
+        if total_size == 0:
+            total_size = sum(size for size, _ in self._totals.values())
+            total_seconds = sum(seconds for _, seconds in self._totals.values())
+        if total_size <= 0:
+            return None
+        return total_seconds / total_size
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+
+# Run times measured in this process, so that later runs of a long-lived
+# worker session are ordered by them
+session_history = RuntimeHistory()
+
+
+class HarnessSchedule:
+    """
+    Harness groups, cost estimates and per-harness timing of test files.
+
+    Unreadable files are kept (in the UNKNOWN_HARNESS group, with cost 0) so
+    that the run still reports them. Files with an entry in the corpus index
+    (see fixture_index) take their harness and size from it; the others are
+    classified by classify_test_file().
+
+    Attributes:
+        group_sizes: Number of test files of each harness
+    """
+
+    def __init__(
+        self,
+        test_cases: list[Path],
+        history: RuntimeHistory | None = None,
+        index_entries: Iterable[IndexEntry] = (),
+    ):
+        self.history = session_history if history is None else history
+        indexed = {
+            entry.path: (
+                entry.harness or _harness_for_entrypoint(entry.fn_entrypoint),
+                entry.size,
+            )
+            for entry in index_entries
+        }
+        self._files = {}
+        self.group_sizes = {}
+        for path in test_cases:
+            harness, size = indexed.get(path) or classify_test_file(path)
+            self._files[path] = (harness, size)
+            self.group_sizes[harness] = self.group_sizes.get(harness, 0) + 1
+        unknown = self.group_sizes.get(UNKNOWN_HARNESS, 0)
+        if unknown > len(test_cases) // 2 and not indexed:
+            print(
+                f"Warning: Harness of {unknown} of {len(test_cases)} test files "
+                "unknown, so they are not grouped by harness; run with --index "
+                "to take it from the corpus index"
+            )
+
+        self._seconds_per_byte = {
+            harness: self.history.seconds_per_byte(harness)
+            for harness in self.group_sizes
+        }
+        self._seconds = dict.fromkeys(self.group_sizes, 0.0)
+        self._counts = dict.fromkeys(self.group_sizes, 0)
+        self._stage_seconds = {}
+
+    def harness_of(self, path: Path) -> str:
+        """Harness group of a scheduled test file (a process_items batch_key)."""
+        return self._files.get(path, (UNKNOWN_HARNESS, 0))[0]
+
+    def size_of(self, path: Path) -> int:
+        """Size in bytes of a scheduled test file."""
+        return self._files.get(path, (UNKNOWN_HARNESS, 0))[1]
+
+    def cost_of(self, path: Path) -> float:
+        """
+        Estimated run time of a test file (a process_items cost_fn): its last
+        measured run time, or its size times the seconds per byte of its
+        harness. In bytes if no test has run yet, which orders by size.
+        """
+        harness, size = self._files.get(path, (UNKNOWN_HARNESS, 0))
+        seconds = self.history.seconds(path.stem)
+        if seconds is not None:
+            return seconds
+        seconds_per_byte = self._seconds_per_byte.get(harness)
+        if seconds_per_byte is None:
+            return float(size)
+        return size * seconds_per_byte
+
+    def ordered(self, test_cases: list[Path]) -> list[Path]:
+        """Test files grouped by harness, longest first."""
+        return order_by_cost(test_cases, self.cost_of, self.harness_of)
+
+    def record(self, path: Path, seconds: float):
+        """Add the run time of one test (a process_items timing_callback)."""
+        harness, size = self._files.get(path, (UNKNOWN_HARNESS, 0))
+        self._seconds[harness] = self._seconds.get(harness, 0.0) + seconds
+        self._counts[harness] = self._counts.get(harness, 0) + 1
+        self.history.add(path.stem, harness, size, seconds)
+
+    def record_stages(self, path: Path, stage_seconds: dict[str, float]):
+        """Add the time one test spent in each pipeline stage."""
+        harness = self.harness_of(path)
+        totals = self._stage_seconds.setdefault(harness, {})
+        for stage, seconds in stage_seconds.items():
+            totals[stage] = totals.get(stage, 0.0) + seconds
+
+    def stage_times(self) -> dict[str, dict[str, float]]:
+        """Worker seconds per pipeline stage, per harness."""
+        return {
+            harness: dict(stages)
+            for harness, stages in self._stage_seconds.items()
+            if stages
+        }
+
+    def throughput(self) -> dict[str, tuple[int, float]]:
+        """(tests run, worker seconds) per harness, for harnesses with runs."""
+        return {
+            harness: (count, self._seconds[harness])
+            for harness, count in self._counts.items()
+            if count
+        }
+
+    def report(self):
+        """Print per-harness throughput and time per pipeline stage."""
+        throughput = self.throughput()
+        if not throughput:
+            return
+        stage_times = self.stage_times()
+        print("Per-harness throughput:")
+        for harness, (count, seconds) in throughput.items():
+            rate = count / seconds if seconds > 0 else float("inf")
+            print(
+                f"  {harness}: {count} tests in {seconds:.2f}s worker time "
+                f"({rate:.1f} tests/s per worker)"
+            )
+            stages = stage_times.get(harness)
+            if stages:
+                print(
+                    "    "
+                    + ", ".join(
+                        f"{stage} {seconds:.2f}s" for stage, seconds in stages.items()
+                    )
+                )
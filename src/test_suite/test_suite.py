@@ -14,21 +14,56 @@ from test_suite.fixture_utils import (
     extract_context_from_fixture,
     regenerate_fixture,
 )
-from test_suite.log_utils import log_results
+from test_suite.fixture_index import (
+    FixtureIndex,
+    default_index_path,
+    find_indexed_test_files,
+    find_test_files,
+)
+from test_suite.fixture_pack import PACK_EXTENSION, is_pack, pack_directory, unpack
+from test_suite.flatbuffers_utils import (
+    format_detection_counts,
+    report_legacy_format_detections,
+)
+from test_suite.fuzz_interface import TargetEffects
+from test_suite.log_utils import ResultLogger
+from test_suite.result_cache import (
+    DEFAULT_RESULT_CACHE_MAX_MB,
+    IncrementalRun,
+    ResultCache,
+    default_result_cache_path,
+    run_config_key,
+)
+from test_suite.scheduling import HarnessSchedule
+from test_suite.timing_db import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    TargetBuild,
+    TimingDB,
+    TimingRecorder,
+    default_timing_db_path,
+    open_timing_db,
+    report_regressions,
+)
 from test_suite.multiprocessing_utils import (
     decode_single_test_case,
     download_and_process,
     execute_fixture,
-    extract_metadata,
-    read_fixture,
+    FixtureParseError,
+    load_test_case,
+    parse_path_counts,
+    read_test_file,
+    report_parse_stats,
     initialize_process_output_buffers,
+    worker_session,
+    shutdown_target_executor,
+    crashed_timed_result,
     initialize_process_globals_for_extraction,
     initialize_process_globals_for_decoding,
     initialize_process_globals_for_download,
     initialize_process_globals_for_regeneration,
     process_target,
     run_test,
-    read_context,
+    run_timed,
 )
 import test_suite.globals as globals
 from test_suite.util import (
@@ -52,6 +87,7 @@ from bs4 import BeautifulSoup
 import time
 import test_suite.features_utils as features_utils
 import traceback
+import functools
 import httpx
 from test_suite.octane_api_client import (
     OctaneAPIClient,
@@ -104,9 +140,14 @@ def main(
         is_eager=True,
         help="Show version and exit.",
     ),
+    output_buffer_seed: int = typer.Option(
+        None,
+        "--output-buffer-seed",
+        help="Seed for --randomize-output-buffer contents (random if unset)",
+    ),
 ):
     """Solana Conformance Test Suite."""
-    pass
+    globals.output_buffer_seed = output_buffer_seed
 
 
 @app.command(help=f"Execute Context or Fixture message(s) and print the Effects.")
@@ -163,30 +204,14 @@ def execute(
     lib.sol_compat_init(log_level)
     globals.target_libraries[shared_library] = lib
     globals.reference_shared_library = shared_library
+    globals.default_harness_ctx = HARNESS_MAP[default_harness_ctx]
 
-    if input.is_file():
-        files_to_exec = [input]
-    else:
-        # Recursively find all files in the directory with supported extensions
-        files_to_exec = []
-        supported_extensions = get_all_supported_extensions()
-        for ext in supported_extensions:
-            for file_path in input.rglob(f"*{ext}"):
-                if file_path.is_file():
-                    files_to_exec.append(file_path)
+    files_to_exec = find_test_files(input)
     for file in files_to_exec:
         print(f"Handling {file}...")
-        if file.suffix == FIXTURE_EXTENSION:
-            fn_entrypoint = extract_metadata(file).fn_entrypoint
-            harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
-            context = read_fixture(file).input
-        else:
-            harness_ctx = HARNESS_MAP[default_harness_ctx]
-            context = read_context(harness_ctx, file)
-            if context is None:
-                fn_entrypoint = extract_metadata(file).fn_entrypoint
-                harness_ctx = get_harness_for_entrypoint(fn_entrypoint)
-                context = read_fixture(file).input
+        harness_ctx, context = load_test_case(file, read_test_file(file))
+        if context is None:
+            continue
         # Execute and cleanup
         start = time.time()
         effects = process_target(harness_ctx, lib, context)
@@ -198,16 +223,11 @@ def execute(
             print(f"No {harness_ctx.effects_type.__name__} returned")
             continue
 
-        serialized_effects = effects.SerializeToString(deterministic=True)
-
         # Prune execution results
-        serialized_effects = harness_ctx.prune_effects_fn(
+        parsed_instruction_effects = harness_ctx.prune_effects_fn(
             context,
-            {shared_library: serialized_effects},
-        )[shared_library]
-
-        parsed_instruction_effects = harness_ctx.effects_type()
-        parsed_instruction_effects.ParseFromString(serialized_effects)
+            {shared_library: TargetEffects.of(effects)},
+        )[shared_library].message
 
         # Print human-readable output
         if parsed_instruction_effects:
@@ -252,16 +272,7 @@ def fix_to_ctx(
         shutil.rmtree(globals.output_dir)
     globals.output_dir.mkdir(parents=True, exist_ok=True)
 
-    if input.is_file():
-        test_cases = [input]
-    else:
-        # Recursively find all files in the directory with supported extensions
-        test_cases = []
-        supported_extensions = get_all_supported_extensions()
-        for ext in supported_extensions:
-            for file_path in input.rglob(f"*{ext}"):
-                if file_path.is_file():
-                    test_cases.append(file_path)
+    test_cases = find_test_files(input)
     num_test_cases = len(test_cases)
 
     print(f"Converting to Fixture messages...")
@@ -386,6 +397,9 @@ def create_fixtures(
 
     # Initialize shared library
     for target in shared_libraries:
+        if target in globals.session_libraries:
+            # Already loaded and initialized by the worker session
+            continue
         # Load in and initialize shared libraries
         lib = load_shared_library_safe(
             str(target), target_libraries=[str(t) for t in shared_libraries]
@@ -393,16 +407,7 @@ def create_fixtures(
         lib.sol_compat_init(log_level)
         globals.target_libraries[target] = lib
 
-    if input.is_file():
-        test_cases = [input]
-    else:
-        # Recursively find all files in the directory with supported extensions
-        test_cases = []
-        supported_extensions = get_all_supported_extensions()
-        for ext in supported_extensions:
-            for file_path in input.rglob(f"*{ext}"):
-                if file_path.is_file():
-                    test_cases.append(file_path)
+    test_cases = find_test_files(input)
     num_test_cases = len(test_cases)
 
     globals.default_harness_ctx = HARNESS_MAP[default_harness_ctx]
@@ -418,6 +423,8 @@ def create_fixtures(
             initializer=initialize_process_output_buffers,
             desc="Creating fixtures",
             use_processes=True,
+            pool=globals.worker_pool,
+            crash_result_fn=lambda test_file: 0,
         )
     except BrokenProcessPool:
         # util.process_items has already logged a clear explanation.
@@ -426,7 +433,8 @@ def create_fixtures(
     # Clean up
     print("Cleaning up...")
     for target in shared_libraries:
-        globals.target_libraries[target].sol_compat_fini()
+        if target not in globals.session_libraries:
+            globals.target_libraries[target].sol_compat_fini()
 
     print("-" * LOG_FILE_SEPARATOR_LENGTH)
     print(f"{len(write_results)} total files seen")
@@ -551,6 +559,52 @@ expected to use different amounts of compute units than the other. Note: Cannot
         "-fe",
         help="Stop test execution on the first failure",
     ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Find test files through a persistent corpus index, only re-reading files changed since the last run",
+    ),
+    strict_parsing: bool = typer.Option(
+        False,
+        "--strict-parsing",
+        help="Abort on the first test file that cannot be decoded, without trying fallback parsers",
+    ),
+    record_timings: bool = typer.Option(
+        None,
+        "--record-timings/--no-record-timings",
+        help="Record per-fixture harness call times in the timing database and use them to schedule the run (default: only if --timing-db is given)",
+        show_default=False,
+    ),
+    timing_db_path: Path = typer.Option(
+        None,
+        "--timing-db",
+        help="Timing database (default: timings.sqlite in ~/.cache/solana-conformance)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Reuse cached results of test files whose contents, harness, target builds and diff mode did not change, and only run the rest",
+    ),
+    result_cache_path: Path = typer.Option(
+        None,
+        "--result-cache",
+        help="Result cache for --incremental (default: results.sqlite in ~/.cache/solana-conformance)",
+    ),
+    result_cache_max_mb: int = typer.Option(
+        DEFAULT_RESULT_CACHE_MAX_MB,
+        "--result-cache-max-mb",
+        help="Size cap of the result cache; least recently used results are evicted first",
+    ),
+    clear_result_cache: bool = typer.Option(
+        False,
+        "--clear-result-cache",
+        help="Drop all cached results before running",
+    ),
+    parallel_targets: bool = typer.Option(
+        False,
+        "--parallel-targets",
+        help="Call the target libraries of each test concurrently from threads (each test's context is serialized once either way)",
+    ),
 ):
     # Add Solana library to shared libraries
     shared_libraries = [reference_shared_library] + shared_libraries
@@ -573,6 +627,10 @@ expected to use different amounts of compute units than the other. Note: Cannot
     globals.core_bpf_mode = core_bpf_mode
     # Set diff mode to ignore_compute_units if specified
     globals.ignore_compute_units_mode = ignore_compute_units_mode
+    # Passing effects are only logged (and thus rendered) without --failures-only
+    globals.render_passing_effects = not failures_only
+    globals.strict_parsing = strict_parsing
+    globals.parallel_targets = parallel_targets
 
     # Create the output directory, if necessary
     if globals.output_dir.exists():
@@ -584,92 +642,171 @@ expected to use different amounts of compute units than the other. Note: Cannot
 
     # Initialize shared libraries
     for target in shared_libraries:
-        # Load in and initialize shared libraries
-        lib = load_shared_library_safe(
-            str(target), target_libraries=[str(t) for t in shared_libraries]
-        )
-        lib.sol_compat_init(log_level)
-        globals.target_libraries[target] = lib
+        # Load in and initialize shared libraries, unless the worker session
+        # already holds them
+        if target not in globals.session_libraries:
+            lib = load_shared_library_safe(
+                str(target), target_libraries=[str(t) for t in shared_libraries]
+            )
+            lib.sol_compat_init(log_level)
+            globals.target_libraries[target] = lib
 
         # Make log output directories for each shared library
         log_dir = globals.output_dir / target.stem
         log_dir.mkdir(parents=True, exist_ok=True)
 
-    # Collect test cases - recursively search by default
-    if input.is_file():
-        test_cases = [input]
-    else:
-        # Recursively find all files in the directory with supported extensions
-        test_cases = []
-        supported_extensions = get_all_supported_extensions()
-        for ext in supported_extensions:
-            for file_path in input.rglob(f"*{ext}"):
-                if file_path.is_file():
-                    test_cases.append(file_path)
+    # Collect test cases - recursively search by default - and run them
+    # grouped by harness, longest first
+    test_cases, index_entries = find_indexed_test_files(input, use_index, num_processes)
+    target_builds = {target: TargetBuild.of(target) for target in shared_libraries}
+    if record_timings is None:
+        record_timings = timing_db_path is not None
+    timing_db = None
+    if record_timings:
+        timing_db = open_timing_db(timing_db_path or default_timing_db_path())
+    schedule = HarnessSchedule(
+        test_cases,
+        timing_db.history(target_builds.values()) if timing_db else None,
+        index_entries,
+    )
+    format_detection_counts.reset()
+    parse_path_counts.reset()
 
     num_test_cases = len(test_cases)
 
+    # Results are logged as they arrive rather than collected first
+    result_logger = ResultLogger(
+        test_cases,
+        shared_libraries,
+        log_chunk_size,
+        failures_only,
+        save_failures,
+        save_successes,
+    )
+    timing_recorder = TimingRecorder(
+        timing_db, schedule, target_builds, result_logger.add
+    )
+
+    # With --incremental, only test files without a cached result run
+    result_cache = None
+    if incremental or clear_result_cache:
+        result_cache = ResultCache(
+            result_cache_path or default_result_cache_path(),
+            result_cache_max_mb * 1024 * 1024,
+        )
+        if clear_result_cache:
+            result_cache.clear()
+    incremental_run = None
+    tests_to_run = test_cases
+    run_result_callback = timing_recorder.add
+    if incremental:
+        incremental_run = IncrementalRun(
+            result_cache,
+            run_config_key(target_builds[target] for target in shared_libraries),
+            schedule,
+            shared_libraries,
+            timing_recorder.add,
+            num_processes,
+        )
+        tests_to_run = incremental_run.partition(test_cases, result_logger.add)
+        run_result_callback = incremental_run.add
+        if fail_early and result_logger.failed:
+            print("\nA cached test case failed. Stopping due to --fail-early option.")
+            tests_to_run = []
+
     # Process the test results in parallel
     print("Running tests...")
-    test_case_results = []
-    if fail_early:
-        # Run tests sequentially and stop on first failure
-        initialize_process_output_buffers(randomize_output_buffer)
-        for test_case in tqdm.tqdm(test_cases, desc="Running tests"):
-            result = run_test(test_case)
-            test_case_results.append(result)
-            # Check if test failed
-            if len(result) >= 2 and result[1] == -1:
-                print(
-                    f"\nTest failed: {result[0]}. Stopping execution due to --fail-early option."
+    try:
+        if fail_early:
+            # Run tests sequentially and stop on first failure
+            initialize_process_output_buffers(randomize_output_buffer)
+            for test_case in tqdm.tqdm(
+                schedule.ordered(tests_to_run), desc="Running tests"
+            ):
+                start = time.perf_counter()
+                result = run_result_callback(run_timed(run_test, test_case))
+                schedule.record(test_case, time.perf_counter() - start)
+                # Check if test failed
+                if len(result) >= 2 and result[1] == -1:
+                    print(
+                        f"\nTest failed: {result[0]}. Stopping execution due to --fail-early option."
+                    )
+                    break
+        else:
+            # Use process_items utility for parallel/sequential processing
+            try:
+                process_items(
+                    items=tests_to_run,
+                    process_func=functools.partial(run_timed, run_test),
+                    num_processes=num_processes,
+                    debug_mode=debug_mode,
+                    initializer=initialize_process_output_buffers,
+                    initargs=(randomize_output_buffer,),
+                    desc="Running tests",
+                    use_processes=True,
+                    pool=globals.worker_pool,
+                    crash_result_fn=crashed_timed_result,
+                    result_callback=run_result_callback,
+                    timing_callback=schedule.record,
+                    batch_key=schedule.harness_of,
+                    cost_fn=schedule.cost_of,
                 )
-                break
-    else:
-        # Use process_items utility for parallel/sequential processing
-        try:
-            test_case_results = process_items(
-                items=test_cases,
-                process_func=run_test,
-                num_processes=num_processes,
-                debug_mode=debug_mode,
-                initializer=initialize_process_output_buffers,
-                initargs=(randomize_output_buffer,),
-                desc="Running tests",
-                use_processes=True,
-            )
-        except BrokenProcessPool:
-            # Harness/shared-library crash already reported by util.process_items.
-            raise typer.Exit(code=1)
+            except BrokenProcessPool:
+                # Harness/shared-library crash already reported by util.process_items.
+                result_logger.close()
+                raise typer.Exit(code=1)
+    except FixtureParseError as e:
+        # --strict-parsing: stop at the first test file that cannot be decoded
+        result_logger.close()
+        print(f"Error: {e}")
+        raise typer.Exit(code=1)
 
-    print("Logging results...")
-    passed, failed, skipped, target_log_files, failed_tests, skipped_tests = (
-        log_results(
-            test_cases,
-            test_case_results,
-            shared_libraries,
-            log_chunk_size,
-            failures_only,
-            save_failures,
-            save_successes,
-        )
-    )
+    (
+        passed,
+        failed,
+        skipped,
+        target_log_files,
+        failed_tests,
+        skipped_tests,
+        crashed_tests,
+    ) = result_logger.close()
+    crashed = len(crashed_tests)
+    if timing_db is not None:
+        timing_db.flush()
+    if result_cache is not None:
+        result_cache.flush()
+        result_cache.close()
 
     print("Cleaning up...")
+    shutdown_target_executor()
     for target in shared_libraries:
-        globals.target_libraries[target].sol_compat_fini()
+        if target not in globals.session_libraries:
+            globals.target_libraries[target].sol_compat_fini()
 
     peak_memory_usage_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
     print(f"Peak Memory Usage: {peak_memory_usage_kb / 1024} MB")
 
-    print(f"Total test cases: {passed + failed + skipped}")
-    print(f"Passed: {passed}, Failed: {failed}, Skipped: {skipped}")
+    print(f"Total test cases: {passed + failed + skipped + crashed}")
+    print(f"Passed: {passed}, Failed: {failed}, Skipped: {skipped}, Crashed: {crashed}")
+    report_legacy_format_detections()
+    report_parse_stats(verbose)
+    if incremental_run is not None:
+        incremental_run.report(num_test_cases)
+    schedule.report()
+    if timing_db is not None:
+        report_regressions(timing_db, target_builds.values())
+        timing_db.close()
     if verbose:
         if failed != 0:
             print(f"Failed tests: {failed_tests}")
         if skipped != 0:
             print(f"Skipped tests: {skipped_tests}")
+    if crashed != 0:
+        print(f"Crashed tests: {crashed_tests}")
     if failed != 0 and save_failures:
         print("Failures tests are in: ", globals.output_dir / "failed_protobufs")
+    if crashed != 0 and save_failures:
+        print("Crashed tests are in: ", globals.output_dir / "crashed_protobufs")
     print("Successful tests are in: ", globals.output_dir / "successful_protobufs")
 
     if failed != 0:
@@ -681,7 +818,7 @@ expected to use different amounts of compute units than the other. Note: Cannot
         ):
             print(f"Diff between {name1} and {name2}: vimdiff {file1} {file2}")
 
-    success = (failed == 0) and (skipped == 0) and (passed > 0)
+    success = (failed == 0) and (skipped == 0) and (crashed == 0) and (passed > 0)
     return success
 
 
@@ -723,16 +860,7 @@ def decode_protobufs(
     globals.output_dir.mkdir(parents=True, exist_ok=True)
     globals.default_harness_ctx = HARNESS_MAP[default_harness_ctx]
 
-    if input.is_file():
-        test_cases = [input]
-    else:
-        # Recursively find all files in the directory with supported extensions
-        test_cases = []
-        supported_extensions = get_all_supported_extensions()
-        for ext in supported_extensions:
-            for file_path in input.rglob(f"*{ext}"):
-                if file_path.is_file():
-                    test_cases.append(file_path)
+    test_cases = find_test_files(input)
     num_test_cases = len(test_cases)
 
     try:
@@ -792,6 +920,11 @@ def validate_fixtures(
         "-v",
         help="Show detailed information for each fixture",
     ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Report from a persistent corpus index, only re-validating files changed since the last run",
+    ),
 ):
     """
     Validate fixture files and report their format (Protobuf or FlatBuffers).
@@ -800,7 +933,9 @@ def validate_fixtures(
     """
     from test_suite.flatbuffers_utils import FixtureLoader
 
-    if input_dir.is_file():
+    if is_pack(input_dir):
+        files = find_test_files(input_dir)
+    elif input_dir.is_file():
         files = [input_dir]
     else:
         files = []
@@ -811,29 +946,48 @@ def validate_fixtures(
         print(f"No fixture files found in {input_dir}")
         return False
 
+    # (path, format, entrypoint, error message or None) of each file
+    format_detection_counts.reset()
+    if use_index and input_dir.is_dir():
+        with FixtureIndex(default_index_path(input_dir)) as index:
+            reports = [
+                (entry.path, entry.format, entry.fn_entrypoint, entry.error)
+                for entry in index.update(input_dir, recursive=False)
+            ]
+    else:
+        reports = []
+        for filepath in files:
+            loader = FixtureLoader(filepath, raw_data=read_test_file(filepath))
+            reports.append(
+                (
+                    filepath,
+                    loader.format_type,
+                    loader.fn_entrypoint,
+                    None if loader.is_valid else loader.error_message,
+                )
+            )
+
     valid_count = 0
     invalid_count = 0
     format_counts = {"protobuf": 0, "flatbuffers": 0, "unknown": 0}
 
-    for filepath in sorted(files):
-        loader = FixtureLoader(filepath)
-
-        if loader.is_valid:
+    for filepath, format_type, fn_entrypoint, error_message in sorted(reports):
+        if error_message is None:
             valid_count += 1
-            format_counts[loader.format_type] += 1
+            format_counts[format_type] += 1
             if verbose:
-                entrypoint = loader.fn_entrypoint or "N/A"
+                entrypoint = fn_entrypoint or "N/A"
                 print(f"[OK] {filepath.name}")
-                print(f"     Format: {loader.format_type}")
+                print(f"     Format: {format_type}")
                 print(f"     Entrypoint: {entrypoint}")
         else:
             invalid_count += 1
             format_counts["unknown"] += 1
             if verbose:
                 print(f"[FAIL] {filepath.name}")
-                print(f"       Error: {loader.error_message}")
+                print(f"       Error: {error_message}")
             else:
-                print(f"[FAIL] {filepath.name}: {loader.error_message}")
+                print(f"[FAIL] {filepath.name}: {error_message}")
 
     print()
     print(f"Summary: {len(files)} files checked")
@@ -842,10 +996,139 @@ def validate_fixtures(
     print(
         f"  Formats: {format_counts['protobuf']} Protobuf, {format_counts['flatbuffers']} FlatBuffers"
     )
+    report_legacy_format_detections()
 
     return invalid_count == 0
 
 
+@app.command(help="Pack a directory of test files into a single fixture pack.")
+def pack_fixtures(
+    input: Path = typer.Option(
+        ...,
+        "--input",
+        "-i",
+        help="Directory of test files to pack",
+    ),
+    output: Path = typer.Option(
+        ...,
+        "--output",
+        "-o",
+        help=f"Fixture pack ({PACK_EXTENSION}) to write",
+    ),
+    append: bool = typer.Option(
+        False,
+        "--append",
+        "-a",
+        help="Add the files to an existing pack instead of replacing it",
+    ),
+    num_processes: int = typer.Option(
+        4, "--num-processes", "-p", help="Number of processes to use"
+    ),
+):
+    """
+    Fixture packs can be passed to --input of any command in place of a
+    directory; their files are then read from the pack without being extracted.
+    """
+    if not input.is_dir():
+        typer.echo(f"Error: {input} is not a directory", err=True)
+        raise typer.Exit(code=1)
+
+    num_packed = pack_directory(input, output, append, num_processes)
+    print(f"Packed {num_packed} files into {output}")
+    return True
+
+
+@app.command(help="Extract the files of a fixture pack into a directory.")
+def unpack_fixtures(
+    input: Path = typer.Option(
+        ...,
+        "--input",
+        "-i",
+        help=f"Fixture pack ({PACK_EXTENSION}) to extract",
+    ),
+    output_dir: Path = typer.Option(
+        ...,
+        "--output-dir",
+        "-o",
+        help="Directory to extract the files into",
+    ),
+):
+    if not is_pack(input):
+        typer.echo(f"Error: {input} is not a fixture pack", err=True)
+        raise typer.Exit(code=1)
+
+    num_unpacked = unpack(input, output_dir)
+    print(f"Extracted {num_unpacked} files into {output_dir}")
+    return True
+
+
+@app.command(
+    help="Report the slowest fixtures of a target build, or fixtures that got slower between two builds."
+)
+def timing_report(
+    target: str = typer.Option(
+        ...,
+        "--target",
+        "-t",
+        help="Target build: shared object (.so) path, target name (latest build) or build ID prefix",
+    ),
+    baseline: str = typer.Option(
+        None,
+        "--baseline",
+        "-b",
+        help="Report regressions against this build (same forms as --target) instead of the slowest fixtures",
+    ),
+    num_fixtures: int = typer.Option(
+        20, "--num-fixtures", "-n", help="Number of fixtures to list"
+    ),
+    threshold: float = typer.Option(
+        DEFAULT_REGRESSION_THRESHOLD,
+        "--threshold",
+        help="Slowdown factor from which a fixture counts as a regression",
+    ),
+    timing_db_path: Path = typer.Option(
+        None,
+        "--timing-db",
+        help="Timing database (default: timings.sqlite in ~/.cache/solana-conformance)",
+    ),
+):
+    with TimingDB(timing_db_path or default_timing_db_path()) as timing_db:
+        build = timing_db.find_build(target)
+        baseline_build = timing_db.find_build(baseline) if baseline else None
+        if build is None or (baseline and baseline_build is None):
+            typer.echo(
+                f"Error: unknown build {target if build is None else baseline}",
+                err=True,
+            )
+            for known in timing_db.builds():
+                typer.echo(f"  {known.target}: {known.build}", err=True)
+            raise typer.Exit(code=1)
+
+        if baseline_build is None:
+            slowest = timing_db.slowest(build, num_fixtures)
+            print(f"Slowest fixtures of {build}:")
+            for timing in slowest:
+                print(
+                    f"  {timing.fixture} ({timing.harness}): "
+                    f"{timing.best_seconds:.4f}s best, {timing.seconds:.4f}s last, "
+                    f"{timing.runs} runs"
+                )
+            return True
+
+        regressions = timing_db.regressions(baseline_build, build, threshold)
+        print(
+            f"{len(regressions)} fixtures over {threshold}x slower on {build} "
+            f"than on {baseline_build}"
+        )
+        for regression in regressions[:num_fixtures]:
+            print(
+                f"  {regression.fixture} ({regression.harness}): "
+                f"{regression.baseline_seconds:.4f}s -> {regression.seconds:.4f}s "
+                f"({regression.ratio:.1f}x)"
+            )
+        return not regressions
+
+
 @app.command(help=f"List all available repro lineages.")
 def list_repros(
     lineage: str = typer.Option(
@@ -1546,45 +1829,58 @@ def debug_mismatches(
 
     run_tests_output = globals.output_dir / "test_results"
 
-    create_fixtures(
-        input=globals.inputs_dir,
-        default_harness_ctx=default_harness_ctx,
-        reference_shared_library=reference_shared_library,
-        shared_libraries=shared_libraries,
-        output_dir=create_fixtures_dir,
-        num_processes=num_processes,
-        readable=False,
-        output_format="auto",
-        only_keep_passing=False,
-        organize_fixture_dir=False,
-        log_level=log_level,
-        debug_mode=debug_mode,
-    )
+    # Share loaded targets and worker processes between both phases
+    with worker_session(
+        [reference_shared_library] + shared_libraries, log_level, num_processes
+    ):
+        create_fixtures(
+            input=globals.inputs_dir,
+            default_harness_ctx=default_harness_ctx,
+            reference_shared_library=reference_shared_library,
+            shared_libraries=shared_libraries,
+            output_dir=create_fixtures_dir,
+            num_processes=num_processes,
+            readable=False,
+            output_format="auto",
+            only_keep_passing=False,
+            organize_fixture_dir=False,
+            log_level=log_level,
+            debug_mode=debug_mode,
+        )
 
-    shutil.rmtree(globals.inputs_dir)
-    shutil.copytree(create_fixtures_dir, globals.inputs_dir)
-    shutil.rmtree(create_fixtures_dir)
+        shutil.rmtree(globals.inputs_dir)
+        shutil.copytree(create_fixtures_dir, globals.inputs_dir)
+        shutil.rmtree(create_fixtures_dir)
 
-    return run_tests(
-        input=globals.inputs_dir,
-        reference_shared_library=reference_shared_library,
-        default_harness_ctx=default_harness_ctx,
-        shared_libraries=shared_libraries,
-        output_dir=run_tests_output,
-        num_processes=num_processes,
-        randomize_output_buffer=False,
-        log_chunk_size=10000,
-        verbose=True,
-        consensus_mode=False,
-        core_bpf_mode=False,
-        ignore_compute_units_mode=False,
-        failures_only=False,
-        save_failures=True,
-        save_successes=True,
-        log_level=log_level,
-        debug_mode=debug_mode,
-        fail_early=False,
-    )
+        return run_tests(
+            input=globals.inputs_dir,
+            reference_shared_library=reference_shared_library,
+            default_harness_ctx=default_harness_ctx,
+            shared_libraries=shared_libraries,
+            output_dir=run_tests_output,
+            num_processes=num_processes,
+            randomize_output_buffer=False,
+            log_chunk_size=10000,
+            verbose=True,
+            consensus_mode=False,
+            core_bpf_mode=False,
+            ignore_compute_units_mode=False,
+            failures_only=False,
+            save_failures=True,
+            save_successes=True,
+            log_level=log_level,
+            debug_mode=debug_mode,
+            fail_early=False,
+            use_index=False,
+            strict_parsing=False,
+            record_timings=False,
+            timing_db_path=None,
+            incremental=False,
+            result_cache_path=None,
+            result_cache_max_mb=DEFAULT_RESULT_CACHE_MAX_MB,
+            clear_result_cache=False,
+            parallel_targets=False,
+        )
 
 
 @app.command(help="Debug a single repro by hash.")
@@ -1693,42 +1989,56 @@ def debug_mismatch(
 
         run_tests_output = globals.output_dir / "test_results"
 
-        print("Creating fixtures...")
-        create_fixtures(
-            input=globals.inputs_dir,
-            default_harness_ctx=default_harness_ctx,
-            reference_shared_library=reference_shared_library,
-            shared_libraries=shared_libraries,
-            output_dir=create_fixtures_dir,
-            num_processes=1,  # Single repro, no need for parallel
-            readable=False,
-            output_format="auto",
-            only_keep_passing=False,
-            organize_fixture_dir=False,
-            log_level=log_level,
-            debug_mode=debug_mode,
-        )
+        # Share loaded targets and worker processes between both phases
+        with worker_session(
+            [reference_shared_library] + shared_libraries, log_level, 1
+        ):
+            print("Creating fixtures...")
+            create_fixtures(
+                input=globals.inputs_dir,
+                default_harness_ctx=default_harness_ctx,
+                reference_shared_library=reference_shared_library,
+                shared_libraries=shared_libraries,
+                output_dir=create_fixtures_dir,
+                num_processes=1,  # Single repro, no need for parallel
+                readable=False,
+                output_format="auto",
+                only_keep_passing=False,
+                organize_fixture_dir=False,
+                log_level=log_level,
+                debug_mode=debug_mode,
+            )
 
-        print("Running tests...")
-        run_tests(
-            input=create_fixtures_dir,
-            default_harness_ctx=default_harness_ctx,
-            reference_shared_library=reference_shared_library,
-            shared_libraries=shared_libraries,
-            output_dir=run_tests_output,
-            num_processes=1,  # Single repro, no need for parallel
-            randomize_output_buffer=randomize_output_buffer,
-            log_chunk_size=10000,
-            verbose=True,  # Verbose for single repro debugging
-            consensus_mode=False,
-            core_bpf_mode=False,
-            ignore_compute_units_mode=False,
-            save_failures=True,
-            save_successes=True,
-            log_level=log_level,
-            debug_mode=debug_mode,
-            fail_early=False,
-        )
+            print("Running tests...")
+            run_tests(
+                input=create_fixtures_dir,
+                default_harness_ctx=default_harness_ctx,
+                reference_shared_library=reference_shared_library,
+                shared_libraries=shared_libraries,
+                output_dir=run_tests_output,
+                num_processes=1,  # Single repro, no need for parallel
+                randomize_output_buffer=randomize_output_buffer,
+                log_chunk_size=10000,
+                verbose=True,  # Verbose for single repro debugging
+                consensus_mode=False,
+                core_bpf_mode=False,
+                ignore_compute_units_mode=False,
+                failures_only=False,
+                save_failures=True,
+                save_successes=True,
+                log_level=log_level,
+                debug_mode=debug_mode,
+                fail_early=False,
+                use_index=False,
+                strict_parsing=False,
+                record_timings=False,
+                timing_db_path=None,
+                incremental=False,
+                result_cache_path=None,
+                result_cache_max_mb=DEFAULT_RESULT_CACHE_MAX_MB,
+                clear_result_cache=False,
+                parallel_targets=False,
+            )
 
         # Show results
         print(f"\nResults:")
@@ -1821,6 +2131,11 @@ def regenerate_fixtures(
         "--debug-mode",
         help="Enables debug mode, which spawns a single child process for easier debugging",
     ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Find test files through a persistent corpus index, only re-reading files changed since the last run",
+    ),
 ):
     globals.output_dir = output_dir
     globals.reference_shared_library = shared_library
@@ -1834,16 +2149,7 @@ def regenerate_fixtures(
     globals.target_libraries[shared_library] = lib
     initialize_process_output_buffers()
 
-    if input.is_file():
-        test_cases = [input]
-    else:
-        # Recursively find all files in the directory with supported extensions
-        test_cases = []
-        supported_extensions = get_all_supported_extensions()
-        for ext in supported_extensions:
-            for file_path in input.rglob(f"*{ext}"):
-                if file_path.is_file():
-                    test_cases.append(file_path)
+    test_cases = find_test_files(input, use_index, num_processes)
     num_regenerated = 0
 
     globals.features_to_add = set(
@@ -2011,6 +2317,7 @@ def mass_regenerate_fixtures(
             verbose=verbose,
             log_level=5,
             debug_mode=debug_mode,
+            use_index=False,
         )
 
     print(f"Regenerated fixtures from {test_vectors} to {output_dir}")
@@ -2080,9 +2387,32 @@ def exec_fixtures(
         "-d",
         help="Enables debug mode, which spawns a single child process for easier debugging",
     ),
+    use_index: bool = typer.Option(
+        False,
+        "--index",
+        help="Find test files through a persistent corpus index, only re-reading files changed since the last run",
+    ),
+    strict_parsing: bool = typer.Option(
+        False,
+        "--strict-parsing",
+        help="Abort on the first fixture that cannot be decoded, without trying fallback parsers",
+    ),
+    record_timings: bool = typer.Option(
+        None,
+        "--record-timings/--no-record-timings",
+        help="Record per-fixture harness call times in the timing database and use them to schedule the run (default: only if --timing-db is given)",
+        show_default=False,
+    ),
+    timing_db_path: Path = typer.Option(
+        None,
+        "--timing-db",
+        help="Timing database (default: timings.sqlite in ~/.cache/solana-conformance)",
+    ),
 ):
     # Specify globals
     globals.output_dir = output_dir
+    globals.render_passing_effects = not failures_only
+    globals.strict_parsing = strict_parsing
 
     # Create the output directory, if necessary
     if globals.output_dir.exists():
@@ -2095,60 +2425,100 @@ def exec_fixtures(
 
     # Initialize output buffers and shared library
     initialize_process_output_buffers(randomize_output_buffer=randomize_output_buffer)
-    lib = load_shared_library_safe(str(shared_library))
-    lib.sol_compat_init(log_level)
-    globals.target_libraries[shared_library] = lib
+    if shared_library not in globals.session_libraries:
+        lib = load_shared_library_safe(str(shared_library))
+        lib.sol_compat_init(log_level)
+        globals.target_libraries[shared_library] = lib
     globals.reference_shared_library = shared_library
 
-    if input.is_file():
-        test_cases = [input]
-    else:
-        # Recursively find all files in the directory with supported extensions
-        test_cases = []
-        supported_extensions = get_all_supported_extensions()
-        for ext in supported_extensions:
-            for file_path in input.rglob(f"*{ext}"):
-                if file_path.is_file():
-                    test_cases.append(file_path)
+    test_cases, index_entries = find_indexed_test_files(input, use_index, num_processes)
+    target_builds = {shared_library: TargetBuild.of(shared_library)}
+    if record_timings is None:
+        record_timings = timing_db_path is not None
+    timing_db = None
+    if record_timings:
+        timing_db = open_timing_db(timing_db_path or default_timing_db_path())
+    schedule = HarnessSchedule(
+        test_cases,
+        timing_db.history(target_builds.values()) if timing_db else None,
+        index_entries,
+    )
+    format_detection_counts.reset()
+    parse_path_counts.reset()
     num_test_cases = len(test_cases)
+
+    # Results are logged as they arrive rather than collected first
+    result_logger = ResultLogger(
+        test_cases,
+        [Path("expected"), Path("actual")],
+        10000,
+        failures_only,
+        save_failures,
+        save_successes,
+    )
+    timing_recorder = TimingRecorder(
+        timing_db, schedule, target_builds, result_logger.add
+    )
+
     print("Running tests...")
     try:
-        test_case_results = process_items(
+        process_items(
             test_cases,
-            execute_fixture,
+            functools.partial(run_timed, execute_fixture),
             num_processes=num_processes,
             debug_mode=debug_mode,
             initializer=initialize_process_output_buffers,
             initargs=(randomize_output_buffer,),
             desc="Running tests",
             use_processes=True,
+            pool=globals.worker_pool,
+            crash_result_fn=crashed_timed_result,
+            result_callback=timing_recorder.add,
+            timing_callback=schedule.record,
+            batch_key=schedule.harness_of,
+            cost_fn=schedule.cost_of,
         )
     except BrokenProcessPool:
+        result_logger.close()
+        raise typer.Exit(code=1)
+    except FixtureParseError as e:
+        # --strict-parsing: stop at the first test file that cannot be decoded
+        result_logger.close()
+        print(f"Error: {e}")
         raise typer.Exit(code=1)
 
-    print("Logging results...")
-    passed, failed, skipped, target_log_files, failed_tests, skipped_tests = (
-        log_results(
-            test_cases,
-            test_case_results,
-            [Path("expected"), Path("actual")],
-            10000,
-            failures_only,
-            save_failures,
-            save_successes,
-        )
-    )
-
-    lib.sol_compat_fini()
-
-    print(f"Total test cases: {passed + failed + skipped}")
-    print(f"Passed: {passed}, Failed: {failed}, Skipped: {skipped}")
+    (
+        passed,
+        failed,
+        skipped,
+        target_log_files,
+        failed_tests,
+        skipped_tests,
+        crashed_tests,
+    ) = result_logger.close()
+    crashed = len(crashed_tests)
+    if timing_db is not None:
+        timing_db.flush()
+
+    if shared_library not in globals.session_libraries:
+        globals.target_libraries[shared_library].sol_compat_fini()
+
+    print(f"Total test cases: {passed + failed + skipped + crashed}")
+    print(f"Passed: {passed}, Failed: {failed}, Skipped: {skipped}, Crashed: {crashed}")
+    report_legacy_format_detections()
+    report_parse_stats()
+    schedule.report()
+    if timing_db is not None:
+        report_regressions(timing_db, target_builds.values())
+        timing_db.close()
     if failed != 0:
         print(f"Failed tests: {failed_tests}")
     if skipped != 0:
         print(f"Skipped tests: {skipped_tests}")
+    if crashed != 0:
+        print(f"Crashed tests: {crashed_tests}")
 
-    return (failed == 0) and (skipped == 0) and (passed > 0)
+    return (failed == 0) and (skipped == 0) and (crashed == 0) and (passed > 0)
 
 
 @app.command(
@@ -0,0 +1,479 @@
+"""
+Persistent per-fixture, per-target timing database.
+
+run-tests and exec-fixtures record the wall time of every harness call,
+per fixture and per target build, in a SQLite database that persists across
+runs. The database is used to:
+- order later runs longest job first (see scheduling.HarnessSchedule),
+- report the slowest fixtures of a target build,
+- find fixtures that got slower between two builds of the same target.
+
+Targets are identified by name (the .so file stem) and build (see
+util.target_build_id), fixtures by name (the file stem, as in the result
+logs). Each (fixture, build) row keeps the latest and the best time seen;
+comparisons use the best time, which is the least noisy.
+
+Recording is best effort: runs open the database with open_timing_db(), and
+if it cannot be opened or written (read-only or missing home directory,
+database locked by a concurrent run, ...) they warn and carry on without
+recording times.
+
+Example:
+    >>> with TimingDB(default_timing_db_path()) as db:
+    ...     build = TargetBuild.of(Path("libfd_exec_sol_compat.so"))
+    ...     for timing in db.slowest(build, 10):
+    ...         print(timing.fixture, timing.best_seconds)
+"""
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from test_suite.scheduling import HarnessSchedule, RuntimeHistory
+from test_suite.util import target_build_id
+
+# Bump when the schema or the meaning of a column changes
+TIMING_DB_VERSION = 1
+
+# A fixture counts as a regression if its best time grew by this factor...
+DEFAULT_REGRESSION_THRESHOLD = 2.0
+# ...and by at least this many seconds, so that timer noise on fast
+# fixtures is not reported
+DEFAULT_REGRESSION_MIN_SECONDS = 0.001
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    target TEXT NOT NULL,
+    build TEXT NOT NULL,
+    first_seen INTEGER NOT NULL,
+    UNIQUE (target, build)
+);
+CREATE TABLE IF NOT EXISTS fixtures (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    harness TEXT,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    fixture INTEGER NOT NULL,
+    build INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    best_seconds REAL NOT NULL,
+    runs INTEGER NOT NULL,
+    updated INTEGER NOT NULL,
+    PRIMARY KEY (fixture, build)
+) WITHOUT ROWID;
+"""
+
+
+def default_timing_db_path() -> Path:
+    """Location of the timing database, in the user cache directory."""
+    cache_dir = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_dir / "solana-conformance" / "timings.sqlite"
+
+
+@dataclass(frozen=True)
+class TargetBuild:
+    """
+    A build of a target.
+
+    Attributes:
+        target: Target name (stem of the shared library)
+        build: Build identifier (see util.target_build_id)
+    """
+
+    target: str
+    build: str
+
+    @classmethod
+    def of(cls, library: Path) -> "TargetBuild":
+        return cls(library.stem, target_build_id(library))
+
+    def __str__(self) -> str:
+        return f"{self.target} ({self.build[:24]})"
+
+
+@dataclass(frozen=True)
+class FixtureTiming:
+    """
+    Recorded harness call time of a fixture on a target build.
+
+    Attributes:
+        fixture: Fixture name
+        harness: Harness of the fixture, or None if unknown
+        seconds: Time of the latest run
+        best_seconds: Best time over all runs
+        runs: Number of runs
+    """
+
+    fixture: str
+    harness: str | None
+    seconds: float
+    best_seconds: float
+    runs: int
+
+
+@dataclass(frozen=True)
+class TimingRegression:
+    """
+    A fixture that got slower between two builds of a target.
+
+    Attributes:
+        fixture: Fixture name
+        harness: Harness of the fixture, or None if unknown
+        baseline_seconds: Best time on the baseline build
+        seconds: Best time on the new build
+    """
+
+    fixture: str
+    harness: str | None
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / max(self.baseline_seconds, 1e-9)
+
+
+def _warn(db_path: Path, error: Exception):
+    print(f"Warning: Not recording fixture timings in {db_path}: {error}")
+
+
+class TimingDB:
+    """
+    SQLite-backed store of harness call times.
+
+    Times passed to record() are buffered and written by flush() in a single
+    transaction. If a write fails, flush() warns and recording stops for the
+    rest of the run.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or int(row[0]) != TIMING_DB_VERSION:
+            # Stale layout: start over
+            with self.conn:
+                for table in ("timings", "fixtures", "builds"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (str(TIMING_DB_VERSION),),
+                )
+        self._pending = []
+        self._build_ids = {}
+        self._failed = False
+
+    def record(
+        self,
+        fixture: str,
+        harness: str | None,
+        size: int,
+        seconds: dict[TargetBuild, float],
+    ):
+        """
+        Record the harness call time of one fixture on each target build.
+
+        Args:
+            fixture: Fixture name
+            harness: Harness of the fixture
+            size: Fixture size in bytes
+            seconds: Harness call time on each target build
+        """
+        if self._failed:
+            return
+        for build, build_seconds in seconds.items():
+            self._pending.append((fixture, harness, size, build, build_seconds))
+
+    def _build_id(self, build: TargetBuild) -> int:
+        build_id = self._build_ids.get(build)
+        if build_id is None:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO builds (target, build, first_seen) "
+                "VALUES (?, ?, ?)",
+                (build.target, build.build, time.time_ns()),
+            )
+            (build_id,) = self.conn.execute(
+                "SELECT id FROM builds WHERE target = ? AND build = ?",
+                (build.target, build.build),
+            ).fetchone()
+            self._build_ids[build] = build_id
+        return build_id
+
+    def flush(self):
+        """Write the recorded times."""
+        if not self._pending:
+            return
+        try:
+            self._write_pending()
+        except sqlite3.Error as e:
+            _warn(self.db_path, e)
+            self._failed = True
+            self._build_ids.clear()
+        self._pending.clear()
+
+    def _write_pending(self):
+        now = time.time_ns()
+        with self.conn:
+            fixtures = {}
+            for fixture, harness, size, _, _ in self._pending:
+                fixtures[fixture] = (harness, size)
+            self.conn.executemany(
+                "INSERT INTO fixtures (name, harness, size) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE "
+                "SET harness = excluded.harness, size = excluded.size",
+                ((name, *info) for name, info in fixtures.items()),
+            )
+            build_ids = {
+                build: self._build_id(build) for _, _, _, build, _ in self._pending
+            }
+            self.conn.executemany(
+                "INSERT INTO timings "
+                "SELECT id, ?, ?, ?, 1, ? FROM fixtures WHERE name = ? "
+                "ON CONFLICT (fixture, build) DO UPDATE "
+                "SET seconds = excluded.seconds, "
+                "best_seconds = MIN(best_seconds, excluded.seconds), "
+                "runs = runs + 1, updated = excluded.updated",
+                (
+                    (build_ids[build], seconds, seconds, now, fixture)
+                    for fixture, _, _, build, seconds in self._pending
+                ),
+            )
+
+    def builds(self, target: str | None = None) -> list[TargetBuild]:
+        """Known builds (of one target, if given), oldest first."""
+        query = "SELECT target, build FROM builds"
+        params = ()
+        if target is not None:
+            query += " WHERE target = ?"
+            params = (target,)
+        rows = self.conn.execute(query + " ORDER BY first_seen, id", params)
+        return [TargetBuild(*row) for row in rows]
+
+    def find_build(self, spec: str) -> TargetBuild | None:
+        """
+        Resolve a build from a shared library path, a target name (latest
+        build of that target) or a build identifier prefix.
+        """
+        if Path(spec).is_file():
+            return TargetBuild.of(Path(spec))
+        builds = self.builds()
+        by_target = [build for build in builds if build.target == spec]
+        if by_target:
+            return by_target[-1]
+        by_build = [build for build in builds if build.build.startswith(spec)]
+        return by_build[-1] if by_build else None
+
+    def previous_build(self, build: TargetBuild) -> TargetBuild | None:
+        """The build of the same target recorded before build, if any."""
+        builds = self.builds(build.target)
+        if build in builds:
+            builds = builds[: builds.index(build)]
+        return builds[-1] if builds else None
+
+    def timings(self, build: TargetBuild) -> dict[str, FixtureTiming]:
+        """All recorded fixture times of a build, by fixture name."""
+        rows = self.conn.execute(
+            "SELECT f.name, f.harness, t.seconds, t.best_seconds, t.runs "
+            "FROM timings t "
+            "JOIN fixtures f ON f.id = t.fixture "
+            "JOIN builds b ON b.id = t.build "
+            "WHERE b.target = ? AND b.build = ?",
+            (build.target, build.build),
+        )
+        return {row[0]: FixtureTiming(*row) for row in rows}
+
+    def slowest(self, build: TargetBuild, n: int) -> list[FixtureTiming]:
+        """The n fixtures with the highest best time on a build."""
+        timings = self.timings(build).values()
+        return sorted(timings, key=lambda timing: -timing.best_seconds)[:n]
+
+    def regressions(
+        self,
+        baseline: TargetBuild,
+        build: TargetBuild,
+        threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+        min_seconds: float = DEFAULT_REGRESSION_MIN_SECONDS,
+    ) -> list[TimingRegression]:
+        """
+        Fixtures whose best time grew by more than threshold times (and by at
+        least min_seconds) from baseline to build, worst first.
+        """
+        baseline_timings = self.timings(baseline)
+        regressions = []
+        for name, timing in self.timings(build).items():
+            base = baseline_timings.get(name)
+            if base is None:
+                continue
+            slowdown = timing.best_seconds - base.best_seconds
+            if (
+                timing.best_seconds > base.best_seconds * threshold
+                and slowdown >= min_seconds
+            ):
+                regressions.append(
+                    TimingRegression(
+                        name, timing.harness, base.best_seconds, timing.best_seconds
+                    )
+                )
+        return sorted(regressions, key=lambda regression: -regression.ratio)
+
+    def history(self, builds: Iterable[TargetBuild]) -> RuntimeHistory:
+        """
+        Expected run time of each fixture on a set of target builds, for
+        longest-job-first scheduling.
+
+        The time of a fixture is the sum over the targets of its time on the
+        given build, or on the most recently run build of the same target if
+        it never ran on the given one.
+        """
+        builds = list(builds)
+        current = {build.target: build.build for build in builds}
+        if not current:
+            return RuntimeHistory()
+        placeholders = ", ".join("?" * len(current))
+        try:
+            rows = self.conn.execute(
+                "SELECT f.name, f.harness, f.size, b.target, b.build, t.seconds "
+                "FROM timings t "
+                "JOIN fixtures f ON f.id = t.fixture "
+                "JOIN builds b ON b.id = t.build "
+                f"WHERE b.target IN ({placeholders}) "
+                "ORDER BY t.updated",
+                tuple(current),
+            ).fetchall()
+        except sqlite3.Error as e:
+            # Schedule by input size instead
+            print(f"Warning: Could not read fixture timings from {self.db_path}: {e}")
+            return RuntimeHistory()
+        fixtures = {}
+        per_target = {}
+        for name, harness, size, target, build, seconds in rows:
+            fixtures[name] = (harness, size)
+            key = (name, target)
+            # Rows come oldest first; a later row replaces an earlier one
+            # unless the earlier one is from the current build
+            if key not in per_target or build == current[target]:
+                per_target[key] = (build == current[target], seconds)
+            elif not per_target[key][0]:
+                per_target[key] = (False, seconds)
+
+        totals = {}
+        for (name, _), (_, seconds) in per_target.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+        history = RuntimeHistory()
+        for name, seconds in totals.items():
+            harness, size = fixtures[name]
+            history.add(name, harness, size, seconds)
+        return history
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_timing_db(db_path: Path) -> TimingDB | None:
+    """
+    Open the timing database of a run.
+
+    Args:
+        db_path: Database file, created if missing
+
+    Returns:
+        The database, or None (after a warning) if it cannot be opened
+    """
+    try:
+        return TimingDB(db_path)
+    except (sqlite3.Error, OSError) as e:
+        _warn(db_path, e)
+        return None
+
+
+class TimingRecorder:
+    """
+    Result callback for run_timed() results (see multiprocessing_utils).
+
+    Records the harness call times of each test in a TimingDB, if given, adds
+    its pipeline stage times to the schedule, and passes the test result on
+    to result_callback.
+    """
+
+    def __init__(
+        self,
+        db: TimingDB | None,
+        schedule: HarnessSchedule,
+        builds: dict[Path, TargetBuild],
+        result_callback: Callable[[tuple], None],
+    ):
+        self.db = db
+        self.schedule = schedule
+        self.builds = builds
+        self.result_callback = result_callback
+
+    def add(
+        self, timed_result: tuple[Path, tuple, dict[Path, float], dict[str, float]]
+    ) -> tuple:
+        """Record a run_timed() result and return the test result."""
+        test_file, result, harness_seconds, stage_seconds = timed_result
+        self.schedule.record_stages(test_file, stage_seconds)
+        if self.db is not None and harness_seconds:
+            self.db.record(
+                test_file.stem,
+                self.schedule.harness_of(test_file),
+                self.schedule.size_of(test_file),
+                {
+                    self.builds[target]: seconds
+                    for target, seconds in harness_seconds.items()
+                    if target in self.builds
+                },
+            )
+        self.result_callback(result)
+        return result
+
+
+def report_regressions(
+    db: TimingDB,
+    builds: Iterable[TargetBuild],
+    limit: int = 5,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+):
+    """Print the worst regressions of each build against the previous build."""
+    for build in builds:
+        try:
+            baseline = db.previous_build(build)
+            if baseline is None:
+                continue
+            regressions = db.regressions(baseline, build, threshold)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read fixture timings from {db.db_path}: {e}")
+            return
+        if not regressions:
+            continue
+        print(
+            f"Timing regressions of {build} vs {baseline}: "
+            f"{len(regressions)} fixtures over {threshold}x"
+        )
+        for regression in regressions[:limit]:
+            print(
+                f"  {regression.fixture}: {regression.baseline_seconds:.4f}s -> "
+                f"{regression.seconds:.4f}s ({regression.ratio:.1f}x)"
+            )
+        if len(regressions) > limit:
+            print(f"  ... see timing-report for all {len(regressions)}")
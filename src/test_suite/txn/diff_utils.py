@@ -1,26 +1,16 @@
 import test_suite.protos.txn_pb2 as txn_pb
+from test_suite.diff_utils import EffectsDiff
 
 
-def consensus_txn_diff_effects(a: txn_pb.TxnResult, b: txn_pb.TxnResult):
-    a_san = txn_pb.TxnResult()
-    a_san.CopyFrom(a)
-    b_san = txn_pb.TxnResult()
-    b_san.CopyFrom(b)
+def _failed_txn_units(a: txn_pb.TxnResult, b: txn_pb.TxnResult):
+    # Don't compare compute units if both txns were executed and fail
+    if a.executed and b.executed and a.status and b.status:
+        return ("executed_units",)
+    return ()
 
-    # Don't compare transaction statuses and compute units if both txns were executed and fail
-    if a_san.executed and b_san.executed and a_san.status and b_san.status:
-        a_san.executed_units = 0
-        b_san.executed_units = 0
 
-    # Don't compare error codes
-    a_san.status = 0
-    a_san.instruction_error = 0
-    a_san.instruction_error_index = 0
-    a_san.custom_error = 0
-
-    b_san.status = 0
-    b_san.instruction_error = 0
-    b_san.instruction_error_index = 0
-    b_san.custom_error = 0
-
-    return a_san == b_san
+# Don't compare error codes
+consensus_txn_diff_effects = EffectsDiff(
+    ignore=("status", "instruction_error", "instruction_error_index", "custom_error"),
+    ignore_fn=_failed_txn_units,
+)
@@ -1,52 +1,41 @@
-from test_suite.fuzz_interface import ContextType
-import test_suite.protos.txn_pb2 as txn_pb
-import test_suite.protos.context_pb2 as context_pb
-from test_suite.validation_utils import check_account_unchanged
+from test_suite.fuzz_interface import ContextType, TargetEffects
+from test_suite.validation_utils import AccountIndex
 
 
 def prune_execution_result(
     context: ContextType | None,
-    targets_to_serialized_effects: dict[str, str | None],
-) -> dict[str, str | None] | None:
+    targets_to_effects: dict[str, TargetEffects | None],
+) -> dict[str, TargetEffects | None] | None:
     """
     Prune execution result to only include actually modified accounts.
 
+    Input accounts are indexed by address once, so pruning is linear in the
+    number of accounts. Effects are pruned in place; effects that have nothing
+    to prune keep their serialization.
+
     Args:
-        - serialized_context (str | None): Serialized context.
-        - targets_to_serialized_effects (dict[str, str | None]): Dictionary of target library names and serialized effects.
+        - context (ContextType | None): Transaction context.
+        - targets_to_effects (dict[str, TargetEffects | None]): Dictionary of target library names and transaction results.
 
     Returns:
-        - dict[str, str | None] | None: Serialized pruned effects for each target.
+        - dict[str, TargetEffects | None] | None: Pruned transaction results for each target.
     """
-    targets_to_serialized_pruned_instruction_effects = {}
-    for (
-        target,
-        serialized_instruction_effects,
-    ) in targets_to_serialized_effects.items():
-        if serialized_instruction_effects is None:
-            targets_to_serialized_pruned_instruction_effects[target] = None
-            continue
-
-        instruction_effects = txn_pb.TxnResult()
-        instruction_effects.ParseFromString(serialized_instruction_effects)
+    if context is None:
+        return None
 
-        # O(n^2) because not performance sensitive
-        new_modified_accounts: list[context_pb.AcctState] = []
-        for modified_account in instruction_effects.resulting_state.acct_states:
-            account_unchanged = False
-            for beginning_account_state in context.tx.message.account_shared_data:
-                account_unchanged |= check_account_unchanged(
-                    modified_account, beginning_account_state
-                )
+    input_accounts = AccountIndex(context.account_shared_data)
+    for txn_result in targets_to_effects.values():
+        if txn_result is None:
+            continue
 
-            if not account_unchanged:
-                new_modified_accounts.append(modified_account)
+        modified_accounts = txn_result.message.modified_accounts
+        new_modified_accounts = input_accounts.changed(modified_accounts)
+        if len(new_modified_accounts) == len(modified_accounts):
+            continue
 
         # Assign new modified accounts
-        del instruction_effects.resulting_state.acct_states[:]
-        instruction_effects.resulting_state.acct_states.extend(new_modified_accounts)
-        targets_to_serialized_pruned_instruction_effects[target] = (
-            instruction_effects.SerializeToString(deterministic=True)
-        )
+        del modified_accounts[:]
+        modified_accounts.extend(new_modified_accounts)
+        txn_result.modified()
 
-    return targets_to_serialized_pruned_instruction_effects
+    return targets_to_effects
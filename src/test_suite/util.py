@@ -1,13 +1,28 @@
+import collections
+import ctypes
+import functools
 import hashlib
+import itertools
+import mmap
+import multiprocessing
 import os
+import struct
 import subprocess
 import sys
+import tempfile
 import time
+import contextlib
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, Dict, Callable, List, Any
 import httpx
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
 from concurrent.futures.process import BrokenProcessPool
 import test_suite.globals as globals
 import tqdm
@@ -113,6 +128,422 @@ def run_fuzz_command(
         return None
 
 
+# Identifier of the WorkerPool phase whose initializer last ran in this worker
+_worker_phase_id = None
+
+# Source of unique WorkerPool phase identifiers
+_phase_ids = itertools.count()
+
+
+def _run_phase_item(
+    phase_id, restore_fn, state, initializer, initargs, process_func, item
+):
+    """
+    Run process_func(item) in a WorkerPool worker, first applying the phase
+    state and initializer if this worker has not seen the phase yet.
+    """
+    global _worker_phase_id
+    if _worker_phase_id != phase_id:
+        if restore_fn is not None:
+            restore_fn(state)
+        if initializer is not None:
+            initializer(*initargs)
+        _worker_phase_id = phase_id
+    return process_func(item)
+
+
+class WorkerPool:
+    """
+    Long-lived process pool shared by several process_items() phases.
+
+    Workers are forked on first use, so anything loaded in the parent before
+    then (e.g. target shared libraries) is inherited by every worker and stays
+    loaded for the life of the pool. Each phase's initializer runs lazily in a
+    worker before its first item of that phase, which lets different commands
+    (fixture creation, run-tests, exec-fixtures) submit jobs to the same pool.
+
+    Args:
+        num_processes: Number of worker processes
+        snapshot_fn: Optional callable returning picklable parent state that
+            is shipped with every phase (e.g. a snapshot of test_suite.globals)
+        restore_fn: Optional callable applying that state in a worker
+    """
+
+    def __init__(
+        self,
+        num_processes: int,
+        snapshot_fn: Optional[Callable[[], Any]] = None,
+        restore_fn: Optional[Callable[[Any], None]] = None,
+    ):
+        self.num_processes = max(1, num_processes)
+        self.snapshot_fn = snapshot_fn
+        self.restore_fn = restore_fn
+        self._executor = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_processes)
+        return self._executor
+
+    def phase_task(
+        self,
+        process_func: Callable,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+    ) -> Callable:
+        """
+        Wrap process_func for a new phase so workers run the phase's
+        initializer (and restore parent state) before their first item.
+        """
+        state = self.snapshot_fn() if self.snapshot_fn is not None else None
+        return functools.partial(
+            _run_phase_item,
+            (os.getpid(), next(_phase_ids)),
+            self.restore_fn,
+            state,
+            initializer,
+            initargs,
+            process_func,
+        )
+
+    def reset(self):
+        """Discard the current workers; the next phase forks fresh ones."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+
+class SharedCounters:
+    """
+    Named counters that forked worker processes add to.
+
+    The values live in shared memory, so increments made in workers forked
+    after construction (e.g. WorkerPool workers) are visible in the parent.
+    Create instances at module import time, before any pool is started.
+
+    Args:
+        names: Names of the counters
+    """
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._values = multiprocessing.Array(ctypes.c_uint64, len(self.names))
+
+    def add(self, name: str, amount: int = 1):
+        with self._values.get_lock():
+            self._values[self._index[name]] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Current values.
+
+        Read without taking the lock, so that a worker which died while
+        holding it cannot block the caller.
+        """
+        return dict(zip(self.names, self._values.get_obj()))
+
+    def reset(self):
+        with self._values.get_lock():
+            for i in range(len(self.names)):
+                self._values[i] = 0
+
+
+# Adaptive chunking for process pools: aim for chunks that keep a worker busy
+# for about CHUNK_TARGET_SECONDS, capped at MAX_CHUNK_SIZE items
+CHUNK_TARGET_SECONDS = 0.2
+MAX_CHUNK_SIZE = 512
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+# Per-item progress markers written by workers into the phase progress file
+ITEM_PENDING = 0
+ITEM_STARTED = 1
+ITEM_DONE = 2
+
+# Give up if workers keep dying without any item in progress
+MAX_CRASHES_WITHOUT_SUSPECT = 3
+
+# Progress file mapped by this worker (path, mmap)
+_worker_progress = (None, None)
+
+
+def _progress_map(progress_path: Optional[str]):
+    """Map the phase progress file in a worker, replacing any previous one."""
+    global _worker_progress
+    if progress_path is None:
+        return None
+    path, progress = _worker_progress
+    if path != progress_path:
+        if progress is not None:
+            progress.close()
+        with open(progress_path, "r+b") as f:
+            progress = mmap.mmap(f.fileno(), 0)
+        _worker_progress = (progress_path, progress)
+    return progress
+
+
+def _run_chunk(
+    process_func: Callable,
+    chunk: List[tuple[int, Any]],
+    progress_path: Optional[str] = None,
+) -> tuple[List[Any], List[float]]:
+    """
+    Run process_func over a chunk of (index, item) pairs in a worker and time
+    each item. Each item is marked started/done in the progress file, so the
+    parent can tell which item a worker was running if it dies.
+    """
+    progress = _progress_map(progress_path)
+    results = []
+    elapsed = []
+    for index, item in chunk:
+        if progress is not None:
+            progress[index] = ITEM_STARTED
+        start = time.perf_counter()
+        results.append(process_func(item))
+        elapsed.append(time.perf_counter() - start)
+        if progress is not None:
+            progress[index] = ITEM_DONE
+    return results, elapsed
+
+
+class ChunkSizer:
+    """
+    Picks chunk sizes for process_items from the observed per-item latency.
+
+    Starts with single items, then sizes chunks so each takes about
+    target_seconds in a worker. Chunks also shrink towards the end of the
+    run so the tail is still spread across all workers.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        target_seconds: float = CHUNK_TARGET_SECONDS,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+    ):
+        self.num_workers = max(1, num_workers)
+        self.target_seconds = target_seconds
+        self.max_chunk_size = max_chunk_size
+        self.seconds_per_item = None
+
+    def observe(self, num_items: int, elapsed: float):
+        if num_items == 0:
+            return
+        sample = elapsed / num_items
+        if self.seconds_per_item is None:
+            self.seconds_per_item = sample
+        else:
+            # Exponential moving average, so a few slow chunks don't dominate
+            self.seconds_per_item = 0.7 * self.seconds_per_item + 0.3 * sample
+
+    def next_size(self, remaining: int) -> int:
+        if self.seconds_per_item is None:
+            return 1
+        size = int(self.target_seconds / max(self.seconds_per_item, 1e-6))
+        size = min(size, self.max_chunk_size, remaining // (self.num_workers * 4))
+        return max(1, size)
+
+
+def _timed(process_func: Callable, item: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = process_func(item)
+    return result, time.perf_counter() - start
+
+
+def _run_isolated(task: Callable, index: int, item: Any, progress_path: str):
+    """
+    Re-run a single item in a fresh one-worker executor.
+
+    Returns (True, result, elapsed), or (False, None, None) if the worker died
+    again.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            future = executor.submit(_run_chunk, task, [(index, item)], progress_path)
+            results, elapsed = future.result()
+        except BrokenProcessPool:
+            return False, None, None
+    return True, results[0], elapsed[0]
+
+
+def _process_chunks(
+    pool: WorkerPool,
+    task: Callable,
+    items: List[Any],
+    pbar,
+    emit: Callable[[Any], None],
+    crash_result_fn: Optional[Callable[[Any], Any]] = None,
+    timing_callback: Optional[Callable[[Any, float], None]] = None,
+    batch_key: Optional[Callable[[Any], Any]] = None,
+):
+    """
+    Submit items to a process pool in adaptively sized chunks, keeping a
+    bounded number of chunks in flight, and pass each per-item result to emit
+    as its chunk completes.
+
+    If batch_key is given, a chunk never mixes items with different keys, so
+    each worker runs homogeneous batches of an ordered item list.
+
+    If crash_result_fn is given, a worker dying (segfault, abort, ASAN) does
+    not end the run. The items its chunk had not finished are requeued on a
+    respawned pool. Each item that was mid-execution is re-run on its own.
+    If it kills that worker too, crash_result_fn(item) becomes its result.
+    Without crash_result_fn, BrokenProcessPool propagates.
+    """
+    if not items:
+        return
+
+    sizer = ChunkSizer(pool.num_processes)
+    max_in_flight = pool.num_processes * CHUNKS_IN_FLIGHT_PER_WORKER
+    in_flight = {}
+    pending = collections.deque(range(len(items)))
+    crashes_without_suspect = 0
+
+    with tempfile.NamedTemporaryFile(prefix="solana-conformance-progress-") as f:
+        f.truncate(len(items))
+        f.flush()
+        progress = mmap.mmap(f.fileno(), 0)
+
+        def next_chunk():
+            size = min(sizer.next_size(len(pending)), len(pending))
+            if batch_key is None:
+                return [(i, items[i]) for i in (pending.popleft() for _ in range(size))]
+            key = batch_key(items[pending[0]])
+            chunk = []
+            while pending and len(chunk) < size:
+                if chunk and batch_key(items[pending[0]]) != key:
+                    break
+                i = pending.popleft()
+                chunk.append((i, items[i]))
+            return chunk
+
+        def submit_chunks():
+            while pending and len(in_flight) < max_in_flight:
+                chunk = next_chunk()
+                try:
+                    future = pool.executor.submit(_run_chunk, task, chunk, f.name)
+                except BrokenProcessPool:
+                    # A worker died since the last completion; requeue the
+                    # chunk so recover() does not lose it
+                    pending.extendleft(index for index, _ in reversed(chunk))
+                    raise
+                in_flight[future] = chunk
+
+        def collect(future, chunk):
+            chunk_results, elapsed = future.result()
+            sizer.observe(len(chunk_results), sum(elapsed))
+            if timing_callback is not None:
+                for (_, item), seconds in zip(chunk, elapsed):
+                    timing_callback(item, seconds)
+            for result in chunk_results:
+                emit(result)
+            pbar.update(len(chunk_results))
+
+        def recover():
+            nonlocal crashes_without_suspect
+
+            # Every in-flight future fails once the pool is broken; keep the
+            # results of chunks that finished before the crash
+            wait(in_flight)
+            suspects = []
+            for future, chunk in in_flight.items():
+                if future.exception() is None:
+                    collect(future, chunk)
+                    continue
+                if not isinstance(future.exception(), BrokenProcessPool):
+                    raise future.exception()
+                for index, item in chunk:
+                    if progress[index] == ITEM_STARTED:
+                        suspects.append((index, item))
+                    else:
+                        pending.appendleft(index)
+            in_flight.clear()
+            pool.reset()
+
+            # A worker that dies outside of any item (e.g. in its initializer)
+            # would otherwise be respawned forever
+            crashes_without_suspect = 0 if suspects else crashes_without_suspect + 1
+            if crashes_without_suspect >= MAX_CRASHES_WITHOUT_SUSPECT:
+                raise BrokenProcessPool(
+                    "Worker processes repeatedly died outside of item execution"
+                )
+
+            for index, item in suspects:
+                ok, result, seconds = _run_isolated(task, index, item, f.name)
+                if not ok:
+                    print(f"\n[WARNING] Worker crashed while processing {item}")
+                    result = crash_result_fn(item)
+                elif timing_callback is not None:
+                    timing_callback(item, seconds)
+                emit(result)
+                pbar.update(1)
+
+        try:
+            while pending or in_flight:
+                try:
+                    # The pool can break while submitting, not just while
+                    # waiting on results
+                    submit_chunks()
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future, in_flight[future])
+                        del in_flight[future]
+                except BrokenProcessPool:
+                    if crash_result_fn is None:
+                        raise
+                    recover()
+        finally:
+            progress.close()
+
+
+def order_by_cost(
+    items: List[Any],
+    cost_fn: Callable[[Any], float],
+    batch_key: Optional[Callable[[Any], Any]] = None,
+) -> List[Any]:
+    """
+    Order items longest job first, so the most expensive items do not end up
+    as stragglers at the end of a run.
+
+    Args:
+        items: Items to order
+        cost_fn: Estimated cost of an item (any unit, as long as it is the same
+            for all items)
+        batch_key: If set, items with the same key stay together. Batches are
+            ordered by their most expensive item.
+
+    Returns:
+        Items by decreasing cost (within each batch)
+    """
+    costs = [cost_fn(item) for item in items]
+    if batch_key is None:
+        order = sorted(range(len(items)), key=lambda i: -costs[i])
+    else:
+        keys = [batch_key(item) for item in items]
+        batch_costs = {}
+        for key, cost in zip(keys, costs):
+            batch_costs[key] = max(batch_costs.get(key, cost), cost)
+        rank = {
+            key: r
+            for r, key in enumerate(sorted(batch_costs, key=lambda k: -batch_costs[k]))
+        }
+        order = sorted(range(len(items)), key=lambda i: (rank[keys[i]], -costs[i]))
+    return [items[i] for i in order]
+
+
 def process_items(
     items: List[Any],
     process_func: Callable,
@@ -124,8 +555,49 @@ def process_items(
     use_processes: bool = False,
     unit: str = "item",
     shared_progress_bar: Optional[tqdm.tqdm] = None,
+    pool: Optional[WorkerPool] = None,
+    crash_result_fn: Optional[Callable[[Any], Any]] = None,
+    result_callback: Optional[Callable[[Any], None]] = None,
+    timing_callback: Optional[Callable[[Any, float], None]] = None,
+    batch_key: Optional[Callable[[Any], Any]] = None,
+    cost_fn: Optional[Callable[[Any], float]] = None,
 ) -> List[Any]:
+    """
+    Run process_func over items, in worker processes/threads or inline.
+
+    Args:
+        items: Items to process
+        process_func: Function applied to each item
+        num_processes: Number of workers
+        debug_mode: Run everything in the main process
+        initializer: Called (with initargs) in each worker before its first item
+        initargs: Arguments for initializer
+        desc: Progress bar description
+        use_processes: Use worker processes instead of threads
+        unit: Progress bar unit
+        shared_progress_bar: Existing progress bar to advance instead of a new one
+        pool: Long-lived WorkerPool to run on instead of a fresh process pool
+        crash_result_fn: If set, an item whose worker process dies is recorded
+            as crash_result_fn(item) and the run continues on respawned
+            workers, instead of raising BrokenProcessPool
+        result_callback: If set, each result is handed to it as soon as it is
+            available instead of being collected, so memory use does not grow
+            with the number of items
+        timing_callback: If set, called as timing_callback(item, seconds) with
+            the time process_func took on each item that did not crash
+        batch_key: If set (process pools only), chunks of consecutive items
+            are cut where batch_key(item) changes, so items keep their order
+            and each worker runs homogeneous batches
+        cost_fn: If set, items are queued longest job first by this estimate
+            of their cost (see order_by_cost), instead of in the given order
+
+    Returns:
+        Per-item results, in completion order (empty if result_callback is set)
+    """
+    if cost_fn is not None:
+        items = order_by_cost(items, cost_fn, batch_key)
     results = []
+    emit = result_callback or results.append
     if debug_mode:
         num_processes = 1
 
@@ -135,30 +607,51 @@ def process_items(
     # In debug mode, always run single-threaded in main process (no executor)
     if not debug_mode and (effective_num_processes > 1 or use_processes):
         if use_processes:
-            executor = ProcessPoolExecutor(
-                max_workers=effective_num_processes,
-                initializer=initializer,
-                initargs=initargs,
+            # Reuse the long-lived pool if given, otherwise a pool for this
+            # phase only
+            phase_pool = pool or WorkerPool(effective_num_processes)
+            executor = (
+                contextlib.nullcontext(phase_pool) if pool is not None else phase_pool
             )
+            task = phase_pool.phase_task(process_func, initializer, initargs)
         else:
             executor = ThreadPoolExecutor(max_workers=effective_num_processes)
+            task = process_func
             if initializer:
                 initializer(*initargs)
         try:
-            with executor:
-                future_to_item = {
-                    executor.submit(process_func, item): item for item in items
-                }
-
+            with executor as executor:
                 # Use shared progress bar if provided, otherwise create a new one
                 with _progress_bar_context(
                     shared_progress_bar, len(items), desc, unit
                 ) as pbar:
-                    for future in as_completed(future_to_item):
-                        result = future.result()
-                        results.append(result)
-                        pbar.update(1)
+                    if use_processes:
+                        _process_chunks(
+                            phase_pool,
+                            task,
+                            items,
+                            pbar,
+                            emit,
+                            crash_result_fn,
+                            timing_callback,
+                            batch_key,
+                        )
+                    else:
+                        future_to_item = {
+                            executor.submit(_timed, task, item): item for item in items
+                        }
+                        for future in as_completed(future_to_item):
+                            result, seconds = future.result()
+                            # Drop the finished future so its result is not
+                            # kept alive until the whole phase completes
+                            item = future_to_item.pop(future)
+                            if timing_callback is not None:
+                                timing_callback(item, seconds)
+                            emit(result)
+                            pbar.update(1)
         except BrokenProcessPool as e:
+            if use_processes:
+                phase_pool.reset()
             # This usually means the child process running the harness/shared library
             # crashed (e.g. SIGSEGV, abort, ASAN), not that the Python code itself
             # failed in a normal way. Give the user a clearer, domain-specific hint
@@ -192,8 +685,10 @@ def process_items(
         # Use shared progress bar if provided, otherwise create a new one
         with _progress_bar_context(shared_progress_bar, len(items), desc, unit) as pbar:
             for item in items:
-                result = process_func(item)
-                results.append(result)
+                result, seconds = _timed(process_func, item)
+                if timing_callback is not None:
+                    timing_callback(item, seconds)
+                emit(result)
                 pbar.update(1)
     return results
 
@@ -222,6 +717,67 @@ def deduplicate_fixtures_by_hash(directory: Path) -> int:
     return num_duplicates
 
 
+# ELF64 program header type and note type of the GNU build ID
+_PT_NOTE = 4
+_NT_GNU_BUILD_ID = 3
+
+
+def _elf_gnu_build_id(f) -> Optional[bytes]:
+    """GNU build ID note of a little-endian ELF64 file, or None."""
+    header = f.read(64)
+    if len(header) < 64 or header[:4] != b"\x7fELF" or header[4:6] != b"\x02\x01":
+        return None
+    (phoff,) = struct.unpack_from("<Q", header, 0x20)
+    phentsize, phnum = struct.unpack_from("<HH", header, 0x36)
+    f.seek(phoff)
+    phdrs = f.read(phentsize * phnum)
+    for i in range(phnum):
+        if (i + 1) * phentsize > len(phdrs):
+            break
+        p_type, _, p_offset, _, _, p_filesz = struct.unpack_from(
+            "<IIQQQQ", phdrs, i * phentsize
+        )
+        if p_type != _PT_NOTE:
+            continue
+        f.seek(p_offset)
+        notes = f.read(p_filesz)
+        pos = 0
+        while pos + 12 <= len(notes):
+            namesz, descsz, note_type = struct.unpack_from("<III", notes, pos)
+            pos += 12
+            name = notes[pos : pos + namesz]
+            pos += (namesz + 3) & ~3
+            desc = notes[pos : pos + descsz]
+            pos += (descsz + 3) & ~3
+            if note_type == _NT_GNU_BUILD_ID and name == b"GNU\0":
+                return desc
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _target_build_id(path: str, size: int, mtime_ns: int) -> str:
+    with open(path, "rb") as f:
+        build_id = _elf_gnu_build_id(f)
+        if build_id:
+            return "build-id:" + build_id.hex()
+        f.seek(0)
+        return "sha256:" + hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def target_build_id(library: Path) -> str:
+    """
+    Identifier of a build of a target shared library.
+
+    Uses the GNU build ID note of the library if it has one, otherwise the
+    SHA-256 of the file. Cached per path, size and mtime.
+
+    Returns:
+        "build-id:<hex>" or "sha256:<hex>"
+    """
+    stat = os.stat(library)
+    return _target_build_id(str(library), stat.st_size, stat.st_mtime_ns)
+
+
 def set_ld_preload_asan():
     # Run ldconfig -p and capture output
     ldconfig_output = subprocess.check_output(["ldconfig", "-p"], text=True)
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 import test_suite.protos.invoke_pb2 as invoke_pb
 import test_suite.protos.context_pb2 as context_pb
 
@@ -40,6 +42,52 @@ def check_account_unchanged(
         and acc1.lamports == acc2.lamports
         and acc1.data == acc2.data
         and acc1.executable == acc2.executable
-        and acc1.rent_epoch == acc2.rent_epoch
         and acc1.owner == acc2.owner
     )
+
+
+class AccountIndex:
+    """
+    Account states indexed by address.
+
+    Tells which account states are unchanged from an indexed state with the
+    same address (see check_account_unchanged()) with one lookup and one
+    native message comparison per account, instead of a scan over all
+    indexed states comparing one field at a time.
+    """
+
+    def __init__(self, accounts: Iterable[context_pb.AcctState]):
+        self._states: dict[bytes, list[context_pb.AcctState]] = {}
+        for account in accounts:
+            self._states.setdefault(account.address, []).append(account)
+
+    def unchanged(self, account: context_pb.AcctState) -> bool:
+        """
+        Checks whether an account state equals an indexed state.
+
+        Args:
+            - account (context_pb.AcctState): Account state message.
+
+        Returns:
+            - bool: True if an indexed state with the same address is equal, False otherwise.
+        """
+        return account in self._states.get(account.address, ())
+
+    def changed(
+        self, accounts: Iterable[context_pb.AcctState]
+    ) -> list[context_pb.AcctState]:
+        """
+        Filters out account states that equal an indexed state.
+
+        Args:
+            - accounts (Iterable[context_pb.AcctState]): Account state messages.
+
+        Returns:
+            - list[context_pb.AcctState]: Accounts that are new or changed, in order.
+        """
+        states = self._states
+        return [
+            account
+            for account in accounts
+            if account not in states.get(account.address, ())
+        ]
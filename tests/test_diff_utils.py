@@ -0,0 +1,183 @@
+"""
+Unit tests for the structured effects diff.
+"""
+
+from pathlib import Path
+
+import pytest
+
+
+def _account(address: bytes, lamports: int = 1, data: bytes = b"data"):
+    import test_suite.protos.context_pb2 as context_pb
+
+    return context_pb.AcctState(address=address, lamports=lamports, data=data)
+
+
+def _instr_effects(result=0, cu_avail=100, accounts=()):
+    import test_suite.protos.invoke_pb2 as invoke_pb
+
+    return invoke_pb.InstrEffects(
+        result=result, cu_avail=cu_avail, modified_accounts=accounts
+    )
+
+
+class TestEffectsDiff:
+    """Tests for field paths of mismatches and ignore masks."""
+
+    def test_mismatch_paths(self):
+        from test_suite.diff_utils import EffectsDiff
+
+        diff = EffectsDiff()
+        accounts = [_account(bytes([i]) * 32) for i in range(3)]
+        a = _instr_effects(accounts=accounts)
+        b = _instr_effects(accounts=accounts)
+        assert diff(a, b)
+        assert diff.mismatches(a, b) == []
+
+        b.cu_avail = 5
+        b.modified_accounts[1].lamports = 2
+        b.modified_accounts[2].data = b"other"
+        assert not diff(a, b)
+        assert diff.mismatches(a, b) == [
+            "modified_accounts[1].lamports",
+            "modified_accounts[2].data",
+            "cu_avail",
+        ]
+        assert diff.mismatches(a, b, limit=1) == ["modified_accounts[1].lamports"]
+
+        # Lists of different lengths are reported as a whole
+        b.modified_accounts.add()
+        assert diff.mismatches(a, b) == ["modified_accounts", "cu_avail"]
+
+    def test_ignored_fields(self):
+        from test_suite.diff_utils import EffectsDiff
+
+        a = _instr_effects(accounts=[_account(b"a" * 32)])
+        b = _instr_effects(cu_avail=5, accounts=[_account(b"a" * 32, data=b"x")])
+        assert EffectsDiff(ignore=("cu_avail",)).mismatches(a, b) == [
+            "modified_accounts[0].data"
+        ]
+        assert EffectsDiff(ignore=("cu_avail", "modified_accounts.data"))(a, b)
+        assert EffectsDiff(ignore=("modified_accounts", "modified_accounts.data"))(
+            a, _instr_effects(accounts=[])
+        )
+
+    def test_presence(self):
+        import test_suite.protos.txn_pb2 as txn_pb
+        from test_suite.diff_utils import EffectsDiff
+
+        a = txn_pb.TxnResult()
+        b = txn_pb.TxnResult()
+        b.fee_details.SetInParent()
+        assert EffectsDiff().mismatches(a, b) == ["fee_details"]
+        a.fee_details.transaction_fee = 1
+        b.fee_details.transaction_fee = 2
+        assert EffectsDiff().mismatches(a, b) == ["fee_details.transaction_fee"]
+
+    def test_unknown_fields(self):
+        from test_suite.diff_utils import EffectsDiff
+        from test_suite.instr.diff_utils import consensus_instr_diff_effects
+
+        # Field 1023 is not in the schema, e.g. set by a target built
+        # against newer protos
+        unknown = b"\xf8\x3f\x05"
+        a = _instr_effects(accounts=[_account(b"a" * 32)])
+        b = _instr_effects()
+        b.ParseFromString(a.SerializeToString() + unknown)
+        assert a != b
+        assert not EffectsDiff()(a, b)
+        assert EffectsDiff().mismatches(a, b) == ["<unknown fields>"]
+        assert not consensus_instr_diff_effects(a, b)
+
+        # Also in nested messages, and in groups of unknown fields
+        b = _instr_effects(accounts=[_account(b"a" * 32)])
+        b.modified_accounts[0].MergeFromString(unknown)
+        assert EffectsDiff().mismatches(a, b) == [
+            "modified_accounts[0].<unknown fields>"
+        ]
+        a.ParseFromString(a.SerializeToString() + b"\xfb\x3f\x08\x01\xfc\x3f")
+        b.ParseFromString(a.SerializeToString())
+        assert EffectsDiff()(a, b)
+        b.ParseFromString(
+            a.SerializeToString()[: -len(b"\xfb\x3f\x08\x01\xfc\x3f")]
+            + b"\xfb\x3f\x08\x02\xfc\x3f"
+        )
+        assert EffectsDiff().mismatches(a, b) == ["<unknown fields>"]
+
+    def test_messages_are_not_modified(self):
+        from test_suite.instr.diff_utils import core_bpf_instr_diff_effects
+
+        a = _instr_effects(result=1, accounts=[_account(b"a" * 32)])
+        b = _instr_effects(result=2, cu_avail=1)
+        expected = (a.SerializeToString(), b.SerializeToString())
+        assert core_bpf_instr_diff_effects(a, b)
+        assert (a.SerializeToString(), b.SerializeToString()) == expected
+
+
+class TestDiffModes:
+    """Tests for the instr and txn diff modes."""
+
+    @pytest.mark.parametrize(
+        "a_result, b_result, b_accounts, consensus, core_bpf",
+        [
+            (0, 0, True, True, True),
+            (0, 0, False, False, False),
+            (1, 2, False, True, True),
+            # Failed instructions must not report modified accounts
+            (1, 0, True, False, False),
+            (0, 1, False, False, False),
+            (1, 0, False, True, True),
+        ],
+    )
+    def test_instr(self, a_result, b_result, b_accounts, consensus, core_bpf):
+        from test_suite.instr.diff_utils import (
+            consensus_instr_diff_effects,
+            core_bpf_instr_diff_effects,
+            ignore_compute_units_instr_diff_effects,
+        )
+
+        accounts = [_account(b"a" * 32)]
+        a = _instr_effects(
+            result=a_result, cu_avail=1, accounts=accounts if not a_result else []
+        )
+        b = _instr_effects(
+            result=b_result, cu_avail=2, accounts=accounts if b_accounts else []
+        )
+        assert consensus_instr_diff_effects(a, b) == consensus
+        assert core_bpf_instr_diff_effects(a, b) == core_bpf
+        assert ignore_compute_units_instr_diff_effects(a, b) == (
+            a_result == b_result and consensus
+        )
+
+    def test_txn_consensus(self):
+        import test_suite.protos.txn_pb2 as txn_pb
+        from test_suite.txn.diff_utils import consensus_txn_diff_effects
+
+        a = txn_pb.TxnResult(executed=True, status=1, custom_error=1, executed_units=5)
+        b = txn_pb.TxnResult(executed=True, status=2, custom_error=3, executed_units=7)
+        assert consensus_txn_diff_effects(a, b)
+
+        # Compute units are compared unless both transactions failed
+        b.status = 0
+        assert consensus_txn_diff_effects.mismatches(a, b) == ["executed_units"]
+
+
+class TestMismatchReport:
+    """Tests for listing mismatching fields in the failure logs."""
+
+    def test_mismatched_fields_logged(self, monkeypatch):
+        import test_suite.globals as globals
+        from test_suite.fuzz_context import InstrHarness
+        from test_suite.fuzz_interface import TargetEffects
+        from test_suite.multiprocessing_utils import build_test_results
+
+        monkeypatch.setattr(globals, "render_passing_effects", False)
+        ref, tgt = Path("ref.so"), Path("tgt.so")
+        results = {
+            ref: TargetEffects.of(_instr_effects(cu_avail=1)),
+            tgt: TargetEffects.of(_instr_effects(result=3, cu_avail=1)),
+        }
+        status, outputs = build_test_results(InstrHarness, results, ref)
+        assert status == -1
+        assert outputs[tgt].startswith("# Mismatched fields: result\n")
+        assert not outputs[ref].startswith("#")
@@ -220,6 +220,53 @@ class TestBuildFbElfCtx:
         assert ctx.Features().FeaturesLength() == len(sample_features)
 
 
+class TestEmbeddedFbElfCtx:
+    """Tests for reusing the context embedded in a FlatBuffers fixture."""
+
+    def _parse_ctx(self, ctx_bytes):
+        from org.solana.sealevel.v2.ELFLoaderCtx import ELFLoaderCtx
+
+        ctx = ELFLoaderCtx.GetRootAs(bytes(ctx_bytes), 0)
+        fb_features = ctx.Features()
+        return (
+            bytes(ctx.ElfData(i) for i in range(ctx.ElfDataLength())),
+            [fb_features.Features(i) for i in range(fb_features.FeaturesLength())],
+            ctx.DeployChecks(),
+        )
+
+    @pytest.mark.parametrize("features", [[], [100], [100, 200, 300]])
+    def test_matches_rebuilt_ctx(self, sample_elf_data, features):
+        _require_flatbuffers()
+        from test_suite.flatbuffers_utils import (
+            build_fb_elf_ctx,
+            embedded_fb_elf_ctx,
+            parse_fb_elf_fixture,
+        )
+
+        fb_bytes = _build_fb_fixture_bytes(sample_elf_data, features, False)
+        ctx_bytes = embedded_fb_elf_ctx(fb_bytes, parse_fb_elf_fixture(fb_bytes))
+
+        assert self._parse_ctx(ctx_bytes) == self._parse_ctx(
+            build_fb_elf_ctx(sample_elf_data, features, False)
+        )
+        # The fixture itself is left untouched
+        assert fb_bytes == _build_fb_fixture_bytes(sample_elf_data, features, False)
+
+    def test_in_place_does_not_copy(self, sample_elf_data, sample_features):
+        _require_flatbuffers()
+        from test_suite.flatbuffers_utils import (
+            embedded_fb_elf_ctx,
+            parse_fb_elf_fixture,
+        )
+
+        data = bytearray(_build_fb_fixture_bytes(sample_elf_data, sample_features))
+        ctx_bytes = embedded_fb_elf_ctx(data, parse_fb_elf_fixture(data), in_place=True)
+
+        assert isinstance(ctx_bytes, memoryview)
+        assert ctx_bytes.obj is data
+        assert self._parse_ctx(ctx_bytes) == (sample_elf_data, sample_features, True)
+
+
 class TestParseFbElfEffects:
     """Tests for parsing FlatBuffers ELFLoaderEffects from raw bytes."""
 
@@ -798,6 +845,41 @@ class TestRegenerateFbFixture:
             call_args = mock_process.call_args
             assert call_args[0][0] == "sol_compat_elf_loader_v2"
 
+    def test_regenerate_unchanged_features_reuses_ctx(
+        self, sample_elf_data, sample_effects
+    ):
+        """Without feature changes the embedded context is passed on as is."""
+        _require_flatbuffers()
+        from org.solana.sealevel.v2.ELFLoaderCtx import ELFLoaderCtx
+        from test_suite.fixture_utils import _regenerate_fb_fixture
+        import test_suite.globals as globals
+
+        fb_bytes = _build_fb_fixture_bytes(
+            sample_elf_data, [100, 200], effects=sample_effects
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test_file = Path(tmp_dir) / "test.fix"
+            test_file.write_bytes(fb_bytes)
+
+            self._setup_globals(tmp_dir)
+            globals.reference_shared_library = "mock_lib"
+            globals.target_libraries = {"mock_lib": mock.MagicMock()}
+
+            with (
+                mock.patch(
+                    "test_suite.fixture_utils.process_target_raw",
+                    return_value=self._build_effects_bytes(sample_effects),
+                ) as mock_process,
+                mock.patch("test_suite.fixture_utils.build_fb_elf_ctx") as mock_build,
+            ):
+                assert _regenerate_fb_fixture(test_file, fb_bytes) == 1
+
+            mock_build.assert_not_called()
+            ctx = ELFLoaderCtx.GetRootAs(bytes(mock_process.call_args[0][2]), 0)
+            assert ctx.ElfDataLength() == len(sample_elf_data)
+            assert ctx.Features().FeaturesLength() == 2
+
     def _build_effects_bytes(self, effects_dict):
         """Build FlatBuffers ELFLoaderEffects bytes from a dict."""
         import flatbuffers
@@ -0,0 +1,109 @@
+"""
+Unit tests for the persistent fixture corpus index.
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    corpus = tmp_path / "corpus"
+    shutil.copytree(TEST_DATA_DIR / "fixtures", corpus / "fixtures")
+    shutil.copytree(TEST_DATA_DIR / "contexts", corpus / "contexts")
+    return corpus
+
+
+class TestFixtureIndex:
+    """Tests for building and incrementally updating the index."""
+
+    def test_entries_describe_files(self, corpus):
+        from test_suite.fixture_index import FixtureIndex, default_index_path
+
+        with FixtureIndex(default_index_path(corpus)) as index:
+            entries = index.update(corpus)
+
+        assert {entry.path for entry in entries} == set(corpus.rglob("*.*ctx")) | set(
+            corpus.rglob("*.fix")
+        )
+        for entry in entries:
+            assert entry.is_valid
+            assert entry.format == "protobuf"
+            assert entry.harness == "BlockHarness"
+            assert entry.fn_entrypoint == "sol_compat_block_execute_v1"
+            assert (
+                entry.content_hash
+                == hashlib.sha256(entry.path.read_bytes()).hexdigest()
+            )
+
+    def test_only_changed_files_reread(self, corpus):
+        from test_suite.fixture_index import FixtureIndex, default_index_path
+
+        index_path = default_index_path(corpus)
+        with FixtureIndex(index_path) as index:
+            entries = index.update(corpus)
+
+        unchanged, changed, removed = sorted(
+            entry.path for entry in entries if entry.path.suffix == ".fix"
+        )[:3]
+        # Mark the row of an unchanged file, which is only kept if it is not re-read
+        with sqlite3.connect(index_path) as conn:
+            conn.execute(
+                "UPDATE files SET content_hash = 'stale' WHERE path = ?",
+                (str(unchanged.relative_to(corpus)),),
+            )
+        changed.write_bytes(unchanged.read_bytes())
+        os.utime(changed, ns=(0, 0))
+        removed.unlink()
+
+        with FixtureIndex(index_path) as index:
+            by_path = {entry.path: entry for entry in index.update(corpus)}
+
+        assert by_path[unchanged].content_hash == "stale"
+        assert (
+            by_path[changed].content_hash
+            == hashlib.sha256(unchanged.read_bytes()).hexdigest()
+        )
+        assert by_path[changed].mtime_ns == 0
+        assert removed not in by_path
+        assert len(by_path) == len(entries) - 1
+
+    def test_unparseable_file_recorded(self, corpus):
+        from test_suite.fixture_index import FixtureIndex, default_index_path
+
+        bad = corpus / "fixtures" / "garbage.fix"
+        bad.write_bytes(b"\xff" * 64)
+        with FixtureIndex(default_index_path(corpus)) as index:
+            entry = next(e for e in index.update(corpus) if e.path == bad)
+        assert not entry.is_valid
+        assert entry.harness is None
+
+    def test_find_test_files(self, corpus):
+        from test_suite.fixture_index import find_test_files
+        from test_suite.fuzz_context import get_all_supported_extensions
+
+        expected = {
+            path
+            for ext in get_all_supported_extensions()
+            for path in corpus.rglob(f"*{ext}")
+        }
+        assert set(find_test_files(corpus)) == expected
+        assert set(find_test_files(corpus, use_index=True)) == expected
+        single = next(iter(expected))
+        assert find_test_files(single, use_index=True) == [single]
+
+    def test_find_indexed_test_files(self, corpus):
+        from test_suite.fixture_index import find_indexed_test_files
+
+        paths, entries = find_indexed_test_files(corpus, use_index=True)
+        assert paths == [entry.path for entry in entries]
+        assert {entry.harness for entry in entries} == {"BlockHarness"}
+        assert find_indexed_test_files(corpus)[1] == []
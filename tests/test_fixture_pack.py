@@ -0,0 +1,106 @@
+"""
+Unit tests for packed fixture archives.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    corpus = tmp_path / "corpus"
+    shutil.copytree(TEST_DATA_DIR / "fixtures", corpus / "fixtures")
+    shutil.copytree(TEST_DATA_DIR / "contexts", corpus / "contexts")
+    return corpus
+
+
+def _files(directory: Path) -> dict[str, bytes]:
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in directory.rglob("*")
+        if path.is_file()
+    }
+
+
+class TestFixturePack:
+    """Tests for writing, reading and extracting packs."""
+
+    def test_round_trip(self, corpus, tmp_path):
+        from test_suite.fixture_pack import FixturePack, pack_directory, unpack
+
+        pack_path = tmp_path / "corpus.fixpack"
+        assert pack_directory(corpus, pack_path) == 10
+
+        with FixturePack(pack_path) as pack:
+            assert {entry.name: bytes(pack.read(entry)) for entry in pack.entries} == (
+                _files(corpus)
+            )
+            for entry in pack.entries:
+                assert entry.offset % 8 == 0
+                assert entry.fn_entrypoint == "sol_compat_block_execute_v1"
+
+        assert unpack(pack_path, tmp_path / "out") == 10
+        assert _files(tmp_path / "out") == _files(corpus)
+
+    def test_append_replaces_same_name(self, tmp_path):
+        from test_suite.fixture_pack import FixturePack, write_pack
+
+        pack_path = tmp_path / "a.fixpack"
+        write_pack(pack_path, [("a.fix", b"one", "x"), ("b.fix", b"two", "")])
+        write_pack(pack_path, [("a.fix", b"three", "y")], append=True)
+
+        with FixturePack(pack_path) as pack:
+            assert len(pack) == 2
+            assert bytes(pack.read("a.fix")) == b"three"
+            assert bytes(pack.read("b.fix")) == b"two"
+
+    def test_interrupted_append_keeps_pack(self, tmp_path):
+        from test_suite.fixture_pack import FixturePack, write_pack
+
+        pack_path = tmp_path / "a.fixpack"
+        write_pack(pack_path, [("a.fix", b"one", "x")])
+
+        def items():
+            yield ("b.fix", b"two", "")
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            write_pack(pack_path, items(), append=True)
+
+        with FixturePack(pack_path) as pack:
+            assert len(pack) == 1
+            assert bytes(pack.read("a.fix")) == b"one"
+        assert [path.name for path in tmp_path.iterdir()] == ["a.fixpack"]
+
+    def test_rejects_other_files(self, tmp_path):
+        from test_suite.fixture_pack import FixturePack, PackFormatError
+
+        not_a_pack = tmp_path / "bad.fixpack"
+        not_a_pack.write_bytes(b"\0" * 64)
+        with pytest.raises(PackFormatError):
+            FixturePack(not_a_pack)
+
+    def test_members_read_transparently(self, corpus, tmp_path):
+        from test_suite.fixture_index import find_test_files
+        from test_suite.fixture_pack import pack_directory
+        from test_suite.multiprocessing_utils import read_fixture, read_test_file
+
+        pack_path = tmp_path / "corpus.fixpack"
+        pack_directory(corpus, pack_path)
+
+        members = find_test_files(pack_path)
+        assert sorted(path.relative_to(pack_path) for path in members) == sorted(
+            path.relative_to(corpus) for path in find_test_files(corpus)
+        )
+
+        member = pack_path / "fixtures" / "block-12.fix"
+        original = corpus / "fixtures" / "block-12.fix"
+        data = read_test_file(member)
+        assert isinstance(data, memoryview)
+        assert data == original.read_bytes()
+        assert read_fixture(member) == read_fixture(original)
@@ -0,0 +1,83 @@
+"""
+Unit tests for result logging in log_utils.
+"""
+
+from pathlib import Path
+
+import pytest
+
+import test_suite.globals as globals
+from test_suite.constants import TEST_CASE_CRASHED
+from test_suite.log_utils import ResultLogger
+
+
+@pytest.fixture
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(globals, "output_dir", tmp_path)
+    for target in ("ref", "tgt"):
+        (tmp_path / target).mkdir()
+    return tmp_path
+
+
+def _fixture_files(tmp_path: Path, *stems):
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    files = []
+    for stem in stems:
+        path = inputs / f"{stem}.fix"
+        path.write_bytes(stem.encode())
+        files.append(path)
+    return files
+
+
+class TestLogResults:
+    """Tests for tallying and saving test case results."""
+
+    def test_counts_each_status(self, results_dir):
+        targets = [Path("ref.so"), Path("tgt.so")]
+        outputs = {target: "effects" for target in targets}
+        test_cases = _fixture_files(results_dir, "pass", "fail", "skip", "crash")
+        results = [
+            ("pass", 1, outputs),
+            ("fail", -1, outputs),
+            ("skip", 0, None),
+            ("crash", TEST_CASE_CRASHED, None),
+        ]
+
+        logger = ResultLogger(test_cases, targets, 10000, False, True, False)
+        for result in results:
+            logger.add(result)
+        passed, failed, skipped, _, failed_tests, skipped_tests, crashed_tests = (
+            logger.close()
+        )
+
+        assert (passed, failed, skipped) == (1, 1, 1)
+        assert failed_tests == ["fail"]
+        assert skipped_tests == ["skip"]
+        assert crashed_tests == ["crash"]
+        assert (results_dir / "failed_protobufs" / "fail.fix").exists()
+        assert (results_dir / "crashed_protobufs" / "crash.fix").exists()
+
+    def test_streams_as_results_arrive(self, results_dir):
+        targets = [Path("ref.so"), Path("tgt.so")]
+        outputs = {target: "effects" for target in targets}
+        test_cases = _fixture_files(results_dir, "a", "b", "c")
+
+        logger = ResultLogger(test_cases, targets, 2, False, True, True)
+        logger.add(("a", -1, outputs))
+        # Failures are saved and counted before the run finishes
+        assert (results_dir / "failed_protobufs" / "a.fix").exists()
+        assert logger.failed == 1
+
+        logger.add(("b", 1, outputs))
+        assert (results_dir / "successful_protobufs" / "b.fix").exists()
+        logger.add(("c", 1, outputs))
+
+        passed, failed, skipped, log_files, *_ = logger.close()
+        assert (passed, failed, skipped) == (2, 1, 0)
+        # A new log chunk starts every log_chunk_size results
+        assert sorted(p.name for p in (results_dir / "ref").iterdir()) == [
+            "a.txt",
+            "c.txt",
+        ]
+        assert (results_dir / "ref" / "a.txt").read_text().startswith("a:\neffects")
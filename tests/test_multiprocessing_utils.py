@@ -0,0 +1,932 @@
+"""
+Unit tests for the harness call path in multiprocessing_utils.
+
+These tests exercise the ctypes marshalling helpers without requiring a
+target shared library.
+"""
+
+import ctypes
+import mmap
+import tempfile
+from pathlib import Path
+
+import pytest
+
+
+def _read_pointer(ptr, size: int) -> bytes:
+    return ctypes.string_at(ptr, size)
+
+
+class TestInputMarshalling:
+    """Tests for zero-copy input pointers handed to sol_compat entrypoints."""
+
+    @pytest.mark.parametrize(
+        "wrap",
+        [bytes, bytearray, memoryview, lambda b: memoryview(bytearray(b))],
+        ids=["bytes", "bytearray", "memoryview", "writable-memoryview"],
+    )
+    def test_pointer_sees_input_bytes(self, wrap):
+        from test_suite.multiprocessing_utils import as_uint8_pointer
+
+        payload = bytes(range(256)) * 4
+        data = wrap(payload)
+        ptr = as_uint8_pointer(data)
+        assert _read_pointer(ptr, len(payload)) == payload
+
+    def test_bytes_are_not_copied(self):
+        from test_suite.multiprocessing_utils import as_uint8_pointer
+
+        payload = b"\x01\x02\x03\x04" * 1024
+        ptr = as_uint8_pointer(payload)
+        # Pointer aliases the bytes object's internal storage
+        assert (
+            ctypes.cast(ptr, ctypes.c_void_p).value
+            == ctypes.cast(ctypes.c_char_p(payload), ctypes.c_void_p).value
+        )
+
+    def test_bytearray_is_shared(self):
+        from test_suite.multiprocessing_utils import as_uint8_pointer
+
+        data = bytearray(b"\x00" * 16)
+        ptr = as_uint8_pointer(data)
+        data[3] = 0x7F
+        assert ptr[3] == 0x7F
+
+    def test_mmap_input(self):
+        from test_suite.multiprocessing_utils import as_uint8_pointer
+
+        payload = b"fixture-bytes" * 100
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "input.bin"
+            path.write_bytes(payload)
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                ptr = as_uint8_pointer(mm)
+                assert _read_pointer(ptr, len(payload)) == payload
+                del ptr
+
+    def test_empty_input(self):
+        from test_suite.multiprocessing_utils import as_uint8_pointer
+
+        assert as_uint8_pointer(b"") is not None
+
+
+class _FakeFn:
+    def __init__(self):
+        self.argtypes = None
+        self.restype = None
+
+
+class _FakeLibrary:
+    """Stand-in for ctypes.CDLL exposing a fixed set of entrypoints."""
+
+    def __init__(self, name: str, exports):
+        self._name = name
+        self.lookups = 0
+        self._fns = {fn_name: _FakeFn() for fn_name in exports}
+
+    def __getattr__(self, fn_name):
+        if fn_name.startswith("__") or fn_name not in self._fns:
+            raise AttributeError(fn_name)
+        self.lookups += 1
+        return self._fns[fn_name]
+
+
+@pytest.fixture
+def empty_fn_registry(monkeypatch):
+    import test_suite.globals as globals
+
+    monkeypatch.setattr(globals, "sol_compat_fns", {})
+    return globals.sol_compat_fns
+
+
+class TestSolCompatFnRegistry:
+    """Tests for the per-process registry of pre-typed entrypoints."""
+
+    def test_bind_covers_v1_and_v2(self, empty_fn_registry):
+        from test_suite.multiprocessing_utils import (
+            SOL_COMPAT_ARGTYPES,
+            bind_sol_compat_fns,
+        )
+
+        lib = _FakeLibrary(
+            "/tmp/libtarget.so",
+            ["sol_compat_instr_execute_v1", "sol_compat_elf_loader_v2"],
+        )
+        bind_sol_compat_fns([lib])
+
+        assert set(empty_fn_registry) == {
+            ("/tmp/libtarget.so", "sol_compat_instr_execute_v1"),
+            ("/tmp/libtarget.so", "sol_compat_elf_loader_v2"),
+        }
+        fn = empty_fn_registry[("/tmp/libtarget.so", "sol_compat_elf_loader_v2")]
+        assert fn.argtypes == SOL_COMPAT_ARGTYPES
+        assert fn.restype is ctypes.c_int
+
+    def test_get_uses_registry(self, empty_fn_registry):
+        from test_suite.multiprocessing_utils import (
+            bind_sol_compat_fns,
+            get_sol_compat_fn,
+        )
+
+        lib = _FakeLibrary("/tmp/libtarget.so", ["sol_compat_instr_execute_v1"])
+        bind_sol_compat_fns([lib])
+        lookups = lib.lookups
+
+        for _ in range(3):
+            get_sol_compat_fn(lib, "sol_compat_instr_execute_v1")
+        assert lib.lookups == lookups
+
+    def test_get_binds_lazily(self, empty_fn_registry):
+        from test_suite.multiprocessing_utils import get_sol_compat_fn
+
+        lib = _FakeLibrary("/tmp/libtarget.so", ["sol_compat_instr_execute_v1"])
+        fn = get_sol_compat_fn(lib, "sol_compat_instr_execute_v1")
+
+        assert fn.restype is ctypes.c_int
+        assert ("/tmp/libtarget.so", "sol_compat_instr_execute_v1") in (
+            empty_fn_registry
+        )
+
+    def test_get_missing_entrypoint_raises(self, empty_fn_registry):
+        from test_suite.multiprocessing_utils import get_sol_compat_fn
+
+        lib = _FakeLibrary("/tmp/libtarget.so", [])
+        with pytest.raises(AttributeError):
+            get_sol_compat_fn(lib, "sol_compat_instr_execute_v1")
+
+    def test_registry_keyed_by_target(self, empty_fn_registry):
+        from test_suite.multiprocessing_utils import get_sol_compat_fn
+
+        lib_a = _FakeLibrary("/tmp/liba.so", ["sol_compat_instr_execute_v1"])
+        lib_b = _FakeLibrary("/tmp/libb.so", ["sol_compat_instr_execute_v1"])
+
+        fn_a = get_sol_compat_fn(lib_a, "sol_compat_instr_execute_v1")
+        fn_b = get_sol_compat_fn(lib_b, "sol_compat_instr_execute_v1")
+        assert fn_a is not fn_b
+
+
+_SOL_COMPAT_FN_TYPE = ctypes.CFUNCTYPE(
+    ctypes.c_int,
+    ctypes.POINTER(ctypes.c_uint8),
+    ctypes.POINTER(ctypes.c_uint64),
+    ctypes.POINTER(ctypes.c_uint8),
+    ctypes.c_uint64,
+)
+
+
+@pytest.fixture
+def echo_target(monkeypatch, empty_fn_registry):
+    """Register a v2-style entrypoint that copies its input to the output."""
+    import test_suite.globals as globals
+
+    monkeypatch.setattr(globals, "output_buffer_pointer", (ctypes.c_uint8 * 4096)())
+
+    @_SOL_COMPAT_FN_TYPE
+    def echo(out_ptr, out_psz, in_ptr, in_sz):
+        ctypes.memmove(out_ptr, in_ptr, in_sz)
+        out_psz[0] = in_sz
+        return 0
+
+    lib = _FakeLibrary("/tmp/libecho.so", [])
+    empty_fn_registry[(lib._name, "sol_compat_echo_v2")] = echo
+    return lib
+
+
+class TestOutputBufferView:
+    """Tests for reading target output without copying the output buffer."""
+
+    def test_view_aliases_output_buffer(self, monkeypatch):
+        import test_suite.globals as globals
+        from test_suite.multiprocessing_utils import output_buffer_view
+
+        monkeypatch.setattr(globals, "output_buffer_pointer", (ctypes.c_uint8 * 16)())
+        ctypes.memmove(globals.output_buffer_pointer, b"effects", 7)
+
+        view = output_buffer_view(7)
+        assert bytes(view) == b"effects"
+
+        globals.output_buffer_pointer[0] = ord("E")
+        assert bytes(view) == b"Effects"
+
+    def test_protobuf_parses_from_view(self, monkeypatch):
+        import test_suite.globals as globals
+        import test_suite.protos.invoke_pb2 as invoke_pb
+        from test_suite.multiprocessing_utils import output_buffer_view
+
+        data = invoke_pb.InstrEffects(result=3, cu_avail=42).SerializeToString()
+        monkeypatch.setattr(globals, "output_buffer_pointer", (ctypes.c_uint8 * 64)())
+        ctypes.memmove(globals.output_buffer_pointer, data, len(data))
+
+        effects = invoke_pb.InstrEffects()
+        effects.ParseFromString(output_buffer_view(len(data)))
+        assert effects.result == 3
+        assert effects.cu_avail == 42
+
+    def test_process_target_raw_copy(self, echo_target):
+        from test_suite.multiprocessing_utils import process_target_raw
+
+        out = process_target_raw("sol_compat_echo_v2", echo_target, b"payload")
+        assert isinstance(out, bytes)
+        assert out == b"payload"
+
+        # A copy survives the next call
+        process_target_raw("sol_compat_echo_v2", echo_target, b"PAYLOAD")
+        assert out == b"payload"
+
+    def test_process_target_raw_view(self, echo_target):
+        from test_suite.multiprocessing_utils import process_target_raw
+
+        out = process_target_raw(
+            "sol_compat_echo_v2", echo_target, b"payload", copy=False
+        )
+        assert isinstance(out, memoryview)
+        assert bytes(out) == b"payload"
+
+        # A view is overwritten by the next call
+        process_target_raw("sol_compat_echo_v2", echo_target, b"PAYLOAD")
+        assert bytes(out) == b"PAYLOAD"
+
+    def test_fb_effects_parse_from_view(self, echo_target):
+        from test_suite.flatbuffers_utils import (
+            FLATBUFFERS_AVAILABLE,
+            parse_fb_elf_effects,
+        )
+        from test_suite.multiprocessing_utils import process_target_raw
+
+        if not FLATBUFFERS_AVAILABLE:
+            pytest.skip("FlatBuffers not available")
+
+        import flatbuffers
+        from org.solana.sealevel.v2 import ELFLoaderEffects as FB_ELFLoaderEffects
+
+        builder = flatbuffers.Builder(64)
+        FB_ELFLoaderEffects.Start(builder)
+        FB_ELFLoaderEffects.AddErrCode(builder, 0)
+        FB_ELFLoaderEffects.AddTextCnt(builder, 5)
+        FB_ELFLoaderEffects.AddEntryPc(builder, 9)
+        builder.Finish(FB_ELFLoaderEffects.End(builder))
+        effects_bytes = bytes(builder.Output())
+
+        out = process_target_raw(
+            "sol_compat_echo_v2", echo_target, effects_bytes, copy=False
+        )
+        assert parse_fb_elf_effects(out) == parse_fb_elf_effects(effects_bytes)
+        assert parse_fb_elf_effects(out)["text_cnt"] == 5
+
+
+@pytest.fixture
+def fresh_output_buffer(monkeypatch):
+    import test_suite.globals as globals
+
+    monkeypatch.setattr(globals, "output_buffer_pointer", None)
+    monkeypatch.setattr(globals, "randomize_output_buffer", False)
+    monkeypatch.setattr(globals, "output_buffer_seed", None)
+    monkeypatch.setattr(globals, "sol_compat_fns", {})
+    monkeypatch.setattr(globals, "target_libraries", {})
+    return globals
+
+
+def _needs_output(required: int, calls: list, report: bool = True):
+    """
+    v1-style entrypoint that fails unless out_psz holds `required` bytes,
+    reporting the required size on failure if `report` is set.
+    """
+
+    @_SOL_COMPAT_FN_TYPE
+    def fn(out_ptr, out_psz, in_ptr, in_sz):
+        calls.append(out_psz[0])
+        if out_psz[0] < required:
+            if report:
+                out_psz[0] = required
+            return 0
+        out_psz[0] = required
+        return 1
+
+    return fn
+
+
+class TestOutputBufferSizing:
+    """Tests for lazily allocated, growable output buffers."""
+
+    def test_initializer_is_lazy(self, fresh_output_buffer):
+        from test_suite.multiprocessing_utils import initialize_process_output_buffers
+
+        initialize_process_output_buffers(randomize_output_buffer=True)
+        assert fresh_output_buffer.output_buffer_pointer is None
+        assert fresh_output_buffer.output_buffer_seed is not None
+
+    def test_ensure_grows_but_never_shrinks(self, fresh_output_buffer):
+        from test_suite.multiprocessing_utils import ensure_output_buffer
+
+        assert len(ensure_output_buffer(1024)) == 1024
+        assert len(ensure_output_buffer(512)) == 1024
+        assert len(ensure_output_buffer(4096)) == 4096
+
+    def test_harness_sizes(self):
+        from test_suite.constants import OUTPUT_BUFFER_SIZE, SMALL_OUTPUT_BUFFER_SIZE
+        from test_suite.fuzz_context import (
+            BlockHarness,
+            GossipHarness,
+            InstrHarness,
+            SyscallHarness,
+            TxnHarness,
+            VmValidateHarness,
+        )
+
+        # Effects that carry account data get the large buffer
+        assert TxnHarness.output_buffer_size == OUTPUT_BUFFER_SIZE
+        assert BlockHarness.output_buffer_size == OUTPUT_BUFFER_SIZE
+        assert InstrHarness.output_buffer_size == OUTPUT_BUFFER_SIZE
+        assert SyscallHarness.output_buffer_size == OUTPUT_BUFFER_SIZE
+        assert GossipHarness.output_buffer_size == SMALL_OUTPUT_BUFFER_SIZE
+        assert VmValidateHarness.output_buffer_size == SMALL_OUTPUT_BUFFER_SIZE
+
+    def test_retry_adopts_larger_buffer(self, fresh_output_buffer):
+        from test_suite.multiprocessing_utils import call_sol_compat_fn
+
+        calls = []
+        fn = _needs_output(8192, calls)
+        out_sz = call_sol_compat_fn(
+            fn, None, 0, 4096, succeeded=lambda result: result != 0
+        )
+
+        assert out_sz == 8192
+        assert calls == [4096, 8192]
+        assert len(fresh_output_buffer.output_buffer_pointer) == 8192
+
+        # The grown buffer is reused by later calls
+        calls.clear()
+        assert call_sol_compat_fn(fn, None, 0, 4096, lambda r: r != 0) == 8192
+        assert calls == [8192]
+
+    def test_failed_retry_keeps_grown_buffer(self, fresh_output_buffer):
+        from test_suite.multiprocessing_utils import call_sol_compat_fn
+
+        calls = []
+
+        @_SOL_COMPAT_FN_TYPE
+        def fn(out_ptr, out_psz, in_ptr, in_sz):
+            calls.append(out_psz[0])
+            out_psz[0] = 10000
+            return 0
+
+        assert call_sol_compat_fn(fn, None, 0, 4096, lambda r: r != 0) is None
+        assert calls == [4096, 10000]
+        assert len(fresh_output_buffer.output_buffer_pointer) == 10000
+
+    def test_unchanged_size_retries_at_max_size(self, fresh_output_buffer):
+        from test_suite.constants import OUTPUT_BUFFER_SIZE
+        from test_suite.multiprocessing_utils import call_sol_compat_fn
+
+        # The target does not report how much space it needs
+        calls = []
+        fn = _needs_output(8192, calls, report=False)
+
+        assert call_sol_compat_fn(fn, None, 0, 4096, lambda r: r != 0) == 8192
+        assert calls == [4096, OUTPUT_BUFFER_SIZE]
+        assert len(fresh_output_buffer.output_buffer_pointer) == OUTPUT_BUFFER_SIZE
+
+    def test_large_effects(self, fresh_output_buffer):
+        from test_suite.constants import SMALL_OUTPUT_BUFFER_SIZE
+        from test_suite.multiprocessing_utils import (
+            call_sol_compat_fn,
+            output_buffer_view,
+        )
+
+        # Effects larger than the small buffer, e.g. several MiB of accounts
+        size = SMALL_OUTPUT_BUFFER_SIZE + 1024 * 1024
+
+        @_SOL_COMPAT_FN_TYPE
+        def fn(out_ptr, out_psz, in_ptr, in_sz):
+            if out_psz[0] < size:
+                return 0
+            ctypes.memset(out_ptr, 0xAB, size)
+            out_psz[0] = size
+            return 1
+
+        out_sz = call_sol_compat_fn(
+            fn, None, 0, SMALL_OUTPUT_BUFFER_SIZE, lambda r: r != 0
+        )
+        assert out_sz == size
+        view = output_buffer_view(out_sz)
+        assert len(view) == size
+        assert view[0] == view[-1] == 0xAB
+
+    def test_rejected_input_not_retried(self, fresh_output_buffer):
+        from test_suite.multiprocessing_utils import call_sol_compat_fn
+
+        calls = []
+
+        @_SOL_COMPAT_FN_TYPE
+        def fn(out_ptr, out_psz, in_ptr, in_sz):
+            calls.append(out_psz[0])
+            out_psz[0] = 0
+            return 0
+
+        assert call_sol_compat_fn(fn, None, 0, 4096, lambda r: r != 0) is None
+        assert calls == [4096]
+        assert len(fresh_output_buffer.output_buffer_pointer) == 4096
+
+    def test_no_retry_beyond_max_size(self, fresh_output_buffer):
+        from test_suite.constants import OUTPUT_BUFFER_SIZE
+        from test_suite.multiprocessing_utils import call_sol_compat_fn
+
+        calls = []
+        fn = _needs_output(1 << 62, calls)
+
+        assert call_sol_compat_fn(fn, None, 0, 4096, lambda r: r != 0) is None
+        assert (
+            call_sol_compat_fn(fn, None, 0, OUTPUT_BUFFER_SIZE, lambda r: r != 0)
+            is None
+        )
+        assert calls == [4096, OUTPUT_BUFFER_SIZE]
+
+
+class TestOutputBufferRandomization:
+    """Tests for the seeded output buffer fill."""
+
+    @pytest.mark.parametrize("size", [1, 4096, (1 << 20) + 3, 3 * (1 << 20) + 17])
+    def test_fill_is_reproducible(self, size):
+        from test_suite.multiprocessing_utils import fill_output_buffer_random
+
+        a = (ctypes.c_uint8 * size)()
+        b = (ctypes.c_uint8 * size)()
+        fill_output_buffer_random(a, 1234)
+        fill_output_buffer_random(b, 1234)
+        assert bytes(a) == bytes(b)
+
+    def test_fill_depends_on_seed(self):
+        from test_suite.multiprocessing_utils import fill_output_buffer_random
+
+        a = (ctypes.c_uint8 * 4096)()
+        b = (ctypes.c_uint8 * 4096)()
+        fill_output_buffer_random(a, 1)
+        fill_output_buffer_random(b, 2)
+        assert bytes(a) != bytes(b)
+
+    def test_fill_covers_whole_buffer(self):
+        from test_suite.constants import OUTPUT_BUFFER_FILL_PATTERN_SIZE
+        from test_suite.multiprocessing_utils import fill_output_buffer_random
+
+        size = 2 * OUTPUT_BUFFER_FILL_PATTERN_SIZE + 100
+        buf = (ctypes.c_uint8 * size)()
+        fill_output_buffer_random(buf, 7)
+        data = bytes(buf)
+        pattern = data[:OUTPUT_BUFFER_FILL_PATTERN_SIZE]
+        assert data[OUTPUT_BUFFER_FILL_PATTERN_SIZE:-100] == pattern
+        assert data[-100:] == pattern[:100]
+
+    def test_randomized_buffer_uses_seed(self, fresh_output_buffer):
+        from test_suite.multiprocessing_utils import (
+            ensure_output_buffer,
+            fill_output_buffer_random,
+            initialize_process_output_buffers,
+        )
+
+        initialize_process_output_buffers(True, output_buffer_seed=99)
+        buf = ensure_output_buffer(4096)
+
+        expected = (ctypes.c_uint8 * 4096)()
+        fill_output_buffer_random(expected, 99)
+        assert bytes(buf) == bytes(expected)
+
+
+def _instr_effects(result: int, cu_avail: int = 100) -> bytes:
+    import test_suite.protos.invoke_pb2 as invoke_pb
+
+    return invoke_pb.InstrEffects(result=result, cu_avail=cu_avail).SerializeToString(
+        deterministic=True
+    )
+
+
+class TestBuildTestResults:
+    """Tests for comparing and rendering per-target effects."""
+
+    REF = Path("ref.so")
+    TGT = Path("tgt.so")
+
+    @pytest.fixture
+    def render_passing(self, monkeypatch):
+        import test_suite.globals as globals
+
+        def set_render(value: bool):
+            monkeypatch.setattr(globals, "render_passing_effects", value)
+
+        return set_render
+
+    def test_passing_rendered_by_default(self, render_passing):
+        from test_suite.fuzz_context import InstrHarness
+        from test_suite.multiprocessing_utils import build_test_results
+
+        render_passing(True)
+        results = {self.REF: _instr_effects(0), self.TGT: _instr_effects(0)}
+        status, outputs = build_test_results(InstrHarness, results, self.REF)
+        assert status == 1
+        assert "cu_avail: 100" in outputs[self.TGT]
+
+    def test_passing_gets_digest(self, render_passing, monkeypatch):
+        from test_suite.fuzz_context import InstrHarness
+        from test_suite.multiprocessing_utils import build_test_results, effects_digest
+
+        render_passing(False)
+        monkeypatch.setattr(
+            "test_suite.multiprocessing_utils.text_format.MessageToString",
+            lambda *_: pytest.fail("passing effects should not be rendered"),
+        )
+        results = {self.REF: _instr_effects(0), self.TGT: _instr_effects(0)}
+        status, outputs = build_test_results(InstrHarness, results, self.REF)
+        assert status == 1
+        assert outputs == {
+            target: effects_digest(result) for target, result in results.items()
+        }
+
+    def test_failure_still_rendered(self, render_passing):
+        from test_suite.fuzz_context import InstrHarness
+        from test_suite.multiprocessing_utils import build_test_results
+
+        render_passing(False)
+        results = {self.REF: _instr_effects(0), self.TGT: _instr_effects(1)}
+        status, outputs = build_test_results(InstrHarness, results, self.REF)
+        assert status == -1
+        assert "result: 1" in outputs[self.TGT]
+        assert "cu_avail: 100" in outputs[self.REF]
+
+    @pytest.mark.parametrize("render", [True, False])
+    def test_identical_bytes_skip_diff(self, render_passing, render, monkeypatch):
+        from test_suite.fuzz_context import InstrHarness
+        from test_suite.multiprocessing_utils import build_test_results
+
+        render_passing(render)
+        monkeypatch.setattr(
+            InstrHarness,
+            "diff_effect_fn",
+            lambda *_: pytest.fail("identical effects should not be diffed"),
+        )
+        results = {self.REF: _instr_effects(0), self.TGT: _instr_effects(0)}
+        status, outputs = build_test_results(InstrHarness, results, self.REF)
+        assert status == 1
+        assert outputs[self.REF] == outputs[self.TGT]
+
+    def test_byte_mismatch_uses_structured_diff(self, render_passing, monkeypatch):
+        import test_suite.globals as globals
+        from test_suite.fuzz_context import InstrHarness
+        from test_suite.multiprocessing_utils import build_test_results
+
+        render_passing(False)
+        monkeypatch.setattr(globals, "ignore_compute_units_mode", True)
+        monkeypatch.setattr(InstrHarness, "diff_effect_fn", InstrHarness.diff_effect_fn)
+        results = {self.REF: _instr_effects(0, 100), self.TGT: _instr_effects(0, 5)}
+        status, _ = build_test_results(InstrHarness, results, self.REF)
+        assert status == 1
+
+
+class TestTargetEffects:
+    """Tests for sharing parsed effects between pipeline stages."""
+
+    def test_forms_are_kept(self):
+        import test_suite.protos.invoke_pb2 as invoke_pb
+        from test_suite.fuzz_interface import TargetEffects
+
+        serialized = _instr_effects(1)
+        effects = TargetEffects(invoke_pb.InstrEffects, serialized=serialized)
+        assert effects.serialized is serialized
+        message = effects.message
+        assert message.result == 1
+        assert effects.message is message
+
+        message.result = 2
+        effects.modified()
+        assert effects.serialized == _instr_effects(2)
+
+        with pytest.raises(ValueError):
+            TargetEffects(invoke_pb.InstrEffects)
+
+    def test_diff_and_render_from_messages(self, monkeypatch):
+        import test_suite.globals as globals
+        import test_suite.protos.invoke_pb2 as invoke_pb
+        from test_suite.fuzz_context import InstrHarness
+        from test_suite.fuzz_interface import TargetEffects
+        from test_suite.multiprocessing_utils import build_test_results
+
+        monkeypatch.setattr(globals, "render_passing_effects", False)
+        ref = invoke_pb.InstrEffects(result=0, cu_avail=100)
+        tgt = invoke_pb.InstrEffects(result=1, cu_avail=100)
+        diffed = []
+        monkeypatch.setattr(
+            InstrHarness, "diff_effect_fn", lambda a, b: diffed.append((a, b)) or False
+        )
+        results = {
+            TestBuildTestResults.REF: TargetEffects.of(ref),
+            TestBuildTestResults.TGT: TargetEffects.of(tgt),
+        }
+        status, outputs = build_test_results(
+            InstrHarness, results, TestBuildTestResults.REF
+        )
+        assert status == -1
+        assert diffed[0][0] is ref and diffed[0][1] is tgt
+        assert "result: 1" in outputs[TestBuildTestResults.TGT]
+
+
+class TestFixtureLoading:
+    """Tests for decoding fixtures from a single read of the file."""
+
+    @pytest.fixture
+    def fixture_file(self):
+        return next(
+            path
+            for path in sorted(
+                (Path(__file__).parent / "test_data" / "fixtures").rglob("*.fix")
+            )
+            if path.read_bytes()[:1] == b"\x0a"
+        )
+
+    def test_decodes_from_given_bytes(self, fixture_file, tmp_path):
+        from test_suite.multiprocessing_utils import extract_metadata, read_fixture
+
+        raw_data = fixture_file.read_bytes()
+        # The path is only used for its name/suffix once the bytes are given
+        missing = tmp_path / fixture_file.name
+
+        assert extract_metadata(missing, raw_data) == extract_metadata(fixture_file)
+        assert read_fixture(missing, raw_data) == read_fixture(fixture_file)
+
+    def test_run_test_reads_file_once(self, fixture_file, monkeypatch):
+        import builtins
+
+        import test_suite.multiprocessing_utils as mp_utils
+
+        opened = []
+        real_open = builtins.open
+
+        def counting_open(file, *args, **kwargs):
+            if Path(str(file)) == fixture_file:
+                opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", counting_open)
+        monkeypatch.setattr(mp_utils, "process_single_test_case", lambda *_: None)
+
+        assert mp_utils.run_test(fixture_file) == (fixture_file.stem, 0, None)
+        assert len(opened) == 1
+
+    def test_mmap_large_files(self, tmp_path, monkeypatch):
+        import test_suite.multiprocessing_utils as mp_utils
+
+        test_file = tmp_path / "large.fix"
+        test_file.write_bytes(b"\x01" * 64)
+        monkeypatch.setattr(mp_utils, "MMAP_MIN_FILE_SIZE", 64)
+
+        assert isinstance(mp_utils.read_test_file(test_file), bytes)
+        raw_data = mp_utils.read_test_file(test_file, use_mmap=True)
+        assert isinstance(raw_data, memoryview) and not raw_data.readonly
+        assert raw_data == b"\x01" * 64
+
+        # The mapping is private: writes never reach the file
+        raw_data[:4] = b"\x00" * 4
+        assert test_file.read_bytes() == b"\x01" * 64
+
+
+class TestParseResults:
+    """Tests for parse path selection, counters and strict parsing."""
+
+    @pytest.fixture
+    def instr_fixture(self):
+        import test_suite.protos.invoke_pb2 as invoke_pb
+
+        fixture = invoke_pb.InstrFixture()
+        fixture.metadata.fn_entrypoint = "sol_compat_instr_execute_v1"
+        fixture.input.program_id = bytes(range(32))
+        fixture.input.data = b"\x01\x02"
+        return fixture
+
+    @pytest.fixture(autouse=True)
+    def reset_parsing(self, monkeypatch):
+        import test_suite.globals as globals
+        from test_suite.multiprocessing_utils import parse_path_counts
+
+        monkeypatch.setattr(globals, "strict_parsing", False)
+        parse_path_counts.reset()
+
+    def test_binary_fixture(self, instr_fixture, tmp_path):
+        from test_suite.multiprocessing_utils import parse_fixture, parse_path_counts
+
+        test_file = tmp_path / "instr.fix"
+        test_file.write_bytes(instr_fixture.SerializeToString())
+
+        result = parse_fixture(test_file)
+        assert result.ok and result.path == "binary" and result.error is None
+        assert result.parsed == instr_fixture
+        counts = parse_path_counts.snapshot()
+        assert (counts["binary"], counts["text"], counts["fallback"]) == (1, 0, 0)
+
+    def test_text_fixture_selected_up_front(self, instr_fixture, tmp_path):
+        from google.protobuf import text_format
+
+        from test_suite.fuzz_context import get_harness_for_entrypoint
+        from test_suite.multiprocessing_utils import parse_fixture, parse_path_counts
+
+        readable = type(instr_fixture)()
+        readable.CopyFrom(instr_fixture)
+        harness_ctx = get_harness_for_entrypoint(readable.metadata.fn_entrypoint)
+        harness_ctx.context_human_encode_fn(readable.input)
+        test_file = tmp_path / "instr.fix"
+        test_file.write_text(text_format.MessageToString(readable))
+
+        result = parse_fixture(test_file)
+        assert result.ok and result.path == "text"
+        assert result.parsed == instr_fixture
+        counts = parse_path_counts.snapshot()
+        assert (counts["binary"], counts["text"], counts["fallback"]) == (0, 1, 0)
+
+    def test_unparseable_fixture(self, instr_fixture, tmp_path):
+        from test_suite.multiprocessing_utils import (
+            load_test_case,
+            parse_fixture,
+            parse_path_counts,
+            read_fixture,
+        )
+
+        test_file = tmp_path / "corrupt.fix"
+        test_file.write_bytes(instr_fixture.SerializeToString()[:-4])
+
+        result = parse_fixture(test_file)
+        assert not result.ok
+        assert [error.split(":")[0] for error in result.errors] == ["binary", "text"]
+        assert parse_path_counts.snapshot()["fallback"] == 1
+        assert read_fixture(test_file) is None
+        assert load_test_case(test_file) == (None, None)
+
+    def test_strict_parsing_fails_fast(self, instr_fixture, tmp_path, monkeypatch):
+        import test_suite.globals as globals
+        from test_suite.multiprocessing_utils import (
+            FixtureParseError,
+            parse_path_counts,
+            read_fixture,
+        )
+
+        test_file = tmp_path / "corrupt.fix"
+        test_file.write_bytes(instr_fixture.SerializeToString()[:-4])
+        monkeypatch.setattr(globals, "strict_parsing", True)
+
+        with pytest.raises(FixtureParseError, match="corrupt.fix"):
+            read_fixture(test_file)
+        # No fallback to the text parser
+        counts = parse_path_counts.snapshot()
+        assert (counts["binary"], counts["text"], counts["fallback"]) == (1, 0, 0)
+
+
+def _sleepy_test(test_file: Path):
+    from test_suite.multiprocessing_utils import timed_harness_call, timed_stage
+
+    with timed_harness_call(Path("a.so")):
+        pass
+    with timed_harness_call(Path("b.so")):
+        with timed_harness_call(Path("a.so")):
+            pass
+    with timed_stage("diff"):
+        pass
+    return test_file.stem, 1, None
+
+
+class TestHarnessCallTiming:
+    """Tests for collecting per-target harness call times."""
+
+    def test_run_timed(self):
+        from test_suite.constants import TEST_CASE_CRASHED
+        from test_suite.multiprocessing_utils import crashed_timed_result, run_timed
+
+        test_file, result, seconds, stages = run_timed(_sleepy_test, Path("x/abc.fix"))
+        assert test_file == Path("x/abc.fix")
+        assert result == ("abc", 1, None)
+        assert sorted(seconds) == [Path("a.so"), Path("b.so")]
+        assert all(value >= 0 for value in seconds.values())
+        assert list(stages) == ["diff"]
+
+        # Times do not carry over to the next test
+        _, _, seconds, stages = run_timed(lambda f: (f.stem, 0, None), Path("def.fix"))
+        assert seconds == {}
+        assert stages == {}
+
+        assert crashed_timed_result(Path("ghi.fix")) == (
+            Path("ghi.fix"),
+            ("ghi", TEST_CASE_CRASHED, None),
+            {},
+            {},
+        )
+
+
+class _CountingContext:
+    def __init__(self):
+        self.serializations = 0
+
+    def SerializeToString(self, deterministic=False):
+        self.serializations += 1
+        return b"context"
+
+
+class _FakeHandle:
+    """Stand-in for ctypes.CDLL with only a library handle."""
+
+    def __init__(self, handle: int):
+        self._handle = handle
+
+
+class TestTargetFanOut:
+    """Tests for calling every target library of a test."""
+
+    def test_context_serialized_once(self, fresh_output_buffer, monkeypatch):
+        import test_suite.multiprocessing_utils as mp_utils
+        from test_suite.fuzz_context import InstrHarness
+
+        targets = [Path("a.so"), Path("b.so"), Path("c.so")]
+        monkeypatch.setattr(
+            fresh_output_buffer,
+            "target_libraries",
+            {target: _FakeHandle(i) for i, target in enumerate(targets)},
+        )
+        calls = []
+
+        def process_target(harness_ctx, library, context, serialized_context=None):
+            calls.append((library._handle, serialized_context))
+            return None
+
+        monkeypatch.setattr(mp_utils, "process_target", process_target)
+        context = _CountingContext()
+        results = mp_utils.process_single_test_case(InstrHarness, context)
+
+        assert context.serializations == 1
+        assert calls == [(0, b"context"), (1, b"context"), (2, b"context")]
+        assert list(results) == targets
+
+    def test_parallel_threads_use_own_buffers(self, fresh_output_buffer, monkeypatch):
+        import threading
+
+        from test_suite.multiprocessing_utils import call_targets, ensure_output_buffer
+
+        targets = [Path("a.so"), Path("b.so")]
+        monkeypatch.setattr(
+            fresh_output_buffer,
+            "target_libraries",
+            {target: _FakeHandle(i) for i, target in enumerate(targets)},
+        )
+        monkeypatch.setattr(fresh_output_buffer, "parallel_targets", True)
+        # Both targets must be in their call at the same time
+        barrier = threading.Barrier(len(targets), timeout=10)
+
+        def call_target(target):
+            buffer = ensure_output_buffer(1024)
+            barrier.wait()
+            return threading.get_ident(), buffer
+
+        results = call_targets(call_target)
+        assert list(results) == targets
+        (thread_a, buffer_a), (thread_b, buffer_b) = results.values()
+        assert threading.get_ident() not in (thread_a, thread_b)
+        assert buffer_a is not buffer_b
+        assert fresh_output_buffer.output_buffer_pointer is None
+
+    def test_shared_library_is_called_serially(self, fresh_output_buffer, monkeypatch):
+        import threading
+
+        from test_suite.multiprocessing_utils import call_targets
+
+        library = _FakeHandle(0)
+        monkeypatch.setattr(
+            fresh_output_buffer,
+            "target_libraries",
+            {Path("a.so"): library, Path("b.so"): library},
+        )
+        monkeypatch.setattr(fresh_output_buffer, "parallel_targets", True)
+
+        results = call_targets(lambda target: threading.get_ident())
+        assert set(results.values()) == {threading.get_ident()}
+
+    def test_threads_stopped_with_new_phase(self, fresh_output_buffer, monkeypatch):
+        import threading
+
+        import test_suite.multiprocessing_utils as mp_utils
+
+        targets = [Path("a.so"), Path("b.so")]
+        monkeypatch.setattr(
+            fresh_output_buffer,
+            "target_libraries",
+            {target: _FakeHandle(i) for i, target in enumerate(targets)},
+        )
+        monkeypatch.setattr(fresh_output_buffer, "parallel_targets", True)
+
+        results = mp_utils.call_targets(lambda target: threading.current_thread())
+        threads = set(results.values())
+        assert threading.current_thread() not in threads
+        assert all(thread.is_alive() for thread in threads)
+
+        # A WorkerPool worker restores the parent's globals for each phase
+        mp_utils.restore_process_globals({})
+        assert mp_utils._target_executor is None
+        assert not any(thread.is_alive() for thread in threads)
+
+        # The next parallel call starts new threads
+        results = mp_utils.call_targets(lambda target: threading.current_thread())
+        assert not threads & set(results.values())
+        mp_utils.shutdown_target_executor()
+        assert not any(thread.is_alive() for thread in results.values())
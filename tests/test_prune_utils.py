@@ -0,0 +1,112 @@
+"""
+Unit tests for pruning unchanged accounts from execution results.
+"""
+
+from pathlib import Path
+
+
+def _account(address: bytes, lamports: int = 1, data: bytes = b"data"):
+    import test_suite.protos.context_pb2 as context_pb
+
+    return context_pb.AcctState(
+        address=address, lamports=lamports, data=data, owner=b"o" * 32
+    )
+
+
+class TestAccountIndex:
+    """Tests for looking up unchanged account states."""
+
+    def test_unchanged(self):
+        from test_suite.validation_utils import AccountIndex, check_account_unchanged
+
+        accounts = [_account(b"a" * 32), _account(b"b" * 32, data=b"x" * 100)]
+        index = AccountIndex(accounts)
+
+        for account in accounts:
+            assert index.unchanged(account)
+        assert check_account_unchanged(accounts[0], _account(b"a" * 32))
+        assert not index.unchanged(_account(b"a" * 32, lamports=2))
+        assert not index.unchanged(_account(b"a" * 32, data=b"date"))
+        assert not index.unchanged(_account(b"a" * 32, data=b"data!"))
+        assert not index.unchanged(_account(b"b" * 32, data=b"x" * 99 + b"y"))
+        assert not index.unchanged(_account(b"c" * 32))
+
+        changed = _account(b"a" * 32)
+        changed.executable = True
+        assert not index.unchanged(changed)
+
+    def test_changed(self):
+        from test_suite.validation_utils import AccountIndex
+
+        accounts = [_account(i.to_bytes(2, "little") * 16) for i in range(100)]
+        index = AccountIndex(accounts)
+        new = _account(b"n" * 32)
+        changed = [
+            _account(account.address, lamports=i) for i, account in enumerate(accounts)
+        ]
+        # Only lamports=1 leaves an account unchanged
+        assert index.changed(changed + [new]) == changed[:1] + changed[2:] + [new]
+        assert index.changed(accounts) == []
+
+
+class TestPruneExecutionResult:
+    """Tests for the instruction and transaction prune functions."""
+
+    def test_instr(self):
+        import test_suite.protos.invoke_pb2 as invoke_pb
+        from test_suite.fuzz_interface import TargetEffects
+        from test_suite.instr.prune_utils import prune_execution_result
+
+        context = invoke_pb.InstrContext()
+        context.accounts.extend([_account(b"a" * 32), _account(b"b" * 32)])
+
+        def effects(*accounts):
+            return invoke_pb.InstrEffects(modified_accounts=accounts, cu_avail=10)
+
+        changed = _account(b"b" * 32, lamports=0)
+        unpruned = TargetEffects(
+            invoke_pb.InstrEffects,
+            serialized=effects(changed).SerializeToString(deterministic=True),
+        )
+        results = {
+            Path("a"): TargetEffects.of(effects(_account(b"a" * 32), changed)),
+            Path("b"): unpruned,
+            Path("c"): None,
+        }
+        serialized = unpruned.serialized
+        pruned = prune_execution_result(context, results)
+
+        assert pruned[Path("a")].message == effects(changed)
+        assert pruned[Path("a")].serialized == serialized
+        # Nothing to prune: the serialization is kept
+        assert pruned[Path("b")].serialized is serialized
+        assert pruned[Path("c")] is None
+        assert prune_execution_result(None, results) is None
+
+    def test_txn(self):
+        import test_suite.protos.txn_pb2 as txn_pb
+        from test_suite.fuzz_interface import TargetEffects
+        from test_suite.txn.prune_utils import prune_execution_result
+
+        context = txn_pb.TxnContext()
+        context.account_shared_data.extend(
+            [_account(i.to_bytes(2, "little") * 16) for i in range(1000)]
+        )
+        modified = [
+            _account(i.to_bytes(2, "little") * 16, lamports=i % 2) for i in range(1000)
+        ]
+        result = txn_pb.TxnResult(executed=True, modified_accounts=modified)
+
+        pruned = prune_execution_result(
+            context,
+            {
+                Path("a"): TargetEffects(
+                    txn_pb.TxnResult,
+                    serialized=result.SerializeToString(deterministic=True),
+                )
+            },
+        )
+        pruned_result = txn_pb.TxnResult()
+        pruned_result.ParseFromString(pruned[Path("a")].serialized)
+        assert pruned_result.executed
+        assert list(pruned_result.modified_accounts) == modified[::2]
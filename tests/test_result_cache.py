@@ -0,0 +1,131 @@
+"""
+Unit tests for the incremental run-tests result cache.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+import test_suite.globals as globals
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+@pytest.fixture
+def result_cache(tmp_path):
+    from test_suite.result_cache import ResultCache
+
+    with ResultCache(tmp_path / "results.sqlite") as cache:
+        yield cache
+
+
+class TestResultCache:
+    """Tests for storing, looking up and evicting cached results."""
+
+    def test_round_trip(self, result_cache):
+        result_cache.put("hash", "InstrHarness", "config", 1, {"liba": "digest"})
+        result_cache.put("other", "InstrHarness", "config", 0, None)
+        assert result_cache.get("hash", "InstrHarness", "config") is None
+        result_cache.flush()
+
+        assert result_cache.get("hash", "InstrHarness", "config") == (
+            1,
+            {"liba": "digest"},
+        )
+        assert result_cache.get("other", "InstrHarness", "config") == (0, None)
+        assert result_cache.get("hash", "TxnHarness", "config") is None
+        assert result_cache.get("hash", "InstrHarness", "other config") is None
+
+        result_cache.clear()
+        assert len(result_cache) == 0
+
+    def test_lru_eviction(self, tmp_path):
+        from test_suite.result_cache import ResultCache
+
+        outputs = {"liba": "x" * 10000}
+        with ResultCache(tmp_path / "results.sqlite", max_bytes=10**9) as cache:
+            for name in ("a", "b", "c"):
+                cache.put(name, "InstrHarness", "config", -1, outputs)
+                cache.flush()
+            # Using a makes b the least recently used result
+            assert cache.get("a", "InstrHarness", "config") is not None
+            cache.flush()
+
+            # Room for two results
+            cache.max_bytes = (
+                2 * cache.conn.execute("SELECT MAX(size) FROM results").fetchone()[0]
+            )
+            cache.flush()
+            assert len(cache) == 2
+            assert cache.get("b", "InstrHarness", "config") is None
+            assert cache.get("a", "InstrHarness", "config") is not None
+            assert cache.get("c", "InstrHarness", "config") is not None
+
+    def test_config_key(self, monkeypatch):
+        from test_suite.result_cache import run_config_key
+        from test_suite.timing_db import TargetBuild
+
+        builds = [
+            TargetBuild("liba", "build-id:01"),
+            TargetBuild("libb", "build-id:02"),
+        ]
+        monkeypatch.setattr(globals, "consensus_mode", False)
+        monkeypatch.setattr(globals, "render_passing_effects", True)
+        key = run_config_key(builds)
+        assert run_config_key(builds) == key
+        # Another reference target, another build, another diff mode
+        assert run_config_key(builds[::-1]) != key
+        assert run_config_key([builds[0], TargetBuild("libb", "build-id:03")]) != key
+        monkeypatch.setattr(globals, "consensus_mode", True)
+        assert run_config_key(builds) != key
+
+
+class TestIncrementalRun:
+    """Tests for answering test files from the cache."""
+
+    def test_partition_and_store(self, result_cache, tmp_path):
+        from test_suite.constants import TEST_CASE_CRASHED
+        from test_suite.result_cache import IncrementalRun
+        from test_suite.scheduling import HarnessSchedule, RuntimeHistory
+
+        shutil.copytree(TEST_DATA_DIR / "fixtures", tmp_path / "fixtures")
+        test_cases = sorted((tmp_path / "fixtures").glob("*.fix"))
+        # Same contents under another name
+        shutil.copy(test_cases[0], tmp_path / "copy.fix")
+        # Two builds of the same target, as in an A/B comparison
+        targets = [Path("/old/liba.so"), Path("/new/liba.so")]
+
+        def new_run(passed_on):
+            schedule = HarnessSchedule(
+                test_cases + [tmp_path / "copy.fix"], RuntimeHistory()
+            )
+            return IncrementalRun(
+                result_cache, "config", schedule, targets, passed_on.append
+            )
+
+        passed_on = []
+        run = new_run(passed_on)
+        cached = []
+        assert run.partition(test_cases, cached.append) == test_cases
+        assert cached == []
+
+        outputs = {target: f"{target} effects" for target in targets}
+        run.add((test_cases[0], (test_cases[0].stem, 1, outputs), {}, {}))
+        run.add((test_cases[1], (test_cases[1].stem, TEST_CASE_CRASHED, None), {}, {}))
+        run.add((test_cases[2], (test_cases[2].stem, 0, None), {}, {}))
+        assert len(passed_on) == 3
+        result_cache.flush()
+
+        run = new_run([])
+        to_run = run.partition(test_cases + [tmp_path / "copy.fix"], cached.append)
+        # Crashes are re-run
+        assert to_run == [test_cases[1], test_cases[3], test_cases[4]]
+        assert sorted(cached) == sorted(
+            [
+                (test_cases[0].stem, 1, outputs),
+                ("copy", 1, outputs),
+                (test_cases[2].stem, 0, None),
+            ]
+        )
+        assert run.num_cached == 3
@@ -0,0 +1,188 @@
+"""
+Unit tests for harness-grouped scheduling of test files.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+def _write_instr_fixture(path: Path, data_size: int):
+    import test_suite.protos.invoke_pb2 as invoke_pb
+
+    fixture = invoke_pb.InstrFixture()
+    fixture.metadata.fn_entrypoint = "sol_compat_instr_execute_v1"
+    fixture.input.data = b"\x01" * data_size
+    path.write_bytes(fixture.SerializeToString())
+
+
+class TestHarnessSchedule:
+    """Tests for grouping test files by harness, largest first."""
+
+    def test_classify_test_file(self, tmp_path):
+        from test_suite.fixture_pack import write_pack
+        from test_suite.scheduling import UNKNOWN_HARNESS, classify_test_file
+
+        block_context = next((TEST_DATA_DIR / "contexts").glob("*.blockctx"))
+        assert classify_test_file(block_context) == (
+            "BlockHarness",
+            block_context.stat().st_size,
+        )
+
+        # Plain fixtures are grouped by the entrypoint in their first bytes
+        instr_fixture = tmp_path / "instr.fix"
+        _write_instr_fixture(instr_fixture, 10)
+        size = instr_fixture.stat().st_size
+        assert classify_test_file(instr_fixture) == ("InstrHarness", size)
+        junk_fixture = tmp_path / "junk.fix"
+        junk_fixture.write_bytes(b"junk")
+        assert classify_test_file(junk_fixture) == (UNKNOWN_HARNESS, 4)
+        assert classify_test_file(tmp_path / "missing.fix") == (UNKNOWN_HARNESS, 0)
+
+        # Pack members are grouped by the entrypoint in the pack
+        pack_path = tmp_path / "corpus.fixpack"
+        write_pack(
+            pack_path,
+            [
+                ("instr.fix", b"x" * 7, "sol_compat_instr_execute_v1"),
+                ("elf.fix", b"y", "sol_compat_elf_loader_v2"),
+                ("junk.fix", b"z", ""),
+            ],
+        )
+        assert classify_test_file(pack_path / "instr.fix") == ("InstrHarness", 7)
+        assert classify_test_file(pack_path / "elf.fix")[0] == (
+            "sol_compat_elf_loader_v2"
+        )
+        assert classify_test_file(pack_path / "junk.fix") == (UNKNOWN_HARNESS, 1)
+
+    def test_warns_when_mostly_unknown(self, tmp_path, capsys):
+        from test_suite.scheduling import HarnessSchedule, RuntimeHistory
+
+        instr_fixture = tmp_path / "instr.fix"
+        _write_instr_fixture(instr_fixture, 10)
+        HarnessSchedule([instr_fixture], RuntimeHistory())
+        assert "Warning" not in capsys.readouterr().out
+
+        junk_fixtures = []
+        for i in range(2):
+            junk_fixtures.append(tmp_path / f"junk-{i}.fix")
+            junk_fixtures[-1].write_bytes(b"junk")
+        schedule = HarnessSchedule([instr_fixture, *junk_fixtures], RuntimeHistory())
+        assert schedule.group_sizes == {"InstrHarness": 1, "unknown": 2}
+        assert "--index" in capsys.readouterr().out
+
+    def test_grouped_largest_first(self, tmp_path, monkeypatch):
+        from test_suite.fixture_index import find_indexed_test_files
+        from test_suite.scheduling import HarnessSchedule, RuntimeHistory
+
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        corpus = tmp_path / "corpus"
+        shutil.copytree(TEST_DATA_DIR / "fixtures", corpus / "fixtures")
+        block_fixtures = sorted(
+            (corpus / "fixtures").glob("*.fix"), key=lambda p: -p.stat().st_size
+        )
+        instr_fixtures = []
+        for i, size in enumerate((10, 1000, 100)):
+            instr_fixtures.append(corpus / f"instr-{i}.fix")
+            _write_instr_fixture(instr_fixtures[-1], size)
+        _, index_entries = find_indexed_test_files(corpus, use_index=True)
+
+        # Interleaved, as a directory walk might return them
+        test_cases = [p for pair in zip(block_fixtures, instr_fixtures) for p in pair]
+        test_cases += block_fixtures[len(instr_fixtures) :]
+        schedule = HarnessSchedule(test_cases, RuntimeHistory(), index_entries)
+
+        # The block fixtures are the largest inputs, so their group runs first
+        assert schedule.ordered(test_cases) == block_fixtures + [
+            instr_fixtures[1],
+            instr_fixtures[2],
+            instr_fixtures[0],
+        ]
+        assert schedule.group_sizes == {"BlockHarness": 5, "InstrHarness": 3}
+        assert schedule.harness_of(instr_fixtures[0]) == "InstrHarness"
+
+    def test_index_entries_replace_classification(self, tmp_path):
+        from test_suite.fixture_index import IndexEntry
+        from test_suite.scheduling import HarnessSchedule, RuntimeHistory
+
+        # Indexed files are not read, so they need not even exist
+        indexed = tmp_path / "instr.fix"
+        entry = IndexEntry(
+            indexed,
+            1234,
+            0,
+            "protobuf",
+            "sol_compat_instr_execute_v1",
+            "InstrHarness",
+            (),
+            "",
+        )
+        elf = tmp_path / "elf.fix"
+        elf_entry = IndexEntry(
+            elf, 10, 0, "flatbuffers", "sol_compat_elf_loader_v2", None, (), ""
+        )
+        schedule = HarnessSchedule([indexed, elf], RuntimeHistory(), [entry, elf_entry])
+        assert schedule.harness_of(indexed) == "InstrHarness"
+        assert schedule.size_of(indexed) == 1234
+        assert schedule.harness_of(elf) == "sol_compat_elf_loader_v2"
+
+    def test_measured_runtimes_replace_sizes(self, tmp_path):
+        from test_suite.scheduling import HarnessSchedule, RuntimeHistory
+
+        fixtures = []
+        for i, size in enumerate((100, 200, 300, 400)):
+            fixtures.append(tmp_path / f"instr-{i}.fix")
+            _write_instr_fixture(fixtures[-1], size)
+        history = RuntimeHistory()
+
+        # Nothing ran yet: largest first
+        schedule = HarnessSchedule(fixtures, history)
+        assert schedule.ordered(fixtures) == fixtures[::-1]
+
+        # The smallest fixture turned out to be the slowest
+        schedule.record(fixtures[0], 5.0)
+        schedule.record(fixtures[3], 0.4)
+        schedule = HarnessSchedule(fixtures, history)
+        assert schedule.cost_of(fixtures[0]) == 5.0
+        assert schedule.cost_of(fixtures[3]) == 0.4
+        # Unmeasured fixtures are estimated from the harness's seconds per byte
+        size = fixtures[2].stat().st_size
+        assert schedule.cost_of(fixtures[2]) == pytest.approx(
+            size * 5.4 / (fixtures[0].stat().st_size + fixtures[3].stat().st_size)
+        )
+        assert schedule.ordered(fixtures) == [
+            fixtures[0],
+            fixtures[2],
+            fixtures[1],
+            fixtures[3],
+        ]
+
+        # A new measurement replaces the previous one
+        schedule.record(fixtures[0], 0.1)
+        assert history.seconds(fixtures[0].stem) == 0.1
+        assert len(history) == 2
+
+    def test_throughput(self, capsys):
+        from test_suite.scheduling import HarnessSchedule, RuntimeHistory
+
+        fixtures = sorted((TEST_DATA_DIR / "contexts").glob("*.blockctx"))
+        schedule = HarnessSchedule(fixtures, RuntimeHistory())
+        schedule.report()
+        assert capsys.readouterr().out == ""
+
+        for path in fixtures[:4]:
+            schedule.record(path, 0.5)
+        assert schedule.throughput() == {"BlockHarness": (4, 2.0)}
+
+        schedule.record_stages(fixtures[0], {"execute": 0.25, "diff": 0.5})
+        schedule.record_stages(fixtures[1], {"execute": 0.25})
+        assert schedule.stage_times() == {"BlockHarness": {"execute": 0.5, "diff": 0.5}}
+
+        schedule.report()
+        out = capsys.readouterr().out
+        assert "Per-harness throughput:" in out
+        assert "BlockHarness: 4 tests in 2.00s worker time (2.0 tests/s" in out
+        assert "    execute 0.50s, diff 0.50s" in out
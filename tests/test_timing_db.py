@@ -0,0 +1,161 @@
+"""
+Unit tests for the per-fixture timing database.
+"""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def timing_db(tmp_path):
+    from test_suite.timing_db import TimingDB
+
+    with TimingDB(tmp_path / "timings.sqlite") as db:
+        yield db
+
+
+def _builds():
+    from test_suite.timing_db import TargetBuild
+
+    return (
+        TargetBuild("libfd", "build-id:aaaa"),
+        TargetBuild("libfd", "build-id:bbbb"),
+        TargetBuild("libagave", "build-id:cccc"),
+    )
+
+
+class TestTimingDB:
+    """Tests for recording and querying harness call times."""
+
+    def test_record_and_slowest(self, timing_db):
+        old, new, agave = _builds()
+        timing_db.record("fast", "InstrHarness", 100, {old: 0.01, agave: 0.02})
+        timing_db.record("slow", "TxnHarness", 5000, {old: 0.5})
+        timing_db.flush()
+        timing_db.record("slow", "TxnHarness", 5000, {old: 0.7})
+        timing_db.flush()
+
+        timings = timing_db.timings(old)
+        assert timings["slow"].seconds == 0.7
+        assert timings["slow"].best_seconds == 0.5
+        assert timings["slow"].runs == 2
+        assert timings["fast"].harness == "InstrHarness"
+        assert [t.fixture for t in timing_db.slowest(old, 1)] == ["slow"]
+        assert list(timing_db.timings(agave)) == ["fast"]
+
+    def test_regressions(self, timing_db):
+        old, new, _ = _builds()
+        timing_db.record("syscall", "SyscallHarness", 10, {old: 0.001})
+        timing_db.record("noise", "SyscallHarness", 10, {old: 0.00001})
+        timing_db.record("steady", "SyscallHarness", 10, {old: 0.1})
+        timing_db.flush()
+        timing_db.record("syscall", "SyscallHarness", 10, {new: 0.01})
+        timing_db.record("noise", "SyscallHarness", 10, {new: 0.0001})
+        timing_db.record("steady", "SyscallHarness", 10, {new: 0.11})
+        timing_db.flush()
+
+        regressions = timing_db.regressions(old, new)
+        assert [r.fixture for r in regressions] == ["syscall"]
+        assert regressions[0].ratio == pytest.approx(10.0)
+        assert timing_db.regressions(new, old) == []
+
+    def test_builds(self, timing_db, tmp_path):
+        old, new, agave = _builds()
+        for build in (old, new, agave):
+            timing_db.record("fixture", None, 1, {build: 0.1})
+            timing_db.flush()
+
+        assert timing_db.builds("libfd") == [old, new]
+        assert timing_db.previous_build(new) == old
+        assert timing_db.previous_build(old) is None
+        assert timing_db.find_build("libfd") == new
+        assert timing_db.find_build("build-id:cc") == agave
+        assert timing_db.find_build("unknown") is None
+
+        library = tmp_path / "libnew.so"
+        library.write_bytes(b"not an ELF file")
+        assert timing_db.find_build(str(library)).target == "libnew"
+
+    def test_history(self, timing_db):
+        from test_suite.timing_db import TargetBuild
+
+        old, new, agave = _builds()
+        timing_db.record("a", "InstrHarness", 100, {old: 1.0, agave: 0.5})
+        timing_db.record("b", "InstrHarness", 200, {old: 2.0})
+        timing_db.flush()
+        timing_db.record("a", "InstrHarness", 100, {new: 3.0})
+        timing_db.flush()
+
+        history = timing_db.history([new, agave])
+        # a ran on the current build of libfd, b only on an older one
+        assert history.seconds("a") == pytest.approx(3.5)
+        assert history.seconds("b") == pytest.approx(2.0)
+        assert history.seconds("c") is None
+        assert len(timing_db.history([TargetBuild("other", "x")])) == 0
+
+    def test_unwritable_database(self, tmp_path, capsys):
+        from test_suite.timing_db import open_timing_db
+
+        # The cache directory cannot be created
+        not_a_dir = tmp_path / "home"
+        not_a_dir.write_bytes(b"")
+        assert open_timing_db(not_a_dir / "timings.sqlite") is None
+        assert "Warning: Not recording fixture timings" in capsys.readouterr().out
+
+    def test_failed_write_stops_recording(self, tmp_path, capsys):
+        import sqlite3
+
+        from test_suite.timing_db import open_timing_db
+
+        old, _, _ = _builds()
+        db = open_timing_db(tmp_path / "timings.sqlite")
+        # Another run holds the write lock
+        other = sqlite3.connect(tmp_path / "timings.sqlite")
+        other.execute("BEGIN EXCLUSIVE")
+        db.conn.execute("PRAGMA busy_timeout = 0")
+
+        db.record("a", "InstrHarness", 100, {old: 1.0})
+        db.flush()
+        assert "Warning: Not recording fixture timings" in capsys.readouterr().out
+        db.record("b", "InstrHarness", 100, {old: 1.0})
+        db.flush()
+        assert capsys.readouterr().out == ""
+
+        # Reads fall back to an empty history
+        assert len(db.history([old])) == 0
+        other.rollback()
+        other.close()
+        db.close()
+
+
+class TestTargetBuildId:
+    """Tests for identifying builds of target libraries."""
+
+    def test_gnu_build_id(self, tmp_path):
+        import struct
+
+        from test_suite.util import target_build_id
+
+        # Minimal ELF64 file with a single PT_NOTE segment
+        note = struct.pack("<III", 4, 4, 3) + b"GNU\0" + b"\xde\xad\xbe\xef"
+        header = bytearray(64)
+        header[:6] = b"\x7fELF\x02\x01"
+        struct.pack_into("<Q", header, 0x20, 64)
+        struct.pack_into("<HH", header, 0x36, 56, 1)
+        phdr = struct.pack("<IIQQQQQQ", 4, 0, 120, 0, 0, len(note), len(note), 4)
+        library = tmp_path / "lib.so"
+        library.write_bytes(bytes(header) + phdr + note)
+
+        assert target_build_id(library) == "build-id:deadbeef"
+
+    def test_hash_without_build_id(self, tmp_path):
+        import hashlib
+
+        from test_suite.util import target_build_id
+
+        library = tmp_path / "lib.so"
+        library.write_bytes(b"no build id")
+        assert target_build_id(library) == (
+            "sha256:" + hashlib.sha256(b"no build id").hexdigest()
+        )
@@ -0,0 +1,467 @@
+"""
+Unit tests for the process_items / WorkerPool helpers in util.
+"""
+
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import test_suite.globals as globals
+from test_suite.util import SharedCounters, WorkerPool, process_items
+
+# Per-worker record of phase initializer calls
+_init_calls = []
+
+
+def _record_init(tag):
+    _init_calls.append(tag)
+
+
+def _worker_info(item):
+    return item, os.getpid(), list(_init_calls)
+
+
+def _read_output_dir(item):
+    return str(globals.output_dir)
+
+
+def _square(item):
+    return item * item
+
+
+def _square_or_die(item):
+    # Simulate a target segfaulting on specific inputs
+    if item % 50 == 13:
+        os.kill(os.getpid(), signal.SIGKILL)
+    return item * item
+
+
+# Created before any pool forks, like the counters in the test_suite modules
+_counters = SharedCounters(("even", "odd"))
+
+
+def _count_parity(item):
+    _counters.add("odd" if item % 2 else "even")
+    return item
+
+
+class _CountingBar:
+    def __init__(self):
+        self.n = 0
+
+    def update(self, n):
+        self.n += n
+
+
+class TestWorkerPool:
+    """Tests for the long-lived pool shared by several process_items phases."""
+
+    def test_workers_reused_across_phases(self):
+        with WorkerPool(2) as pool:
+            first = process_items(
+                list(range(8)),
+                _worker_info,
+                num_processes=2,
+                initializer=_record_init,
+                initargs=("create",),
+                use_processes=True,
+                pool=pool,
+            )
+            second = process_items(
+                list(range(8)),
+                _worker_info,
+                num_processes=2,
+                initializer=_record_init,
+                initargs=("run",),
+                use_processes=True,
+                pool=pool,
+            )
+
+        first_pids = {pid for _, pid, _ in first}
+        second_pids = {pid for _, pid, _ in second}
+        # The second phase ran on the same (at most two) workers
+        assert len(first_pids | second_pids) <= 2
+        assert sorted(item for item, _, _ in second) == list(range(8))
+
+        # Each worker ran each phase initializer at most once, in order
+        for _, _, calls in first:
+            assert calls == ["create"]
+        for _, _, calls in second:
+            assert calls[-1] == "run"
+            assert calls.count("run") == 1
+
+    def test_phase_state_is_restored(self, monkeypatch):
+        from test_suite.multiprocessing_utils import (
+            restore_process_globals,
+            snapshot_process_globals,
+        )
+
+        monkeypatch.setattr(globals, "output_dir", "first")
+        with WorkerPool(
+            2,
+            snapshot_fn=snapshot_process_globals,
+            restore_fn=restore_process_globals,
+        ) as pool:
+            first = process_items(
+                list(range(4)), _read_output_dir, use_processes=True, pool=pool
+            )
+            monkeypatch.setattr(globals, "output_dir", "second")
+            second = process_items(
+                list(range(4)), _read_output_dir, use_processes=True, pool=pool
+            )
+
+        assert set(first) == {"first"}
+        assert set(second) == {"second"}
+
+    def test_debug_mode_bypasses_pool(self):
+        with WorkerPool(2) as pool:
+            results = process_items(
+                [1, 2],
+                _worker_info,
+                debug_mode=True,
+                use_processes=True,
+                pool=pool,
+            )
+            assert pool._executor is None
+        assert {pid for _, pid, _ in results} == {os.getpid()}
+
+
+class TestProcessGlobalsSnapshot:
+    """Tests for shipping parent globals to long-lived pool workers."""
+
+    def test_harness_round_trip(self, monkeypatch):
+        import pickle
+
+        from test_suite.fuzz_context import SyscallHarness
+        from test_suite.multiprocessing_utils import (
+            restore_process_globals,
+            snapshot_process_globals,
+        )
+
+        monkeypatch.setattr(globals, "default_harness_ctx", SyscallHarness)
+        snapshot = pickle.loads(pickle.dumps(snapshot_process_globals()))
+        assert "target_libraries" not in snapshot
+        assert "output_buffer_pointer" not in snapshot
+
+        monkeypatch.setattr(globals, "default_harness_ctx", None)
+        restore_process_globals(snapshot)
+        assert globals.default_harness_ctx is SyscallHarness
+
+    def test_initializer_keeps_matching_buffer(self, monkeypatch):
+        from test_suite.multiprocessing_utils import (
+            ensure_output_buffer,
+            initialize_process_output_buffers,
+        )
+
+        monkeypatch.setattr(globals, "output_buffer_pointer", None)
+        monkeypatch.setattr(globals, "output_buffer_seed", None)
+        initialize_process_output_buffers(False)
+        buffer = ensure_output_buffer(1024)
+
+        initialize_process_output_buffers(False)
+        assert globals.output_buffer_pointer is buffer
+
+        initialize_process_output_buffers(True, output_buffer_seed=5)
+        assert globals.output_buffer_pointer is None
+        monkeypatch.setattr(globals, "randomize_output_buffer", False)
+
+
+class TestChunkedSubmission:
+    """Tests for adaptive chunking of process pool work."""
+
+    def test_sizer_starts_with_single_items(self):
+        from test_suite.util import ChunkSizer
+
+        assert ChunkSizer(4).next_size(10000) == 1
+
+    def test_sizer_targets_chunk_duration(self):
+        from test_suite.util import ChunkSizer
+
+        sizer = ChunkSizer(4, target_seconds=0.1, max_chunk_size=1000)
+        sizer.observe(10, 0.01)  # 1 ms per item
+        assert sizer.next_size(100000) == 100
+
+    def test_sizer_caps_and_balances_tail(self):
+        from test_suite.util import ChunkSizer
+
+        sizer = ChunkSizer(4, target_seconds=1.0, max_chunk_size=64)
+        sizer.observe(1000, 0.001)
+        assert sizer.next_size(100000) == 64
+        # Near the end, chunks shrink so every worker still gets work
+        assert sizer.next_size(32) == 2
+        assert sizer.next_size(3) == 1
+
+    def test_slow_items_stay_unbatched(self):
+        from test_suite.util import ChunkSizer
+
+        sizer = ChunkSizer(4, target_seconds=0.1)
+        sizer.observe(1, 2.0)
+        assert sizer.next_size(1000) == 1
+
+    def test_all_results_and_progress(self):
+        items = list(range(300))
+        bar = _CountingBar()
+        results = process_items(
+            items,
+            _square,
+            num_processes=3,
+            use_processes=True,
+            shared_progress_bar=bar,
+        )
+        assert sorted(results) == [i * i for i in items]
+        assert bar.n == len(items)
+
+    def test_chunks_on_worker_pool(self):
+        items = list(range(100))
+        bar = _CountingBar()
+        with WorkerPool(2) as pool:
+            results = process_items(
+                items,
+                _square,
+                use_processes=True,
+                shared_progress_bar=bar,
+                pool=pool,
+            )
+        assert sorted(results) == [i * i for i in items]
+        assert bar.n == len(items)
+
+
+class TestResultCallback:
+    """Tests for streaming results to a callback instead of collecting them."""
+
+    @pytest.mark.parametrize(
+        "use_processes, debug_mode", [(True, False), (False, False), (False, True)]
+    )
+    def test_results_streamed(self, use_processes, debug_mode):
+        items = list(range(200))
+        streamed = []
+        results = process_items(
+            items,
+            _square,
+            num_processes=2,
+            debug_mode=debug_mode,
+            use_processes=use_processes,
+            result_callback=streamed.append,
+        )
+        assert results == []
+        assert sorted(streamed) == [i * i for i in items]
+
+    def test_crash_results_streamed(self):
+        items = list(range(100))
+        streamed = []
+        process_items(
+            items,
+            _square_or_die,
+            num_processes=2,
+            use_processes=True,
+            crash_result_fn=lambda item: ("crashed", item),
+            result_callback=streamed.append,
+        )
+        assert len(streamed) == len(items)
+        assert sorted(r for r in streamed if isinstance(r, tuple)) == [
+            ("crashed", 13),
+            ("crashed", 63),
+        ]
+
+
+class TestBatchesAndTiming:
+    """Tests for homogeneous batches, cost ordering and per-item timing."""
+
+    def test_chunks_do_not_mix_batch_keys(self):
+        # Grouped items, each returning the pid of the worker that ran it
+        items = [(group, i) for group in "abc" for i in range(100)]
+        results = process_items(
+            items,
+            _worker_info,
+            num_processes=2,
+            use_processes=True,
+            batch_key=lambda item: item[0],
+        )
+        assert sorted(item for item, _, _ in results) == sorted(items)
+
+    def test_chunk_boundaries(self, monkeypatch):
+        import test_suite.util as util
+
+        chunks = []
+
+        class _RecordingExecutor:
+            def __init__(self, executor):
+                self.executor = executor
+
+            def submit(self, fn, task, chunk, *args):
+                chunks.append([item for _, item in chunk])
+                return self.executor.submit(fn, task, chunk, *args)
+
+        class _RecordingPool(WorkerPool):
+            @property
+            def executor(self):
+                return _RecordingExecutor(super().executor)
+
+        # Large chunks from the start, so they would span groups
+        monkeypatch.setattr(util.ChunkSizer, "next_size", lambda self, n: 64)
+
+        items = [(group, i) for group in "abc" for i in range(50)]
+        with _RecordingPool(2) as pool:
+            process_items(
+                items,
+                _worker_info,
+                use_processes=True,
+                pool=pool,
+                shared_progress_bar=_CountingBar(),
+                batch_key=lambda item: item[0],
+            )
+        assert chunks == [items[0:50], items[50:100], items[100:150]]
+
+    def test_order_by_cost(self):
+        from test_suite.util import order_by_cost
+
+        items = [("a", 1), ("b", 5), ("a", 3), ("c", 2), ("b", 1)]
+        assert order_by_cost(items, lambda item: item[1]) == [
+            ("b", 5),
+            ("a", 3),
+            ("c", 2),
+            ("a", 1),
+            ("b", 1),
+        ]
+        # Batches stay together, the one with the most expensive item first
+        assert order_by_cost(items, lambda item: item[1], lambda item: item[0]) == [
+            ("b", 5),
+            ("b", 1),
+            ("a", 3),
+            ("a", 1),
+            ("c", 2),
+        ]
+
+    def test_longest_job_first(self):
+        items = [3, 9, 1, 7]
+        results = process_items(items, _square, debug_mode=True, cost_fn=lambda i: i)
+        assert results == [81, 49, 9, 1]
+
+    @pytest.mark.parametrize(
+        "use_processes, debug_mode", [(True, False), (False, False), (False, True)]
+    )
+    def test_timing_callback(self, use_processes, debug_mode):
+        items = list(range(50))
+        timings = {}
+        process_items(
+            items,
+            _square,
+            num_processes=2,
+            debug_mode=debug_mode,
+            use_processes=use_processes,
+            timing_callback=timings.__setitem__,
+        )
+        assert sorted(timings) == items
+        assert all(seconds >= 0 for seconds in timings.values())
+
+    def test_crashed_items_not_timed(self):
+        timings = {}
+        process_items(
+            list(range(60)),
+            _square_or_die,
+            num_processes=2,
+            use_processes=True,
+            crash_result_fn=lambda item: None,
+            timing_callback=timings.__setitem__,
+        )
+        assert sorted(timings) == [i for i in range(60) if i != 13]
+
+
+class TestSharedCounters:
+    """Tests for counters summed over forked workers."""
+
+    def test_worker_increments_visible_in_parent(self):
+        _counters.reset()
+        process_items(
+            list(range(101)), _count_parity, num_processes=2, use_processes=True
+        )
+        assert _counters.snapshot() == {"even": 51, "odd": 50}
+
+        _counters.reset()
+        assert _counters.snapshot() == {"even": 0, "odd": 0}
+
+
+class TestCrashResilience:
+    """Tests for recording crashed items and continuing on respawned workers."""
+
+    def test_crashed_items_recorded(self):
+        items = list(range(200))
+        bar = _CountingBar()
+        results = process_items(
+            items,
+            _square_or_die,
+            num_processes=3,
+            use_processes=True,
+            shared_progress_bar=bar,
+            crash_result_fn=lambda item: ("crashed", item),
+        )
+
+        crashed = sorted(r[1] for r in results if isinstance(r, tuple))
+        assert crashed == [i for i in items if i % 50 == 13]
+        squares = sorted(r for r in results if not isinstance(r, tuple))
+        assert squares == [i * i for i in items if i % 50 != 13]
+        assert bar.n == len(items)
+
+    def test_crash_on_worker_pool(self):
+        items = list(range(60))
+        with WorkerPool(2) as pool:
+            results = process_items(
+                items,
+                _square_or_die,
+                use_processes=True,
+                pool=pool,
+                shared_progress_bar=_CountingBar(),
+                crash_result_fn=lambda item: None,
+            )
+            # The pool is usable for the next phase
+            after = process_items(
+                [1, 2, 3],
+                _square,
+                use_processes=True,
+                pool=pool,
+                shared_progress_bar=_CountingBar(),
+            )
+        assert len(results) == len(items)
+        assert results.count(None) == 1
+        assert sorted(after) == [1, 4, 9]
+
+    def test_pool_broken_during_submit(self):
+        submits = []
+
+        class _BreaksOnSecondSubmit:
+            def __init__(self, executor):
+                self.executor = executor
+
+            def submit(self, *args):
+                submits.append(args)
+                if len(submits) == 2:
+                    raise BrokenProcessPool("broke between completions")
+                return self.executor.submit(*args)
+
+        class _FlakyPool(WorkerPool):
+            @property
+            def executor(self):
+                return _BreaksOnSecondSubmit(super().executor)
+
+        items = list(range(40))
+        with _FlakyPool(2) as pool:
+            results = process_items(
+                items,
+                _square,
+                use_processes=True,
+                pool=pool,
+                shared_progress_bar=_CountingBar(),
+                crash_result_fn=lambda item: None,
+            )
+        assert sorted(results) == [i * i for i in items]
+
+    def test_crash_without_handler_raises(self):
+        with pytest.raises(BrokenProcessPool):
+            process_items(
+                [13],
+                _square_or_die,
+                use_processes=True,
+                shared_progress_bar=_CountingBar(),
+            )